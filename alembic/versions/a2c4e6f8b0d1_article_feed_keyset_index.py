@@ -0,0 +1,32 @@
+"""(coin_bot_id, created_at, article_id) index on article for the news feed
+
+Revision ID: a2c4e6f8b0d1
+Revises: f7b9d1e3a5c6
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c4e6f8b0d1'
+down_revision: Union[str, None] = 'f7b9d1e3a5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_article_coin_bot_id_created_at_article_id'
+
+
+def upgrade() -> None:
+    inspector = Inspector.from_engine(op.get_bind())
+    if INDEX_NAME not in {index['name'] for index in inspector.get_indexes('article')}:
+        op.create_index(INDEX_NAME, 'article', ['coin_bot_id', 'created_at', 'article_id'], unique=False)
+
+
+def downgrade() -> None:
+    inspector = Inspector.from_engine(op.get_bind())
+    if INDEX_NAME in {index['name'] for index in inspector.get_indexes('article')}:
+        op.drop_index(INDEX_NAME, table_name='article')
@@ -0,0 +1,58 @@
+"""notification_outbox table for asynchronous push notification delivery
+
+Revision ID: b3d1e5f7a9c2
+Revises: fa7dea0c29e2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d1e5f7a9c2'
+down_revision: Union[str, None] = 'fa7dea0c29e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'notification_outbox' not in inspector.get_table_names():
+        op.create_table(
+            'notification_outbox',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('topic_name', sa.String(), nullable=False),
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('body', sa.String(), nullable=False),
+            sa.Column('type', sa.String(), nullable=False),
+            sa.Column('coin', sa.String(), nullable=True),
+            sa.Column('timeframe', sa.String(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('next_attempt_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('sent_at', sa.TIMESTAMP(timezone=True), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(
+            'ix_notification_outbox_status_next_attempt_at',
+            'notification_outbox',
+            ['status', 'next_attempt_at']
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'notification_outbox' in inspector.get_table_names():
+        op.drop_index('ix_notification_outbox_status_next_attempt_at', table_name='notification_outbox')
+        op.drop_table('notification_outbox')
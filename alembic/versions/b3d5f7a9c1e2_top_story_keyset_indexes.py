@@ -0,0 +1,39 @@
+"""keyset pagination indexes on top_story
+
+Revision ID: b3d5f7a9c1e2
+Revises: a2c4e6f8b0d1
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e2'
+down_revision: Union[str, None] = 'a2c4e6f8b0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_top_story_created_at_top_story_id': ['created_at', 'top_story_id'],
+    'ix_top_story_coin_bot_id_created_at_top_story_id': ['coin_bot_id', 'created_at', 'top_story_id'],
+}
+
+
+def upgrade() -> None:
+    inspector = Inspector.from_engine(op.get_bind())
+    existing = {index['name'] for index in inspector.get_indexes('top_story')}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'top_story', columns, unique=False)
+
+
+def downgrade() -> None:
+    inspector = Inspector.from_engine(op.get_bind())
+    existing = {index['name'] for index in inspector.get_indexes('top_story')}
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='top_story')
@@ -0,0 +1,56 @@
+"""image_asset table for content-addressed image storage
+
+Revision ID: c4e2f6a8b0d3
+Revises: b3d1e5f7a9c2
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2f6a8b0d3'
+down_revision: Union[str, None] = 'b3d1e5f7a9c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'image_asset' not in inspector.get_table_names():
+        op.create_table(
+            'image_asset',
+            sa.Column('asset_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.Column('perceptual_hash', sa.BigInteger(), nullable=True),
+            sa.Column('bucket', sa.String(), nullable=False),
+            sa.Column('url', sa.String(), nullable=False),
+            sa.Column('variants', sa.JSON(), nullable=True),
+            sa.Column('source_url', sa.String(), nullable=True),
+            sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.PrimaryKeyConstraint('asset_id')
+        )
+        op.create_index('ix_image_asset_content_hash', 'image_asset', ['content_hash'], unique=True)
+        op.create_index('ix_image_asset_perceptual_hash', 'image_asset', ['perceptual_hash'])
+        op.create_index('ix_image_asset_url', 'image_asset', ['url'])
+        op.create_index('ix_image_asset_source_url', 'image_asset', ['source_url'])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'image_asset' in inspector.get_table_names():
+        op.drop_index('ix_image_asset_source_url', table_name='image_asset')
+        op.drop_index('ix_image_asset_url', table_name='image_asset')
+        op.drop_index('ix_image_asset_perceptual_hash', table_name='image_asset')
+        op.drop_index('ix_image_asset_content_hash', table_name='image_asset')
+        op.drop_table('image_asset')
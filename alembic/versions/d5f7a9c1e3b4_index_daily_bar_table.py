@@ -0,0 +1,49 @@
+"""index_daily_bar table for incrementally synced TradingView daily bars
+
+Revision ID: d5f7a9c1e3b4
+Revises: c4e2f6a8b0d3
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f7a9c1e3b4'
+down_revision: Union[str, None] = 'c4e2f6a8b0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'index_daily_bar' not in inspector.get_table_names():
+        op.create_table(
+            'index_daily_bar',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('symbol', sa.String(), nullable=False),
+            sa.Column('exchange', sa.String(), nullable=False),
+            sa.Column('bar_date', sa.TIMESTAMP(), nullable=False),
+            sa.Column('open', sa.Float(), nullable=False),
+            sa.Column('high', sa.Float(), nullable=False),
+            sa.Column('low', sa.Float(), nullable=False),
+            sa.Column('close', sa.Float(), nullable=False),
+            sa.Column('volume', sa.Float(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('symbol', 'bar_date', name='uq_index_daily_bar_symbol_bar_date')
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'index_daily_bar' in inspector.get_table_names():
+        op.drop_table('index_daily_bar')
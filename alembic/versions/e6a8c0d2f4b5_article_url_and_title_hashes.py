@@ -0,0 +1,142 @@
+"""url_hash/title_hash dedup columns on article and analyzed_article
+
+Revision ID: e6a8c0d2f4b5
+Revises: d5f7a9c1e3b4
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+import re
+import hashlib
+import unicodedata
+from typing import Optional, Sequence, Union
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a8c0d2f4b5'
+down_revision: Union[str, None] = 'd5f7a9c1e3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Fingerprints as computed by utils.fingerprint at this revision, copied so the
+# migration doesn't change when the application code does
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'ref_url', 'source', 'cmpid', 'guccounter', 'guce_referrer', 'guce_referrer_sig',
+}
+TRACKING_PREFIXES = ('utm_', '_hs', 'pk_', 'mtm_')
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def url_fingerprint(url: Optional[str]) -> Optional[str]:
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+    if '://' not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or ''
+    normalized = urlunsplit(('https', host, path, urlencode(query), '')).casefold()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def title_fingerprint(title: Optional[str]) -> Optional[str]:
+    text = unicodedata.normalize('NFKC', title or '').casefold()
+    normalized = ' '.join(_NON_WORD.sub(' ', text).split())
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _backfill(conn, table, id_column, columns):
+    """
+    Fill the hash columns of existing rows, BATCH_SIZE rows at a time.
+
+    Only the first row of each fingerprint keeps the hash; later duplicates
+    are set back to NULL so the unique indexes can be created on existing data.
+    """
+    source_columns = ', '.join(source for source, _, _ in columns)
+    select = sa.text(
+        f"SELECT {id_column}, {source_columns} FROM {table} "
+        f"WHERE {id_column} > :last_id ORDER BY {id_column} LIMIT {BATCH_SIZE}"
+    )
+    assignments = ', '.join(f"{hash_column} = :{hash_column}" for _, hash_column, _ in columns)
+    update = sa.text(f"UPDATE {table} SET {assignments} WHERE {id_column} = :row_id")
+
+    last_id = 0
+    while True:
+        rows = conn.execute(select, {'last_id': last_id}).fetchall()
+        if not rows:
+            break
+        conn.execute(update, [
+            {'row_id': row[0], **{
+                hash_column: fingerprint(row[position])
+                for position, (_, hash_column, fingerprint) in enumerate(columns, start=1)
+            }}
+            for row in rows
+        ])
+        last_id = rows[-1][0]
+
+    for _, hash_column, _ in columns:
+        conn.execute(sa.text(
+            f"UPDATE {table} SET {hash_column} = NULL FROM ("
+            f"SELECT {id_column} AS row_id, row_number() OVER (PARTITION BY {hash_column} ORDER BY {id_column}) AS position "
+            f"FROM {table} WHERE {hash_column} IS NOT NULL"
+            f") AS ranked WHERE {table}.{id_column} = ranked.row_id AND ranked.position > 1"
+        ))
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    article_columns = [c['name'] for c in inspector.get_columns('article')]
+    if 'url_hash' not in article_columns:
+        op.add_column('article', sa.Column('url_hash', sa.String(length=64), nullable=True))
+        op.add_column('article', sa.Column('title_hash', sa.String(length=64), nullable=True))
+        _backfill(conn, 'article', 'article_id', [
+            ('url', 'url_hash', url_fingerprint),
+            ('title', 'title_hash', title_fingerprint),
+        ])
+        op.create_index('ix_article_url_hash', 'article', ['url_hash'], unique=True)
+        op.create_index('ix_article_title_hash', 'article', ['title_hash'], unique=True)
+
+    analyzed_columns = [c['name'] for c in inspector.get_columns('analyzed_article')]
+    if 'url_hash' not in analyzed_columns:
+        op.add_column('analyzed_article', sa.Column('url_hash', sa.String(length=64), nullable=True))
+        _backfill(conn, 'analyzed_article', 'article_id', [
+            ('url', 'url_hash', url_fingerprint),
+        ])
+        op.create_index('ix_analyzed_article_url_hash', 'analyzed_article', ['url_hash'], unique=True)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'url_hash' in [c['name'] for c in inspector.get_columns('analyzed_article')]:
+        op.drop_index('ix_analyzed_article_url_hash', table_name='analyzed_article')
+        op.drop_column('analyzed_article', 'url_hash')
+
+    if 'url_hash' in [c['name'] for c in inspector.get_columns('article')]:
+        op.drop_index('ix_article_title_hash', table_name='article')
+        op.drop_index('ix_article_url_hash', table_name='article')
+        op.drop_column('article', 'title_hash')
+        op.drop_column('article', 'url_hash')
@@ -0,0 +1,78 @@
+"""simhash band indexes on article and article_source table for near-duplicates
+
+Revision ID: f7b9d1e3a5c6
+Revises: e6a8c0d2f4b5
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b9d1e3a5c6'
+down_revision: Union[str, None] = 'e6a8c0d2f4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SIMHASH_BANDS / SIMHASH_BAND_BITS in config.py
+BANDS = 8
+BAND_BITS = 8
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    # No backfill: the body is not stored, only articles scraped from now on get a SimHash
+    if 'simhash' not in [c['name'] for c in inspector.get_columns('article')]:
+        op.add_column('article', sa.Column('simhash', sa.BigInteger(), nullable=True))
+
+    existing_indexes = {index['name'] for index in inspector.get_indexes('article')}
+    mask = (1 << BAND_BITS) - 1
+    for band in range(BANDS):
+        name = f'ix_article_simhash_band_{band}'
+        if name not in existing_indexes:
+            op.create_index(name, 'article',
+                            ['coin_bot_id', sa.text(f'((simhash >> {band * BAND_BITS}) & {mask})')],
+                            postgresql_where=sa.text('simhash IS NOT NULL'))
+
+    if 'article_source' not in inspector.get_table_names():
+        op.create_table(
+            'article_source',
+            sa.Column('source_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('article_id', sa.Integer(), nullable=False),
+            sa.Column('url', sa.String(), nullable=False),
+            sa.Column('url_hash', sa.String(length=64), nullable=True),
+            sa.Column('title', sa.String(), nullable=True),
+            sa.Column('simhash', sa.BigInteger(), nullable=True),
+            sa.Column('distance', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.ForeignKeyConstraint(['article_id'], ['article.article_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('source_id')
+        )
+        op.create_index('ix_article_source_article_id', 'article_source', ['article_id'], unique=False)
+        op.create_index('ix_article_source_url_hash', 'article_source', ['url_hash'], unique=True)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+
+    if 'article_source' in inspector.get_table_names():
+        op.drop_index('ix_article_source_url_hash', table_name='article_source')
+        op.drop_index('ix_article_source_article_id', table_name='article_source')
+        op.drop_table('article_source')
+
+    existing_indexes = {index['name'] for index in inspector.get_indexes('article')}
+    for band in range(BANDS):
+        name = f'ix_article_simhash_band_{band}'
+        if name in existing_indexes:
+            op.drop_index(name, table_name='article')
+
+    if 'simhash' in [c['name'] for c in inspector.get_columns('article')]:
+        op.drop_column('article', 'simhash')
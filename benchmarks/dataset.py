@@ -0,0 +1,363 @@
+"""
+Production-scale synthetic data for query benchmarks, loaded with COPY.
+
+Fills the config.py schema of the configured database (DATABASE_URL_DEV,
+or DATABASE_URL_PROD with FLASK_ENV=production) on top of the coins,
+categories and topics created at startup:
+
+    python -m benchmarks.dataset --scale 1 --truncate
+    python -m benchmarks.dataset --scale 0.05            # ~5% of the rows, appended
+
+At scale 1 that is 2M articles, each with its used_keywords row, 1M alerts,
+notifications and charts, 300k analyses over the five section tables and
+20 to 80 keywords per coin. Rows are skewed toward the popular coins (Zipf
+over the coin bots in id order, BTC and ETH first), created over the last
+two years with traffic growing toward the end date, and inserted in
+created_at order like the live tables. About 5% of the articles are
+near-duplicates of a recent one (SimHash a few bits apart).
+
+The same --seed, --scale and --end give the same rows: each table draws
+from a generator of its own. --truncate empties the generated tables (and
+the tables referencing them) first; without it rows are appended after the
+current maximum ids.
+"""
+import argparse
+import io
+import random
+import time
+from collections import deque
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from sqlalchemy import text
+from benchmarks.micro.data import WORDS
+from config import (Alert, Analysis, Article, Category, Chart, CoinBot, DailyMacroAnalysis, Keyword, NarrativeTrading,
+                    Notification, SAndRAnalysis, SpotlightAnalysis, Topic, Used_keywords, engine)
+from utils.fingerprint import title_fingerprint, url_fingerprint
+
+SEED = 1234
+HISTORY_DAYS = 730
+CHUNK_ROWS = 50000
+ZIPF_EXPONENT = 1.1
+NEAR_DUPLICATE_RATE = 0.05
+
+# Rows at scale 1
+ROWS = {
+    'article': 2_000_000,
+    'alert': 1_000_000,
+    'notifications': 1_000_000,
+    'chart': 1_000_000,
+    'analysis': 120_000,
+    's_and_r_analysis': 60_000,
+    'narrative_trading': 60_000,
+    'daily_macro_analysis': 30_000,
+    'spotlight_analysis': 30_000,
+}
+
+# (model, content column) of the five section tables
+ANALYSIS_TABLES = (
+    (Analysis, 'analysis'),
+    (SAndRAnalysis, 'analysis'),
+    (NarrativeTrading, 'narrative_trading'),
+    (DailyMacroAnalysis, 'content'),
+    (SpotlightAnalysis, 'content'),
+)
+
+TIMEFRAMES = ['1h', '4h', '1d', '1w']
+NEWS_SITES = ['coindesk.com', 'cointelegraph.com', 'decrypt.co', 'theblock.co', 'ambcrypto.com', 'beincrypto.com']
+# Notification.type of each Topic.type
+NOTIFICATION_TYPES = {'alerts': 'alert'}
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    return str(value)
+
+
+class CopyLoader:
+    """
+    Buffers rows per table and loads them with COPY ... FROM STDIN every CHUNK_ROWS rows,
+    in the order the tables were first added to (parents before children).
+    """
+
+    def __init__(self, cursor, chunk_rows: int = CHUNK_ROWS):
+        self.cursor = cursor
+        self.chunk_rows = chunk_rows
+        self.buffers = {}
+        self.loaded = {}
+
+    def add(self, table: str, columns, row) -> None:
+        if table not in self.buffers:
+            self.buffers[table] = [columns, io.StringIO(), 0]
+            self.loaded.setdefault(table, 0)
+        buffer = self.buffers[table]
+        buffer[1].write('\t'.join(map(_copy_value, row)))
+        buffer[1].write('\n')
+        buffer[2] += 1
+        if buffer[2] >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, (columns, data, count) in self.buffers.items():
+            if not count:
+                continue
+            data.seek(0)
+            self.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", data)
+            self.loaded[table] += count
+            self.buffers[table] = [columns, io.StringIO(), 0]
+
+
+class Dataset:
+    def __init__(self, cursor, seed: int, scale: float, end: datetime):
+        self.cursor = cursor
+        self.seed = seed
+        self.scale = scale
+        self.end = end
+        self.start = end - timedelta(days=HISTORY_DAYS)
+
+        self.coins = self._fetch(
+            f"SELECT c.bot_id, c.name, cat.name FROM {CoinBot.__tablename__} c "
+            f"JOIN {Category.__tablename__} cat ON cat.category_id = c.category_id ORDER BY c.bot_id")
+        if not self.coins:
+            raise SystemExit('No coin bots in the database, run populate_categories_and_coins (or the app) first')
+        weights = [1 / rank ** ZIPF_EXPONENT for rank in range(1, len(self.coins) + 1)]
+        self.coin_weights = list(accumulate(weights))
+        self.keywords = {}
+
+    def _fetch(self, statement: str):
+        self.cursor.execute(statement)
+        return self.cursor.fetchall()
+
+    def rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def rows(self, table: str) -> int:
+        return max(1, int(ROWS[table] * self.scale))
+
+    def next_id(self, model) -> int:
+        table = model.__table__
+        primary_key = table.primary_key.columns.values()[0].name
+        return self._fetch(f"SELECT COALESCE(MAX({primary_key}), 0) + 1 FROM {table.name}")[0][0]
+
+    def popular_coins(self, rng: random.Random, count: int):
+        return rng.choices(self.coins, cum_weights=self.coin_weights, k=count)
+
+    def timestamps(self, rng: random.Random, count: int):
+        """
+        count ascending timestamps between start and end, denser toward the end
+        (linearly growing traffic: the i-th of count stratified quantiles, inverse CDF sqrt).
+        """
+        span = (self.end - self.start).total_seconds()
+        for index in range(count):
+            yield self.start + timedelta(seconds=span * ((index + rng.random()) / count) ** 0.5)
+
+    @staticmethod
+    def text(rng: random.Random, words: int) -> str:
+        return ' '.join(rng.choices(WORDS, k=words)).capitalize()
+
+    def paragraphs(self, rng: random.Random, count: int) -> str:
+        return '\n'.join(f"<p>{self.text(rng, rng.randint(40, 80))}.</p>" for _ in range(count))
+
+    # ---------- tables ----------
+
+    def generate_keywords(self, loader: CopyLoader) -> None:
+        rng = self.rng('keyword')
+        keyword_id = self.next_id(Keyword)
+        created_at = self.start
+        for rank, (bot_id, name, _) in enumerate(self.coins, start=1):
+            words = {name}
+            target = max(20, int(80 / rank ** 0.5))
+            while len(words) < target:
+                words.add(' '.join(rng.sample(WORDS, rng.randint(1, 2))))
+            self.keywords[bot_id] = sorted(words)
+            for word in self.keywords[bot_id]:
+                loader.add(Keyword.__tablename__, ('keyword_id', 'word', 'coin_bot_id', 'created_at', 'updated_at'),
+                           (keyword_id, word, bot_id, created_at, created_at))
+                keyword_id += 1
+
+    def generate_articles(self, loader: CopyLoader) -> None:
+        rng = self.rng('article')
+        count = self.rows('article')
+        article_id = self.next_id(Article)
+        used_keyword_id = self.next_id(Used_keywords)
+        recent = deque(maxlen=1000)
+        coins = self.popular_coins(rng, count)
+
+        for (bot_id, name, _), created_at in zip(coins, self.timestamps(rng, count)):
+            title = f"{name.upper()} {self.text(rng, rng.randint(6, 12))} ({article_id})"
+            site = rng.choice(NEWS_SITES)
+            url = f"https://{site}/news/{'-'.join(title.lower().split()[1:6])}-{article_id}"
+            summary = ' '.join(f"{self.text(rng, rng.randint(12, 25))}." for _ in range(rng.randint(3, 6)))
+            if recent and rng.random() < NEAR_DUPLICATE_RATE:
+                fingerprint = rng.choice(recent)
+                for bit in rng.sample(range(64), rng.randint(1, 5)):
+                    fingerprint ^= 1 << bit
+            else:
+                fingerprint = rng.getrandbits(64)
+            recent.append(fingerprint)
+            simhash = fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+            article_date = created_at.strftime('%Y-%m-%d %H:%M:%S')
+            keywords = ', '.join(sorted(rng.sample(self.keywords[bot_id], rng.randint(1, 4))))
+
+            loader.add(Article.__tablename__,
+                       ('article_id', 'date', 'title', 'url', 'url_hash', 'title_hash', 'simhash', 'summary',
+                        'created_at', 'updated_at', 'coin_bot_id'),
+                       (article_id, article_date, title, url, url_fingerprint(url), title_fingerprint(title), simhash,
+                        summary, created_at, created_at, bot_id))
+            loader.add(Used_keywords.__tablename__,
+                       ('id', 'article_content', 'article_date', 'article_url', 'keywords', 'source', 'article_id',
+                        'coin_bot_id', 'created_at', 'updated_at'),
+                       (used_keyword_id, summary, article_date, url, keywords, url.split('.com')[0], article_id, bot_id,
+                        created_at, created_at))
+            article_id += 1
+            used_keyword_id += 1
+
+    def generate_alerts(self, loader: CopyLoader) -> None:
+        rng = self.rng('alert')
+        count = self.rows('alert')
+        alert_id = self.next_id(Alert)
+        prices = {bot_id: rng.uniform(0.05, 60000) for bot_id, _, _ in self.coins}
+
+        for (bot_id, name, _), created_at in zip(self.popular_coins(rng, count), self.timestamps(rng, count)):
+            prices[bot_id] *= 1 + rng.gauss(0, 0.01)
+            timeframe = rng.choice(TIMEFRAMES)
+            direction = rng.choice(['BULLISH', 'BEARISH'])
+            loader.add(Alert.__tablename__,
+                       ('alert_id', 'alert_name', 'alert_message', 'symbol', 'price', 'coin_bot_id', 'created_at', 'updated_at'),
+                       (alert_id, f"{name.upper()}USDT {timeframe.upper()} CHART - {direction}",
+                        f"{self.text(rng, rng.randint(8, 20))}.", f"{name}usdt", round(prices[bot_id], 6), bot_id,
+                        created_at, created_at))
+            alert_id += 1
+
+    def generate_charts(self, loader: CopyLoader) -> None:
+        rng = self.rng('chart')
+        count = self.rows('chart')
+        chart_id = self.next_id(Chart)
+        prices = {bot_id: rng.uniform(0.05, 60000) for bot_id, _, _ in self.coins}
+
+        for (bot_id, name, _), created_at in zip(self.popular_coins(rng, count), self.timestamps(rng, count)):
+            prices[bot_id] *= 1 + rng.gauss(0, 0.01)
+            price = prices[bot_id]
+            supports = sorted((price * (1 - rng.uniform(0.01, 0.2)) for _ in range(4)), reverse=True)
+            resistances = sorted(price * (1 + rng.uniform(0.01, 0.2)) for _ in range(4))
+            loader.add(Chart.__tablename__,
+                       ('chart_id', 'support_1', 'support_2', 'support_3', 'support_4', 'resistance_1', 'resistance_2',
+                        'resistance_3', 'resistance_4', 'token', 'pair', 'temporality', 'is_essential', 'coin_bot_id',
+                        'created_at', 'updated_at'),
+                       (chart_id, *(round(level, 6) for level in supports + resistances), name, 'USDT',
+                        rng.choice(TIMEFRAMES), rng.random() < 0.1, bot_id, created_at, created_at))
+            chart_id += 1
+
+    def generate_notifications(self, loader: CopyLoader) -> None:
+        rng = self.rng('notifications')
+        count = self.rows('notifications')
+        notification_id = self.next_id(Notification)
+        topics_by_coin = {}
+        for topic_id, topic_type, reference in self._fetch(f"SELECT id, type, reference FROM {Topic.__tablename__} ORDER BY id"):
+            for coin in (reference or '').split(', '):
+                topics_by_coin.setdefault(coin.strip().lower(), []).append((topic_id, topic_type))
+        if not topics_by_coin:
+            print('---- No topics in the database, notifications skipped ----')
+            return
+
+        for (_, name, _), created_at in zip(self.popular_coins(rng, count), self.timestamps(rng, count)):
+            topic_id, topic_type = rng.choice(topics_by_coin.get(name.lower()) or rng.choice(list(topics_by_coin.values())))
+            loader.add(Notification.__tablename__,
+                       ('id', 'title', 'body', 'type', 'coin', 'topic_id', 'created_at', 'updated_at'),
+                       (notification_id, f"{name.upper()} {self.text(rng, rng.randint(3, 7))}",
+                        f"{self.text(rng, rng.randint(10, 25))}.", NOTIFICATION_TYPES.get(topic_type, topic_type), name,
+                        topic_id, created_at, created_at))
+            notification_id += 1
+
+    def generate_analyses(self, loader: CopyLoader) -> None:
+        for model, content_column in ANALYSIS_TABLES:
+            table = model.__tablename__
+            rng = self.rng(table)
+            count = self.rows(table)
+            primary_key = model.__table__.primary_key.columns.values()[0].name
+            row_id = self.next_id(model)
+
+            for (bot_id, name, category_name), created_at in zip(self.popular_coins(rng, count), self.timestamps(rng, count)):
+                content = f"<h2>{name.upper()}: {self.text(rng, rng.randint(4, 9))}</h2><br>{self.paragraphs(rng, rng.randint(2, 4))}"
+                image_url = f"https://aialpha.s3.amazonaws.com/{table}/{row_id}.jpg" if rng.random() < 0.8 else ''
+                loader.add(table, (primary_key, content_column, 'image_url', 'category_name', 'coin_bot_id', 'created_at', 'updated_at'),
+                           (row_id, content, image_url, category_name, bot_id, created_at, created_at))
+                row_id += 1
+
+
+GENERATORS = (
+    ('keywords', Dataset.generate_keywords, (Keyword,)),
+    ('articles and used keywords', Dataset.generate_articles, (Article, Used_keywords)),
+    ('alerts', Dataset.generate_alerts, (Alert,)),
+    ('charts', Dataset.generate_charts, (Chart,)),
+    ('notifications', Dataset.generate_notifications, (Notification,)),
+    ('analyses', Dataset.generate_analyses, tuple(model for model, _ in ANALYSIS_TABLES)),
+)
+
+
+def generate(scale: float = 1.0, seed: int = SEED, end: datetime = None, truncate: bool = False) -> dict:
+    """
+    Generates and loads the dataset, returns the rows loaded per table.
+    """
+    end = end or datetime.combine(date.today(), datetime.min.time())
+    tables = [model.__table__ for _, _, models in GENERATORS for model in models]
+    loaded = {}
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if truncate:
+            cursor.execute(f"TRUNCATE {', '.join(table.name for table in tables)} RESTART IDENTITY CASCADE")
+        dataset = Dataset(cursor, seed, scale, end)
+
+        for label, generator, models in GENERATORS:
+            started = time.perf_counter()
+            loader = CopyLoader(cursor)
+            generator(dataset, loader)
+            loader.flush()
+            rows = sum(loader.loaded.values())
+            elapsed = time.perf_counter() - started
+            print(f"---- {label}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s) ----")
+            loaded.update(loader.loaded)
+
+        for table in tables:
+            primary_key = table.primary_key.columns.values()[0].name
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table.name}', '{primary_key}'), "
+                           f"(SELECT COALESCE(MAX({primary_key}), 0) + 1 FROM {table.name}), false)")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    # Fresh statistics, so the plans are the ones production gets
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        for table in tables:
+            connection.execute(text(f"ANALYZE {table.name}"))
+    return loaded
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='fraction of the scale 1 row counts')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--end', type=date.fromisoformat, default=date.today(),
+                        help='date of the newest rows, YYYY-MM-DD (default: today)')
+    parser.add_argument('--truncate', action='store_true', help='empty the generated tables first')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    loaded = generate(args.scale, args.seed, datetime.combine(args.end, datetime.min.time()), args.truncate)
+    print(f"---- {sum(loaded.values())} rows in {len(loaded)} tables, {time.perf_counter() - started:.0f}s ----")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
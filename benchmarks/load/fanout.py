@@ -0,0 +1,197 @@
+"""
+Socket.IO fan-out latency: how long an event published to the message queue
+takes to reach every connected client, across all the Socket.IO instances of
+the app (script.sh).
+
+    python benchmarks/load/fanout.py --host http://app:9002 --connections 10000 --out benchmarks/load/results/<run>
+
+The clients are spread over processes, each one with its own X-Forwarded-For
+address so nginx spreads them over the instances. Once they are all connected,
+probes are published the way worker.py publishes its events (a write-only
+RedisManager on the app's channel) and each client records when it received
+them. Writes <out>/fanout.json and <out>/fanout.md and prints the latter.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import statistics
+import time
+
+import socketio
+
+PROBE_EVENT = 'fanout_probe'
+
+
+def client_address(index: int) -> str:
+    return f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+
+
+async def run_clients(args, first: int, count: int, reports: multiprocessing.Queue, stop: multiprocessing.Event):
+    received = []
+    clients = []
+    connecting = asyncio.Semaphore(args.connect_concurrency)
+
+    async def connect(index: int):
+        sio = socketio.AsyncClient(reconnection=False)
+
+        @sio.on(PROBE_EVENT)
+        async def on_probe(data):
+            received.append((data['seq'], time.time() - data['sent_at']))
+
+        async with connecting:
+            try:
+                await sio.connect(args.host, transports=args.transports.split(','), wait_timeout=30,
+                                  headers={'X-Forwarded-For': client_address(index)})
+            except Exception:
+                return
+        clients.append(sio)
+
+    await asyncio.gather(*(connect(index) for index in range(first, first + count)))
+    reports.put(('connected', len(clients)))
+
+    while not stop.is_set():
+        await asyncio.sleep(0.2)
+
+    connected = sum(1 for sio in clients if sio.connected)
+    await asyncio.gather(*(sio.disconnect() for sio in clients), return_exceptions=True)
+    reports.put(('received', connected, received))
+
+
+def client_process(args, first: int, count: int, reports: multiprocessing.Queue, stop: multiprocessing.Event):
+    # One descriptor per connection
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    asyncio.run(run_clients(args, first, count, reports, stop))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(args, connected: int, still_connected: int, received) -> dict:
+    by_probe = {}
+    for seq, latency in received:
+        by_probe.setdefault(seq, []).append(latency * 1000)
+
+    probes = []
+    for seq in range(args.probes):
+        latencies = by_probe.get(seq, [])
+        probes.append({
+            'seq': seq,
+            'delivered': len(latencies),
+            'delivery_ratio': len(latencies) / connected if connected else 0,
+            # Time for the probe to reach the last client that received it
+            'all_ms': max(latencies) if latencies else None,
+        })
+
+    latencies = [latency for latencies in by_probe.values() for latency in latencies]
+    return {
+        'connections': args.connections,
+        'connected': connected,
+        'still_connected': still_connected,
+        'transports': args.transports,
+        'probes': probes,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': max(latencies),
+        } if latencies else None,
+        'all_ms_p50': statistics.median(p['all_ms'] for p in probes if p['all_ms'] is not None)
+        if any(p['all_ms'] is not None for p in probes) else None,
+    }
+
+
+def render(summary: dict) -> str:
+    latency = summary['latency_ms'] or {}
+    lines = [
+        '# Socket.IO fan-out',
+        '',
+        f"{summary['connected']}/{summary['connections']} clients connected ({summary['transports']}), "
+        f"{summary['still_connected']} still connected at the end",
+        '',
+        '| Delivery latency | p50 (ms) | p90 (ms) | p99 (ms) | max (ms) |',
+        '|---|---:|---:|---:|---:|',
+        f"| per client | {latency.get('p50', 0):.1f} | {latency.get('p90', 0):.1f} | {latency.get('p99', 0):.1f} | "
+        f"{latency.get('max', 0):.1f} |",
+        '',
+        f"Median time for a probe to reach every client: {summary['all_ms_p50'] or 0:.1f} ms",
+        '',
+        '| Probe | Delivered | Ratio | Last client (ms) |',
+        '|---:|---:|---:|---:|',
+    ]
+    for probe in summary['probes']:
+        all_ms = f"{probe['all_ms']:.1f}" if probe['all_ms'] is not None else '-'
+        lines.append(f"| {probe['seq']} | {probe['delivered']} | {probe['delivery_ratio']:.1%} | {all_ms} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='http://app:9002')
+    parser.add_argument('--connections', type=int, default=10000)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--transports', default='websocket')
+    parser.add_argument('--connect-concurrency', type=int, default=50, help='Handshakes in flight per process')
+    parser.add_argument('--connect-timeout', type=float, default=600)
+    parser.add_argument('--probes', type=int, default=20)
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between probes')
+    parser.add_argument('--message-queue', default=os.getenv('SOCKETIO_MESSAGE_QUEUE', 'redis://redis:6379/0'))
+    parser.add_argument('--channel', default=os.getenv('SOCKETIO_CHANNEL', 'ai-alpha-socketio-0'))
+    parser.add_argument('--out', default='.')
+    args = parser.parse_args()
+
+    reports = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    per_process, extra = divmod(args.connections, args.processes)
+    processes, first = [], 0
+    for i in range(args.processes):
+        count = per_process + (1 if i < extra else 0)
+        process = multiprocessing.Process(target=client_process, args=(args, first, count, reports, stop))
+        process.start()
+        processes.append(process)
+        first += count
+
+    start = time.perf_counter()
+    connected = 0
+    for _ in processes:
+        _, count = reports.get(timeout=args.connect_timeout)
+        connected += count
+    print(f"{connected}/{args.connections} clients connected in {time.perf_counter() - start:.1f} s")
+
+    emitter = socketio.RedisManager(args.message_queue, channel=args.channel, write_only=True)
+    for seq in range(args.probes):
+        emitter.emit(PROBE_EVENT, {'seq': seq, 'sent_at': time.time()}, namespace='/')
+        time.sleep(args.interval)
+    # Late deliveries
+    time.sleep(max(args.interval, 5))
+    stop.set()
+
+    still_connected, received = 0, []
+    for _ in processes:
+        try:
+            _, count, process_received = reports.get(timeout=120)
+        except queue.Empty:
+            break
+        still_connected += count
+        received += process_received
+    for process in processes:
+        process.join(timeout=30)
+
+    summary = summarize(args, connected, still_connected, received)
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, 'fanout.json'), 'w') as json_file:
+        json.dump(summary, json_file, indent=2)
+    report = render(summary)
+    with open(os.path.join(args.out, 'fanout.md'), 'w') as report_file:
+        report_file.write(report)
+    print(report)
+
+
+if __name__ == '__main__':
+    main()
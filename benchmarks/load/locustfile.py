@@ -0,0 +1,144 @@
+"""
+Scenario mix of the load test, modeled on production traffic: mostly /coins,
+/analyses and /chart/ohlc reads from the apps, the /chart/widget embeds,
+TradingView alert webhooks on /chart-data and clients subscribed to the
+'/chart' Socket.IO namespace.
+
+    locust -f benchmarks/load/locustfile.py --host http://app:9002
+
+API_KEY (LOAD_API_KEY) is the key created by seed.py, SUBSCRIBERS the number of
+Socket.IO clients kept connected for the whole run (on top of the HTTP users).
+"""
+import os
+import random
+import time
+import socketio
+from locust import HttpUser, User, between, events, task
+
+API_KEY = os.getenv('LOAD_API_KEY', 'alpha_load_test')
+SUBSCRIBERS = int(os.getenv('SUBSCRIBERS', 20))
+# Popular coins get most of the traffic
+COINS = ['btc', 'eth', 'sol', 'xrp', 'ada', 'avax', 'link', 'dot', 'matic', 'arb', 'op', 'near', 'uni', 'aave', 'fet', 'rndr']
+COIN_WEIGHTS = [1 / (rank + 1) for rank in range(len(COINS))]
+GECKO_IDS = {'btc': 'bitcoin', 'eth': 'ethereum', 'sol': 'solana', 'xrp': 'ripple', 'ada': 'cardano', 'avax': 'avalanche-2',
+             'link': 'chainlink', 'dot': 'polkadot', 'matic': 'matic-network', 'arb': 'arbitrum', 'op': 'optimism',
+             'near': 'near', 'uni': 'uniswap', 'aave': 'aave', 'fet': 'fetch-ai', 'rndr': 'render-token'}
+INTERVALS = ['1h', '4h', '1d', '1w']
+
+
+def popular_coin() -> str:
+    return random.choices(COINS, weights=COIN_WEIGHTS)[0]
+
+
+def chart_data_alert(coin: str) -> str:
+    """
+    The 12 line body TradingView posts to /chart-data.
+    """
+    price = random.uniform(1, 60000)
+    levels = [f"S{index}: {price * (1 - index * 0.02):.4f}" for index in range(1, 5)]
+    levels += [f"R{index}: {price * (1 + index * 0.02):.4f}" for index in range(1, 5)]
+    lines = [f"Symbol: {coin.upper()}USDT", f"Timeframe: {random.choice(INTERVALS)}", *levels,
+             f"Essential: {str(random.random() < 0.1).lower()}", f"Direction: {random.choice(['up', 'down'])}"]
+    return '\n'.join(lines)
+
+
+class AppUser(HttpUser):
+    """
+    An app or web client reading the feeds and charts.
+    """
+    weight = 10
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        self.client.headers['X-API-Key'] = API_KEY
+
+    @task(8)
+    def coins(self):
+        self.client.get('/coins')
+
+    @task(6)
+    def analyses(self):
+        params = {'page': random.choices([1, 2, 3, 10], weights=[8, 3, 2, 1])[0], 'per_page': 10}
+        if random.random() < 0.3:
+            params['coin'] = popular_coin()
+        self.client.get('/analyses', params=params, name='/analyses')
+
+    @task(6)
+    def chart_ohlc(self):
+        coin = popular_coin()
+        self.client.get('/chart/ohlc', params={'gecko_id': GECKO_IDS[coin], 'symbol': coin, 'vs_currency': 'usd',
+                                               'interval': random.choice(INTERVALS)}, name='/chart/ohlc')
+
+    @task(3)
+    def alerts(self):
+        self.client.post('/alerts/coins', json={'coins': random.sample(COINS[:6], 2), 'timeframe': random.choice(INTERVALS)})
+
+
+class WidgetUser(HttpUser):
+    """
+    A page embedding the chart widget (no API key, whitelisted).
+    """
+    weight = 2
+    wait_time = between(5, 15)
+
+    @task
+    def widget(self):
+        self.client.get('/chart/widget', params={'symbol': f"{popular_coin().upper()}USDT", 'interval': random.choice(INTERVALS)},
+                        name='/chart/widget')
+
+
+class TradingViewWebhook(HttpUser):
+    """
+    TradingView posting support and resistance alerts, which fan out to FCM, Telegram and Slack.
+    """
+    weight = 1
+    wait_time = between(2, 6)
+
+    @task
+    def chart_data(self):
+        self.client.post('/chart-data', data=chart_data_alert(popular_coin()), headers={'Content-Type': 'text/plain'})
+
+
+class ChartSubscriber(User):
+    """
+    A client connected to the '/chart' namespace for live updates. Connecting is
+    reported as 'socketio connect' and each received event as 'socketio <event>',
+    so the report counts the events pushed to the subscribers.
+    """
+    fixed_count = SUBSCRIBERS
+    wait_time = between(20, 40)
+
+    def on_start(self):
+        self.sio = socketio.Client(reconnection=False)
+        for event in ('connection_established', 'update', 'new_analysis'):
+            self.sio.on(event, self._received(event), namespace='/chart')
+
+        start = time.perf_counter()
+        try:
+            # A client address each, so nginx spreads the subscribers over the Socket.IO instances
+            self.sio.connect(self.host, namespaces=['/chart'], transports=os.getenv('SOCKETIO_TRANSPORTS', 'polling,websocket').split(','),
+                             headers={'X-Forwarded-For': f"10.1.{random.randint(0, 255)}.{random.randint(1, 254)}"},
+                             wait_timeout=10)
+        except Exception as e:
+            self._fire('connect', start, exception=e)
+            raise
+        self._fire('connect', start)
+        self.sio.emit('subscribe', {'symbol': f"{popular_coin()}usdt", 'interval': '1m'}, namespace='/chart')
+
+    def on_stop(self):
+        self.sio.disconnect()
+
+    def _fire(self, name: str, start: float, exception=None, length: int = 0):
+        events.request.fire(request_type='socketio', name=name, response_time=(time.perf_counter() - start) * 1000,
+                            response_length=length, exception=exception, context={})
+
+    def _received(self, event: str):
+        def handler(data=None):
+            events.request.fire(request_type='socketio', name=event, response_time=0, response_length=len(str(data)),
+                                exception=None, context={})
+        return handler
+
+    @task
+    def stay_connected(self):
+        if not self.sio.connected:
+            raise RuntimeError('Socket.IO subscriber disconnected')
@@ -0,0 +1,82 @@
+"""
+Summarizes a load test run: p50/p99 latency, throughput and failures per
+endpoint from the Locust CSV stats, with the gunicorn configuration, the
+upstream profile and the calls each upstream stand-in received.
+
+    python benchmarks/load/report.py benchmarks/load/results/<run> --stats-url http://upstreams:8080/__stats
+
+Writes <run>/report.md and prints it.
+"""
+import argparse
+import csv
+import json
+import os
+import urllib.request
+
+
+def endpoint_rows(stats_path: str):
+    with open(stats_path, newline='') as stats_file:
+        for row in csv.DictReader(stats_file):
+            requests = int(row['Request Count'])
+            yield {
+                'endpoint': 'all' if row['Name'] == 'Aggregated' else f"{row['Type']} {row['Name']}",
+                'requests': requests,
+                'failures': int(row['Failure Count']),
+                'p50': row['50%'],
+                'p99': row['99%'],
+                'rps': float(row['Requests/s']),
+            }
+
+
+def upstream_calls(stats_url: str):
+    try:
+        with urllib.request.urlopen(stats_url, timeout=5) as response:
+            return json.load(response)
+    except OSError as e:
+        return {'error': str(e)}
+
+
+def render(run_dir: str, stats_url: str) -> str:
+    with open(os.path.join(run_dir, 'run.json')) as run_file:
+        run = json.load(run_file)
+
+    lines = [
+        f"# Load test {os.path.basename(os.path.normpath(run_dir))}",
+        '',
+        f"gunicorn: {run['workers']} workers x {run['threads']} threads, upstream profile: {run['profile']}, "
+        f"{run['users']} HTTP users + {run['subscribers']} Socket.IO subscribers for {run['duration']}, "
+        f"dataset scale {run.get('dataset_scale', 0)}",
+        '',
+        '| Endpoint | Requests | Failures | p50 (ms) | p99 (ms) | req/s |',
+        '|---|---:|---:|---:|---:|---:|',
+    ]
+    for row in endpoint_rows(os.path.join(run_dir, 'locust_stats.csv')):
+        failure_rate = row['failures'] / row['requests'] if row['requests'] else 0
+        lines.append(f"| {row['endpoint']} | {row['requests']} | {row['failures']} ({failure_rate:.1%}) | "
+                     f"{row['p50']} | {row['p99']} | {row['rps']:.1f} |")
+
+    calls = upstream_calls(stats_url)
+    lines += ['', '## Upstream calls', '']
+    if 'error' in calls:
+        lines.append(f"Not available: {calls['error']}")
+    else:
+        lines += ['| Upstream | Responses |', '|---|---|']
+        for upstream, statuses in sorted(calls['calls'].items()):
+            lines.append(f"| {upstream} | {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('run_dir')
+    parser.add_argument('--stats-url', default='http://upstreams:8080/__stats')
+    args = parser.parse_args()
+
+    report = render(args.run_dir, args.stats_url)
+    with open(os.path.join(args.run_dir, 'report.md'), 'w') as report_file:
+        report_file.write(report)
+    print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/bin/bash
+# Runs the load test against a fresh stack and writes results/<run>/report.md.
+#
+#   benchmarks/load/run.sh [-w workers] [-t threads] [-p profile] [-u users] [-s subscribers] [-r spawn rate] [-d duration]
+#                          [-g dataset scale] [-i socketio instances] [-k socketio threads] [-f fan-out connections]
+#
+# e.g. compare two gunicorn configurations under degraded upstreams:
+#   benchmarks/load/run.sh -w 3 -t 2 -p degraded
+#   benchmarks/load/run.sh -w 4 -t 8 -p degraded
+# -g 0.1 loads a tenth of the production-scale synthetic dataset (benchmarks/dataset.py) first.
+# -f 10000 measures the Socket.IO fan-out latency to 10000 clients (fanout.py) instead of running Locust:
+#   benchmarks/load/run.sh -i 10 -k 1100 -f 10000
+set -e
+
+cd "$(dirname "$0")"
+
+GUNICORN_WORKERS=3
+GUNICORN_THREADS=2
+UPSTREAM_PROFILE=nominal
+USERS=100
+SUBSCRIBERS=20
+SPAWN_RATE=10
+DURATION=5m
+DATASET_SCALE=0
+SOCKETIO_INSTANCES=2
+SOCKETIO_THREADS=1000
+FANOUT_CONNECTIONS=0
+
+while getopts "w:t:p:u:s:r:d:g:i:k:f:" option; do
+    case $option in
+        w) GUNICORN_WORKERS=$OPTARG ;;
+        t) GUNICORN_THREADS=$OPTARG ;;
+        p) UPSTREAM_PROFILE=$OPTARG ;;
+        u) USERS=$OPTARG ;;
+        s) SUBSCRIBERS=$OPTARG ;;
+        r) SPAWN_RATE=$OPTARG ;;
+        d) DURATION=$OPTARG ;;
+        g) DATASET_SCALE=$OPTARG ;;
+        i) SOCKETIO_INSTANCES=$OPTARG ;;
+        k) SOCKETIO_THREADS=$OPTARG ;;
+        f) FANOUT_CONNECTIONS=$OPTARG ;;
+        *) sed -n '2,13p' "$0"; exit 1 ;;
+    esac
+done
+export GUNICORN_WORKERS GUNICORN_THREADS UPSTREAM_PROFILE SUBSCRIBERS DATASET_SCALE SOCKETIO_INSTANCES SOCKETIO_THREADS
+
+RUN="$(date +%Y%m%d-%H%M%S)-w${GUNICORN_WORKERS}t${GUNICORN_THREADS}-${UPSTREAM_PROFILE}"
+if [ "$FANOUT_CONNECTIONS" != "0" ]; then
+    RUN="$(date +%Y%m%d-%H%M%S)-i${SOCKETIO_INSTANCES}k${SOCKETIO_THREADS}-fanout${FANOUT_CONNECTIONS}"
+fi
+mkdir -p "results/$RUN"
+cat > "results/$RUN/run.json" <<EOF
+{"workers": $GUNICORN_WORKERS, "threads": $GUNICORN_THREADS, "profile": "$UPSTREAM_PROFILE", "users": $USERS, "subscribers": $SUBSCRIBERS, "duration": "$DURATION", "dataset_scale": $DATASET_SCALE, "socketio_instances": $SOCKETIO_INSTANCES, "socketio_threads": $SOCKETIO_THREADS, "fanout_connections": $FANOUT_CONNECTIONS}
+EOF
+
+COMPOSE="docker compose -p ai-alpha-load -f docker-compose.yml"
+trap '$COMPOSE logs app > "results/$RUN/app.log" 2>&1; $COMPOSE down -v' EXIT
+
+$COMPOSE build
+if [ "$FANOUT_CONNECTIONS" != "0" ]; then
+    $COMPOSE run --rm locust python benchmarks/load/fanout.py --host http://app:9002 \
+        --connections "$FANOUT_CONNECTIONS" --out "benchmarks/load/results/$RUN"
+    exit
+fi
+# Starts db, redis, the stand-ins and the app, and seeds once the app is healthy
+$COMPOSE run --rm locust locust -f benchmarks/load/locustfile.py --host http://app:9002 --headless \
+    --users "$((USERS + SUBSCRIBERS))" --spawn-rate "$SPAWN_RATE" --run-time "$DURATION" --stop-timeout 10 \
+    --csv "benchmarks/load/results/$RUN/locust" --html "benchmarks/load/results/$RUN/locust.html" --only-summary || true
+$COMPOSE run --rm --no-deps locust python benchmarks/load/report.py "benchmarks/load/results/$RUN"
@@ -0,0 +1,54 @@
+"""
+Seeds the load-test database, run in the app image once the schema is migrated
+(the `seed` service of benchmarks/load/docker-compose.yml):
+
+    python benchmarks/load/seed.py
+
+Adds the categories and coins of models/init_data/data.json, the superadmin of
+the ADMIN_* variables and an API key for it with the value of LOAD_API_KEY,
+the key the Locust users send. With DATASET_SCALE, the synthetic dataset of
+benchmarks/dataset.py is loaded too, when there are no articles yet. Safe to
+run again.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config import Admin, APIKey, Article, Session, init_superadmin, populate_categories_and_coins  # noqa: E402
+
+
+def ensure_api_key(key: str) -> None:
+    with Session() as session:
+        admin = session.query(Admin).filter_by(username=os.getenv('ADMIN_USERNAME')).first()
+        if admin is None:
+            raise SystemExit('---- Error: the superadmin was not created, check the ADMIN_* variables ----')
+
+        if session.query(APIKey).filter_by(key=key).first() is None:
+            session.add(APIKey(admin_id=admin.admin_id, key=key))
+            session.commit()
+            print('---- Load test API key created ----')
+
+
+def main():
+    key = os.getenv('LOAD_API_KEY')
+    if not key:
+        raise SystemExit('---- Error: LOAD_API_KEY is not set ----')
+
+    populate_categories_and_coins()
+    init_superadmin()
+    ensure_api_key(key)
+
+    scale = float(os.getenv('DATASET_SCALE') or 0)
+    if scale:
+        with Session() as session:
+            has_articles = session.query(Article.article_id).first() is not None
+        if has_articles:
+            print('---- Articles already loaded, synthetic dataset skipped ----')
+        else:
+            from benchmarks.dataset import generate
+            generate(scale)
+
+
+if __name__ == '__main__':
+    main()
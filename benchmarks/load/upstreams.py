@@ -0,0 +1,371 @@
+"""
+Local stand-ins for the external services called by the hot endpoints:
+Binance REST and kline streams, CoinGecko, OpenAI, FCM (with the Google
+OAuth token endpoint), Slack and Telegram.
+
+One aiohttp server answers for every host on 443 and 9443 (Binance
+streams). The load-test compose network gives this container the real host
+names as aliases, and the app trusts the CA generated here, so the app
+runs unchanged and nothing can reach the live services.
+
+Each upstream has a latency and error profile (profiles.json): a lognormal
+latency fitted on p50/p99, and error statuses drawn with the given
+probabilities. The admin port serves the call counts and switches profiles:
+
+    GET  http://upstreams:8080/__stats
+    POST http://upstreams:8080/__profile?name=degraded
+
+    python -m benchmarks.load.upstreams --profile nominal --certs /certs
+"""
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import math
+import os
+import random
+import ssl
+import time
+from collections import defaultdict
+from aiohttp import WSMsgType, web
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles.json')
+
+HOSTS = {
+    'api.binance.com': 'binance',
+    'api3.binance.com': 'binance',
+    'stream.binance.com': 'binance_ws',
+    'pro-api.coingecko.com': 'coingecko',
+    'api.coingecko.com': 'coingecko',
+    'api.openai.com': 'openai',
+    'fcm.googleapis.com': 'fcm',
+    'oauth2.googleapis.com': 'fcm',
+    'slack.com': 'slack',
+    'hooks.slack.com': 'slack',
+    'api.telegram.org': 'telegram',
+}
+
+INTERVAL_SECONDS = {'1m': 60, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600, '4h': 14400, '1d': 86400, '1w': 604800}
+
+
+class Profile:
+    """
+    Latency and errors of one upstream.
+    """
+
+    def __init__(self, latency_ms=None, errors=None, ws_interval_s=1.0):
+        latency_ms = latency_ms or {'p50': 0, 'p99': 0}
+        self.p50 = latency_ms['p50'] / 1000
+        # p99 of a lognormal is exp(mu + 2.326 sigma)
+        self.sigma = math.log(latency_ms['p99'] / latency_ms['p50']) / 2.326 if latency_ms['p50'] else 0.0
+        self.errors = [(int(status), probability) for status, probability in (errors or {}).items()]
+        self.ws_interval_s = ws_interval_s
+
+    def latency(self, rng: random.Random) -> float:
+        if not self.p50:
+            return 0.0
+        return self.p50 * math.exp(rng.gauss(0, 1) * self.sigma)
+
+    def error_status(self, rng: random.Random):
+        draw = rng.random()
+        for status, probability in self.errors:
+            if draw < probability:
+                return status
+            draw -= probability
+        return None
+
+
+def load_profiles(name: str):
+    with open(PROFILES_PATH) as profiles_file:
+        profiles = json.load(profiles_file)
+    if name not in profiles:
+        raise SystemExit(f"Unknown profile {name!r}, expected one of: {', '.join(profiles)}")
+    settings = profiles[name]
+    default = settings.get('default', {})
+    return {upstream: Profile(**{**default, **settings.get(upstream, {})}) for upstream in set(HOSTS.values())}
+
+
+# ---------- fake payloads ----------
+
+def _walk(seed: str, count: int):
+    """
+    A deterministic random walk per symbol, so repeated calls return consistent prices.
+    """
+    rng = random.Random(int(hashlib.md5(seed.encode()).hexdigest()[:8], 16))
+    price = rng.uniform(1, 60000)
+    for _ in range(count):
+        open_price = price
+        price = max(0.0001, price * (1 + rng.gauss(0, 0.01)))
+        yield open_price, max(open_price, price) * 1.003, min(open_price, price) * 0.997, price, rng.uniform(100, 10000)
+
+
+def binance_klines(symbol: str, interval: str, limit: int):
+    step = INTERVAL_SECONDS.get(interval, 3600) * 1000
+    end = int(time.time() * 1000) // step * step
+    start = end - (limit - 1) * step
+    return [
+        [start + index * step, f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.4f}", start + (index + 1) * step - 1,
+         f"{v * c:.4f}", 1000 + index, f"{v / 2:.4f}", f"{v * c / 2:.4f}", "0"]
+        for index, (o, h, l, c, v) in enumerate(_walk(symbol + interval, limit))
+    ]
+
+
+def binance(request: web.Request):
+    query = request.query
+    if request.path.endswith('/klines'):
+        limit = min(int(query.get('limit', 500)), 1000)
+        return binance_klines(query.get('symbol', 'BTCUSDT'), query.get('interval', '1h'), limit)
+    if request.path.endswith('/ticker/price'):
+        return {'symbol': query.get('symbol', 'BTCUSDT'), 'price': f"{next(_walk(query.get('symbol', ''), 1))[3]:.8f}"}
+    if request.path.endswith('/ticker/24hr'):
+        o, h, l, c, v = next(_walk(query.get('symbol', ''), 1))
+        return {'symbol': query.get('symbol', 'BTCUSDT'), 'lastPrice': f"{c:.8f}", 'priceChangePercent': f"{(c / o - 1) * 100:.2f}",
+                'highPrice': f"{h:.8f}", 'lowPrice': f"{l:.8f}", 'volume': f"{v:.4f}"}
+    return {}
+
+
+def coingecko(request: web.Request):
+    parts = [part for part in request.path.split('/') if part]
+    # /api/v3/coins/{id}/ohlc, /api/v3/coins/{id}, /api/v3/simple/price, /api/v3/coins/markets
+    if parts[-1] == 'ohlc':
+        days = int(request.query.get('days', 30))
+        step = 4 * 3600 * 1000 if days > 2 else 1800 * 1000
+        count = min(days * 86400 * 1000 // step, 500)
+        end = int(time.time() * 1000) // step * step
+        return [[end - (count - 1 - index) * step, round(o, 8), round(h, 8), round(l, 8), round(c, 8)]
+                for index, (o, h, l, c, _) in enumerate(_walk(parts[-2], count))]
+    if parts[-2:] == ['simple', 'price']:
+        currency = request.query.get('vs_currencies', 'usd')
+        return {coin_id: {currency: round(next(_walk(coin_id, 1))[3], 8)} for coin_id in request.query.get('ids', '').split(',') if coin_id}
+    if parts[-1] == 'markets':
+        ids = [coin_id for coin_id in request.query.get('ids', 'bitcoin').split(',') if coin_id]
+        return [{'id': coin_id, 'symbol': coin_id[:4], 'name': coin_id.title(), 'current_price': next(_walk(coin_id, 1))[3],
+                 'market_cap': 10 ** 9, 'total_volume': 10 ** 8, 'price_change_percentage_24h': 1.5,
+                 'image': f"https://assets.coingecko.com/coins/images/1/large/{coin_id}.png"} for coin_id in ids]
+    if parts[-1] == 'key':
+        return {'plan': 'load-test', 'rate_limit_request_per_minute': 10 ** 6, 'monthly_call_credit': 10 ** 9,
+                'current_total_monthly_calls': 0, 'current_remaining_monthly_calls': 10 ** 9}
+    if len(parts) >= 2 and parts[-2] == 'coins':
+        coin_id = parts[-1]
+        price = next(_walk(coin_id, 1))[3]
+        return {'id': coin_id, 'symbol': coin_id[:4], 'name': coin_id.title(),
+                'image': {'large': f"https://assets.coingecko.com/coins/images/1/large/{coin_id}.png"},
+                'market_data': {'current_price': {'usd': price}, 'market_cap': {'usd': 10 ** 9}, 'total_volume': {'usd': 10 ** 8},
+                                'price_change_percentage_24h': 1.5, 'circulating_supply': 10 ** 7, 'total_supply': 2 * 10 ** 7}}
+    return {}
+
+
+def openai(request: web.Request):
+    created = int(time.time())
+    if request.path.endswith('/models'):
+        return {'object': 'list', 'data': [{'id': model, 'object': 'model', 'created': created, 'owned_by': 'openai'}
+                                           for model in ('gpt-4o', 'gpt-4o-mini', 'dall-e-3')]}
+    if request.path.endswith('/images/generations'):
+        return {'created': created, 'data': [{'url': 'https://example.com/load-test.png', 'revised_prompt': ''}]}
+    return {
+        'id': f"chatcmpl-{created}", 'object': 'chat.completion', 'created': created, 'model': 'gpt-4o',
+        'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {
+            'role': 'assistant', 'content': 'Load test summary.<br>Markets moved sideways while volumes stayed flat.'}}],
+        'usage': {'prompt_tokens': 500, 'completion_tokens': 60, 'total_tokens': 560}
+    }
+
+
+def fcm(request: web.Request):
+    if request.path.endswith('/token'):
+        return {'access_token': 'load-test-token', 'expires_in': 3600, 'token_type': 'Bearer'}
+    return {'name': f"projects/load-test/messages/{random.getrandbits(48)}"}
+
+
+def slack(request: web.Request):
+    if request.host.startswith('hooks.'):
+        return web.Response(text='ok')
+    return {'ok': True, 'channel': 'C0LOADTEST', 'ts': f"{time.time():.6f}", 'message': {'text': ''}}
+
+
+def telegram(request: web.Request):
+    method = request.path.rsplit('/', 1)[-1]
+    if method == 'createChatInviteLink':
+        return {'ok': True, 'result': {'invite_link': 'https://t.me/+loadtest', 'creates_join_request': False}}
+    return {'ok': True, 'result': {'message_id': random.getrandbits(31), 'date': int(time.time()), 'chat': {'id': -100}}}
+
+
+PAYLOADS = {'binance': binance, 'coingecko': coingecko, 'openai': openai, 'fcm': fcm, 'slack': slack, 'telegram': telegram}
+
+
+# ---------- server ----------
+
+class Upstreams:
+    def __init__(self, profile_name: str, seed: int):
+        self.profile_name = profile_name
+        self.profiles = load_profiles(profile_name)
+        self.rng = random.Random(seed)
+        self.stats = defaultdict(lambda: defaultdict(int))
+
+    def upstream(self, request: web.Request) -> str:
+        return HOSTS.get(request.host.split(':')[0], 'unknown')
+
+    async def handle(self, request: web.Request):
+        upstream = self.upstream(request)
+        if upstream == 'binance_ws':
+            return await self.kline_stream(request)
+
+        profile = self.profiles.get(upstream)
+        if profile is None:
+            self.stats[upstream]['404'] += 1
+            return web.json_response({'error': f"No stand-in for {request.host}"}, status=404)
+
+        await asyncio.sleep(profile.latency(self.rng))
+        status = profile.error_status(self.rng)
+        self.stats[upstream][str(status or 200)] += 1
+        if status is not None:
+            headers = {'Retry-After': '1'} if status == 429 else {}
+            return web.json_response({'error': 'injected', 'status': status}, status=status, headers=headers)
+
+        if request.can_read_body:
+            await request.read()
+        result = PAYLOADS[upstream](request)
+        return result if isinstance(result, web.StreamResponse) else web.json_response(result)
+
+    async def kline_stream(self, request: web.Request):
+        """
+        /ws/<symbol>@kline_<interval>: a kline event every ws_interval_s, the last one closed every tenth.
+        """
+        profile = self.profiles['binance_ws']
+        stream = request.path.rsplit('/', 1)[-1]
+        symbol, _, interval = stream.partition('@kline_')
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self.stats['binance_ws']['connections'] += 1
+
+        walk = _walk(symbol + interval, 10 ** 9)
+        step = INTERVAL_SECONDS.get(interval, 3600) * 1000
+        sent = 0
+        try:
+            while not ws.closed:
+                o, h, l, c, v = next(walk)
+                now = int(time.time() * 1000)
+                await ws.send_json({'e': 'kline', 'E': now, 's': symbol.upper(), 'k': {
+                    't': now // step * step, 'T': now // step * step + step - 1, 's': symbol.upper(), 'i': interval,
+                    'o': f"{o:.8f}", 'h': f"{h:.8f}", 'l': f"{l:.8f}", 'c': f"{c:.8f}", 'v': f"{v:.4f}", 'x': sent % 10 == 9
+                }})
+                sent += 1
+                self.stats['binance_ws']['messages'] += 1
+                try:
+                    message = await ws.receive(timeout=profile.ws_interval_s)
+                    if message.type in (WSMsgType.CLOSE, WSMsgType.CLOSED, WSMsgType.ERROR):
+                        break
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await ws.close()
+        return ws
+
+    async def get_stats(self, request: web.Request):
+        return web.json_response({'profile': self.profile_name, 'calls': self.stats})
+
+    async def set_profile(self, request: web.Request):
+        name = request.query.get('name', '')
+        try:
+            self.profiles = load_profiles(name)
+        except SystemExit as e:
+            return web.json_response({'error': str(e)}, status=400)
+        self.profile_name = name
+        return web.json_response({'profile': name})
+
+
+def ensure_certificates(certs_dir: str):
+    """
+    A CA and a certificate for every stand-in host, created once in certs_dir (ca.pem is the
+    bundle the app trusts), plus a service account for firebase-admin signed by a throwaway key.
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    ca_path = os.path.join(certs_dir, 'ca.pem')
+    cert_path = os.path.join(certs_dir, 'upstreams.pem')
+    key_path = os.path.join(certs_dir, 'upstreams.key')
+    if all(os.path.exists(path) for path in (ca_path, cert_path, key_path)):
+        return cert_path, key_path
+
+    os.makedirs(certs_dir, exist_ok=True)
+    now = datetime.datetime.utcnow()
+    ca_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'AI Alpha load test CA')])
+    ca_cert = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name).issuer_name(ca_name).public_key(ca_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=365))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(ca_key, hashes.SHA256())
+    )
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'upstreams')]))
+        .issuer_name(ca_name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=365))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(host) for host in HOSTS]), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+
+    with open(key_path, 'wb') as key_file:
+        key_file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                                         serialization.NoEncryption()))
+    with open(cert_path, 'wb') as cert_file:
+        cert_file.write(cert.public_bytes(serialization.Encoding.PEM) + ca_cert.public_bytes(serialization.Encoding.PEM))
+    with open(ca_path, 'wb') as ca_file:
+        ca_file.write(ca_cert.public_bytes(serialization.Encoding.PEM))
+
+    account_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with open(os.path.join(certs_dir, 'service-account.json'), 'w') as account_file:
+        json.dump({
+            'type': 'service_account',
+            'project_id': 'load-test',
+            'private_key_id': 'load-test',
+            'private_key': account_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                                     serialization.NoEncryption()).decode(),
+            'client_email': 'load-test@load-test.iam.gserviceaccount.com',
+            'client_id': '0',
+            'token_uri': 'https://oauth2.googleapis.com/token',
+        }, account_file)
+    return cert_path, key_path
+
+
+async def serve(args):
+    upstreams = Upstreams(args.profile, args.seed)
+    cert_path, key_path = ensure_certificates(args.certs)
+    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ssl_context.load_cert_chain(cert_path, key_path)
+
+    app = web.Application(client_max_size=10 * 1024 ** 2)
+    app.router.add_route('*', '/{tail:.*}', upstreams.handle)
+    admin = web.Application()
+    admin.router.add_get('/__stats', upstreams.get_stats)
+    admin.router.add_post('/__profile', upstreams.set_profile)
+
+    runners = []
+    for application, port, context in ((app, 443, ssl_context), (app, 9443, ssl_context), (admin, args.admin_port, None)):
+        runner = web.AppRunner(application, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, '0.0.0.0', port, ssl_context=context).start()
+        runners.append(runner)
+    print(f"Upstream stand-ins up with the {args.profile!r} profile, admin on :{args.admin_port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', default=os.getenv('UPSTREAM_PROFILE', 'nominal'))
+    parser.add_argument('--certs', default='/certs')
+    parser.add_argument('--admin-port', type=int, default=8080)
+    parser.add_argument('--seed', type=int, default=1234)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
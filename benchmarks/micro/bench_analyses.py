@@ -0,0 +1,20 @@
+import pytest
+from benchmarks.micro.data import COIN_BOTS, analysis_rows, seeded
+from routes.analysis.analysis_feed import transform_analyses
+
+
+@pytest.fixture(scope='module')
+def reference_data():
+    coins_dict = {bot_id: {'name': name, 'icon': f"https://example.com/{name}.svg"}
+                  for bot_id, name in enumerate(COIN_BOTS, start=1)}
+    categories_dict = {f"category {index}": {'name': f"Category {index}", 'icon': f"https://example.com/c{index}.svg"}
+                       for index in range(8)}
+    sections_dict = {'deep_dive': {'id': 1, 'name': 'Deep Dive'}}
+    return coins_dict, categories_dict, sections_dict
+
+
+def bench_transform_analyses(benchmark, reference_data):
+    analyses = analysis_rows(seeded(), 500)
+    results = benchmark(transform_analyses, 'deep_dive', analyses, *reference_data)
+    assert len(results) == 500
+    assert '<' not in results[0]['title']
@@ -0,0 +1,6 @@
+from routes.external_apis.binance import parse_response
+
+
+def bench_parse_response(benchmark, kline_rows):
+    parsed = benchmark(parse_response, kline_rows)
+    assert len(parsed) == len(kline_rows)
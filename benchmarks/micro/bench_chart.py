@@ -0,0 +1,31 @@
+import logging
+from types import SimpleNamespace
+import pytest
+from services.chart import candlestick
+from services.chart.candlestick import ChartWidget, RSISettings, SMASettings
+
+
+@pytest.fixture
+def widget(kline_rows, monkeypatch):
+    """
+    A chart with the SMA and RSI indicators over 1000 daily bars served from memory,
+    without the live updates websocket.
+    """
+    response = SimpleNamespace(status_code=200, text='', json=lambda: kline_rows)
+    monkeypatch.setattr(candlestick.http_client, 'get', lambda *args, **kwargs: response)
+    chart = ChartWidget(sma=SMASettings(enabled=True), rsi=RSISettings(enabled=True))
+    monkeypatch.setattr(chart, 'start_live_updates', lambda: None)
+    # Its debug lines would be most of what gets measured
+    chart.logger.setLevel(logging.WARNING)
+    return chart
+
+
+def bench_calculate_technical_indicators(benchmark, widget):
+    widget.df = widget.get_historical_data()
+    df = benchmark(widget.calculate_technical_indicators)
+    assert len(df) == len(widget.df) and 'RSI' in df
+
+
+def bench_create_candlestick_chart(benchmark, widget):
+    chart_layout = benchmark(widget.create_candlestick_chart)
+    assert chart_layout is not None and len(widget.df) == 1000
@@ -0,0 +1,34 @@
+import math
+import pytest
+from benchmarks.micro.data import RowsSession
+from routes.news_bot.validations import (
+    blacklist_matcher, find_matched_keywords, keyword_matcher, title_in_blacklist, validate_content
+)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def indexes(keyword_rows, blacklist_rows):
+    """
+    Build the keyword automaton and the blacklist index from the synthetic rows, and keep them:
+    only the lookups are measured.
+    """
+    for matcher, rows in ((keyword_matcher, keyword_rows), (blacklist_matcher, blacklist_rows)):
+        matcher._index = matcher._build(RowsSession(rows))
+        matcher._checked_at = math.inf
+    yield
+    for matcher in (keyword_matcher, blacklist_matcher):
+        matcher.invalidate()
+        matcher._index = None
+
+
+def bench_validate_content(benchmark, article):
+    assert benchmark(validate_content, 'btc', article, None)
+
+
+def bench_find_matched_keywords(benchmark, article):
+    assert benchmark(find_matched_keywords, 'eth', article, None)
+
+
+def bench_title_in_blacklist(benchmark, titles):
+    matches = benchmark(lambda: sum(1 for title in titles if title_in_blacklist(title, None)))
+    assert matches >= len(titles) // 10
@@ -0,0 +1,66 @@
+import pytest
+from flask import Flask, jsonify
+from benchmarks.micro.data import seeded, sentence
+from redis_client import redis_client as redis_module
+from redis_client.redis_client import cache_with_redis
+
+
+class MemoryRedis:
+    """
+    The get/setex subset of the Redis client used by cache_with_redis, in memory.
+    """
+
+    def __init__(self, hits=True):
+        self.hits = hits
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key) if self.hits else None
+
+    def setex(self, key, expiration, value):
+        self.values[key] = value
+
+
+@pytest.fixture(scope='module')
+def payload():
+    """
+    A response the size of a news feed page with a few hundred articles.
+    """
+    rng = seeded(3)
+    return {'articles': [{
+        'article_id': index,
+        'title': sentence(rng, 10),
+        'summary': ' '.join(sentence(rng, 20) for _ in range(5)),
+        'url': f"https://example.com/news/{index}",
+        'created_at': '2024-06-01T12:00:00',
+        'images': [{'image_id': index, 'image': f"https://example.com/images/{index}.jpg"}]
+    } for index in range(300)]}
+
+
+@pytest.fixture
+def cached_view(payload):
+    app = Flask(__name__)
+
+    @cache_with_redis(expiration=300)
+    def get_news():
+        return jsonify(payload), 200
+
+    with app.test_request_context('/api/get/news?coin=btc&limit=300'):
+        yield get_news
+
+
+def bench_cache_miss(benchmark, cached_view, monkeypatch):
+    # Serializing the view's response and storing it
+    store = MemoryRedis(hits=False)
+    monkeypatch.setattr(redis_module, 'redis_client', store)
+    response, status = benchmark(cached_view)
+    assert status == 200 and len(store.values) == 1
+
+
+def bench_cache_hit(benchmark, cached_view, monkeypatch):
+    # Loading the stored response and building the Flask response
+    store = MemoryRedis()
+    monkeypatch.setattr(redis_module, 'redis_client', store)
+    cached_view()
+    response, status = benchmark(cached_view)
+    assert status == 200 and response.json['articles']
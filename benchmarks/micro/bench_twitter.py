@@ -0,0 +1,18 @@
+import pytest
+from benchmarks.micro.data import seeded, sentence
+from routes.twitter.index import split_string
+
+
+@pytest.fixture(scope='module')
+def analysis_post():
+    """
+    An analysis as posted to Twitter: a bold title and bullet points.
+    """
+    rng = seeded(2)
+    points = '\n'.join(f"- {sentence(rng, rng.randint(10, 30))}" for _ in range(40))
+    return f"**{sentence(rng, 8)[:-1]}**\n\n{sentence(rng, 20)}\n\n{points}"
+
+
+def bench_split_string(benchmark, analysis_post):
+    chunks = benchmark(split_string, analysis_post)
+    assert len(chunks) > 1
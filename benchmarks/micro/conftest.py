@@ -0,0 +1,72 @@
+"""
+Micro-benchmarks of the CPU-heavy hot functions, with pytest-benchmark.
+
+Run from the repository root, in the app environment (nothing connects on
+import, the database and Redis don't need to be reachable):
+
+    pip install -r benchmarks/micro/requirements.txt
+    python -m pytest benchmarks/micro
+
+Compare with the committed baseline, failing on a regression:
+
+    python -m pytest benchmarks/micro --benchmark-compare=benchmarks/micro/baseline.json \
+        --benchmark-compare-fail=median:25%
+
+Timings only compare on the same machine, so CI compares a pull request
+with its base branch, both run on the runner (.github/workflows/benchmarks.yml).
+Record baseline.json again on the machine you compare on, and commit it when a
+change is expected to move the numbers:
+
+    python -m pytest benchmarks/micro --benchmark-json=benchmarks/micro/baseline.json
+
+Every input is synthetic and generated from a fixed seed, so runs are
+comparable; nothing here touches the network or the database.
+"""
+import pytest
+from benchmarks.micro.data import COIN_BOTS, WORDS, article_text, klines, seeded, sentence
+
+
+@pytest.fixture(scope='session')
+def article():
+    return article_text(seeded())
+
+
+@pytest.fixture(scope='session')
+def keyword_rows():
+    """
+    (bot name, keyword) rows: 30 keywords per bot, a third of them shared between bots.
+    """
+    rng = seeded()
+    shared = [' '.join(rng.sample(WORDS, 2)) for _ in range(60)]
+    rows = []
+    for bot_name in COIN_BOTS:
+        rows.extend((bot_name, word) for word in rng.sample(WORDS, 10))
+        rows.extend((bot_name, word) for word in rng.sample(shared, 10))
+        rows.extend((bot_name, f"{bot_name} {rng.choice(WORDS)}") for _ in range(10))
+    return rows
+
+
+@pytest.fixture(scope='session')
+def blacklist_rows():
+    rng = seeded()
+    return [(sentence(rng, rng.randint(5, 14)),) for _ in range(500)]
+
+
+@pytest.fixture(scope='session')
+def titles(blacklist_rows):
+    """
+    Article titles, one in ten a light edit of a blacklist entry.
+    """
+    rng = seeded(1)
+    result = []
+    for index in range(100):
+        if index % 10 == 0:
+            result.append(rng.choice(blacklist_rows)[0].replace('.', '!'))
+        else:
+            result.append(sentence(rng, rng.randint(5, 14)))
+    return result
+
+
+@pytest.fixture(scope='session')
+def kline_rows():
+    return klines(seeded())
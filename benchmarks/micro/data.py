@@ -0,0 +1,105 @@
+"""
+Synthetic inputs of the micro-benchmarks, generated from a fixed seed.
+"""
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+SEED = 1234
+BARS = 1000
+
+WORDS = (
+    'bitcoin ethereum solana market price rally traders liquidity exchange volume '
+    'network upgrade protocol staking validators fees whales inflows outflows etf '
+    'regulators sec approval futures funding rate open interest leverage liquidation '
+    'support resistance breakout analysts investors token supply burn treasury '
+    'on-chain wallet addresses stablecoin yields defi lending layer scaling bridge '
+    'hack exploit lawsuit settlement partnership listing delisting airdrop governance vote '
+    'mainnet testnet rollup sequencer oracle custody miners hashrate halving difficulty '
+    'reserves audit bankruptcy creditors court ruling senate bill tax policy inflation '
+    'fed rates dollar equities nasdaq gold correlation sentiment fear greed index '
+    'memecoin nft marketplace royalties gaming metaverse payments remittance adoption'
+).split()
+
+COIN_BOTS = ('btc', 'eth', 'sol', 'xrp', 'ada', 'dot', 'link', 'avax', 'matic', 'atom',
+             'uni', 'ltc', 'bnb', 'doge', 'near', 'apt', 'arb', 'op', 'inj', 'sui')
+
+
+def seeded(stream: int = 0) -> random.Random:
+    """
+    A generator of its own for each input, so inputs don't depend on which benchmarks run.
+    """
+    return random.Random(SEED + stream)
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def article_text(rng: random.Random, paragraphs: int = 12) -> str:
+    """
+    About 900 words, the size of a typical scraped article.
+    """
+    return '\n\n'.join(
+        ' '.join(sentence(rng, rng.randint(12, 25)) for _ in range(4)) for _ in range(paragraphs)
+    )
+
+
+def klines(rng: random.Random, bars: int = BARS, interval: timedelta = timedelta(days=1)):
+    """
+    Binance /klines rows of a random walk: open time, OHLCV as strings, close time, quote volume,
+    trades, taker buy volumes and the ignored field.
+    """
+    start = datetime(2022, 1, 1)
+    price = 40000.0
+    rows = []
+    for index in range(bars):
+        open_time = start + index * interval
+        open_price = price
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        high = max(open_price, price) * (1 + abs(rng.gauss(0, 0.005)))
+        low = min(open_price, price) * (1 - abs(rng.gauss(0, 0.005)))
+        volume = rng.uniform(1000, 50000)
+        open_ms = int(open_time.timestamp() * 1000)
+        rows.append([
+            open_ms, f"{open_price:.2f}", f"{high:.2f}", f"{low:.2f}", f"{price:.2f}", f"{volume:.4f}",
+            open_ms + int(interval.total_seconds() * 1000) - 1, f"{volume * price:.4f}",
+            rng.randint(1000, 90000), f"{volume / 2:.4f}", f"{volume * price / 2:.4f}", "0"
+        ])
+    return rows
+
+
+class RowsSession:
+    """
+    Stand-in for a DB session that returns fixed rows, enough for the
+    CachedTableIndex._build queries of routes/news_bot/validations.py.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, *columns):
+        return self
+
+    def join(self, *args, **kwargs):
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def analysis_rows(rng: random.Random, count: int):
+    created_at = datetime(2024, 6, 1)
+    rows = []
+    for index in range(count):
+        title = sentence(rng, rng.randint(6, 12))
+        body = '<br>'.join(f"<p>{sentence(rng, rng.randint(15, 30))}</p>" for _ in range(8))
+        rows.append(SimpleNamespace(
+            analysis_id=index,
+            analysis=f"<h2><strong>{title}</strong></h2><br>{body}",
+            coin_bot_id=index % len(COIN_BOTS) + 1,
+            category_name=f"Category {index % 8}",
+            image_url=f"https://example.com/analysis/{index}.jpg",
+            created_at=created_at - timedelta(hours=index)
+        ))
+    return rows
@@ -0,0 +1,136 @@
+"""
+Benchmark of the news article extraction over saved HTML pages of each site.
+
+Fixtures live in benchmarks/fixtures/news_sites/<site>.html, one page per
+SITE_SELECTORS key (lowercased, spaces as underscores). They are real article
+pages and are not committed; save them first:
+
+    python -m benchmarks.news_extraction capture Ambcrypto https://ambcrypto.com/<article>
+    python -m benchmarks.news_extraction run --repeat 20
+
+For every fixture the shared extraction layer (selectolax, one parse, one
+query per field) is compared with the per-site code it replaced
+(BeautifulSoup 'html.parser', find/find_all passes and += concatenation).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from bs4 import BeautifulSoup
+from routes.news_bot.extraction import SITE_SELECTORS, parse_article
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'news_sites')
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
+}
+
+
+def fixture_path(site: str) -> str:
+    return os.path.join(FIXTURES_DIR, f"{site.lower().replace(' ', '_')}.html")
+
+
+def capture(site: str, url: str) -> str:
+    import requests
+
+    if site not in SITE_SELECTORS:
+        raise SystemExit(f"Unknown site {site!r}, expected one of: {', '.join(SITE_SELECTORS)}")
+
+    response = requests.get(url, headers=HEADERS, timeout=10)
+    response.raise_for_status()
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    path = fixture_path(site)
+    with open(path, 'w', encoding='utf-8') as fixture:
+        fixture.write(response.text)
+    return path
+
+
+def legacy_extract(html: str):
+    """
+    What every site module used to do: a pure Python parse, then separate
+    passes for the title, the paragraphs, the date and the images.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title_element = soup.find('h1')
+    title = title_element.text.strip() if title_element else None
+
+    content = ""
+    for paragraph in soup.find_all('p'):
+        content += paragraph.text.strip()
+
+    date_element = soup.find('time')
+    date = date_element.text.strip() if date_element else None
+
+    image_urls = []
+    for img in soup.find_all('img'):
+        src = img.get('src')
+        if src:
+            image_urls.append(src)
+
+    return title, content, date, image_urls
+
+
+def shared_extract(html: str, site: str):
+    page = parse_article(html, site)
+    return page.title, page.content, page.date, page.images
+
+
+def _time(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run(repeat: int) -> int:
+    rows = []
+    for site in SITE_SELECTORS:
+        path = fixture_path(site)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as fixture:
+            html = fixture.read()
+
+        title, content, _, _ = shared_extract(html, site)
+        legacy_ms = _time(lambda: legacy_extract(html), repeat)
+        shared_ms = _time(lambda: shared_extract(html, site), repeat)
+        rows.append((site, len(html) // 1024, legacy_ms, shared_ms, bool(title and content)))
+
+    if not rows:
+        print(f"No fixtures in {FIXTURES_DIR}, save some with the capture command first.")
+        return 1
+
+    print(f"{'site':<14} {'KiB':>6} {'legacy ms':>10} {'shared ms':>10} {'speedup':>8}  title+content")
+    for site, size, legacy_ms, shared_ms, extracted in rows:
+        print(f"{site:<14} {size:>6} {legacy_ms:>10.2f} {shared_ms:>10.2f} {legacy_ms / shared_ms:>7.1f}x  {'yes' if extracted else 'NO'}")
+
+    legacy_total = sum(row[2] for row in rows)
+    shared_total = sum(row[3] for row in rows)
+    print(f"{'total':<14} {'':>6} {legacy_total:>10.2f} {shared_total:>10.2f} {legacy_total / shared_total:>7.1f}x")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    capture_parser = commands.add_parser('capture', help='save an article page as the fixture of a site')
+    capture_parser.add_argument('site', help='SITE_SELECTORS key, e.g. Ambcrypto')
+    capture_parser.add_argument('url')
+
+    run_parser = commands.add_parser('run', help='benchmark every saved fixture')
+    run_parser.add_argument('--repeat', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    if args.command == 'capture':
+        print(f"Saved {capture(args.site, args.url)}")
+        return 0
+    return run(args.repeat)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
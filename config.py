@@ -5,14 +5,15 @@ from sqlalchemy import (
     JSON, Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Float, 
     create_engine
 )
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, TIMESTAMP, ForeignKey, Float, Text, Index
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.ext.declarative import declarative_base
 from utils.general import generate_unique_short_token
+from utils.fingerprint import url_fingerprint, title_fingerprint
 import secrets
 import hashlib
 import base64
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import UniqueConstraint
 from sqlalchemy import create_engine
@@ -850,6 +851,9 @@ class Article(Base):
         date (str): The date of the article.
         title (str): The title of the article.
         url (str): The URL of the article.
+        url_hash (str): SHA-256 of the normalized URL (unique), for deduplication.
+        title_hash (str): SHA-256 of the normalized title (unique), for deduplication.
+        simhash (int): 64-bit SimHash of the body, for near-duplicate detection.
         summary (str): A summary of the article.
         created_at (datetime): Timestamp of when the article was created.
         updated_at (datetime): Timestamp of the last update to the article record.
@@ -857,13 +861,21 @@ class Article(Base):
         coin_bot (relationship): Relationship to the associated CoinBot.
         images (relationship): Relationship to associated ArticleImage objects.
         used_keywords (relationship): Relationship to associated Used_keywords objects.
+        alternate_sources (relationship): Other sites' copies of the article (ArticleSource).
     """
     __tablename__ = 'article'
+    __table_args__ = (
+        # Keyset pagination of a coin's feed, see routes/news_bot/news_feed.py
+        Index('ix_article_coin_bot_id_created_at_article_id', 'coin_bot_id', 'created_at', 'article_id'),
+    )
 
     article_id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(String)
     title = Column(String)
     url = Column(String)
+    url_hash = Column(String(64), unique=True, index=True)
+    title_hash = Column(String(64), unique=True, index=True)
+    simhash = Column(BigInteger)
     summary = Column(String)
     created_at = Column(TIMESTAMP, default=datetime.now)
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -873,6 +885,78 @@ class Article(Base):
     coin_bot = relationship('CoinBot', back_populates='article', lazy=True)
     images = relationship('ArticleImage', back_populates='article', lazy=True)
     used_keywords = relationship('Used_keywords', back_populates='article', lazy=True)
+    alternate_sources = relationship('ArticleSource', back_populates='article', lazy=True, passive_deletes=True)
+
+    @validates('url')
+    def _set_url_hash(self, key, value):
+        self.url_hash = url_fingerprint(value)
+        return value
+
+    @validates('title')
+    def _set_title_hash(self, key, value):
+        self.title_hash = title_fingerprint(value)
+        return value
+
+    def as_dict(self):
+        return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+
+# SimHash LSH: 8 bands of 8 bits, so fingerprints within 7 bits share at least one band
+SIMHASH_BANDS = 8
+SIMHASH_BAND_BITS = 8
+
+
+def simhash_band(value, band):
+    """
+    One band of a SimHash, for an int or the Article.simhash column (same expression as the indexes).
+    """
+    mask = (1 << SIMHASH_BAND_BITS) - 1
+    if isinstance(value, int):
+        return (value >> (band * SIMHASH_BAND_BITS)) & mask
+    return value.op('>>')(band * SIMHASH_BAND_BITS).op('&')(mask)
+
+
+for _band in range(SIMHASH_BANDS):
+    Index(f'ix_article_simhash_band_{_band}', Article.coin_bot_id, simhash_band(Article.simhash, _band),
+          postgresql_where=Article.simhash.isnot(None))
+
+
+class ArticleSource(Base):
+    """
+    Another site's copy of an article.
+
+    Near-duplicates of a recent article (SimHash within a few bits) are
+    attached to it here instead of being summarized and stored again.
+
+    Attributes:
+        source_id (int): The primary key.
+        article_id (int): Foreign key referencing the article it duplicates.
+        url (str): The URL of the copy.
+        url_hash (str): SHA-256 of the normalized URL (unique), for deduplication.
+        title (str): The title of the copy.
+        simhash (int): 64-bit SimHash of the copy's body.
+        distance (int): Bits between both SimHashes.
+        created_at (datetime): Timestamp of when the copy was attached.
+        updated_at (datetime): Timestamp of the last update to the record.
+        article (relationship): Relationship to the Article.
+    """
+    __tablename__ = 'article_source'
+
+    source_id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(Integer, ForeignKey('article.article_id', ondelete='CASCADE'), nullable=False, index=True)
+    url = Column(String, nullable=False)
+    url_hash = Column(String(64), unique=True, index=True)
+    title = Column(String)
+    simhash = Column(BigInteger)
+    distance = Column(Integer)
+    created_at = Column(TIMESTAMP, default=datetime.now)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    article = relationship('Article', back_populates='alternate_sources')
+
+    @validates('url')
+    def _set_url_hash(self, key, value):
+        self.url_hash = url_fingerprint(value)
+        return value
 
     def as_dict(self):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
@@ -922,6 +1006,11 @@ class TopStory(Base):
         images (relationship): Relationship to associated TopStoryImage objects.
     """
     __tablename__ = 'top_story'
+    __table_args__ = (
+        # Keyset pagination, see routes/news_bot/news_feed.py
+        Index('ix_top_story_created_at_top_story_id', 'created_at', 'top_story_id'),
+        Index('ix_top_story_coin_bot_id_created_at_top_story_id', 'coin_bot_id', 'created_at', 'top_story_id'),
+    )
 
     top_story_id = Column(Integer, primary_key=True, autoincrement=True)
     story_date = Column(String)
@@ -1096,6 +1185,42 @@ class AnalysisImage(Base):
     def as_dict(self):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
 
+class ImageAsset(Base):
+    """
+    Represents a content-addressed image stored in S3.
+
+    Images are keyed by the SHA-256 of their source bytes, with a 64-bit
+    perceptual hash (dHash) to detect near-duplicates, so republishing or
+    retrying with the same image reuses the stored object instead of uploading it again.
+
+    Attributes:
+        asset_id (int): The primary key for the asset.
+        content_hash (str): Hex SHA-256 of the source image bytes (unique).
+        perceptual_hash (int): Signed 64-bit dHash of the source image.
+        bucket (str): The S3 bucket holding the image.
+        url (str): URL of the primary image.
+        variants (JSON): Mapping of variant name (e.g. '512_webp') to URL.
+        source_url (str): The last URL the image was fetched from.
+        ref_count (int): Number of content rows currently using the image.
+        created_at (datetime): Timestamp of when the asset was created.
+        updated_at (datetime): Timestamp of the last update to the asset.
+    """
+    __tablename__ = 'image_asset'
+
+    asset_id = Column(Integer, primary_key=True, autoincrement=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)
+    perceptual_hash = Column(BigInteger, nullable=True, index=True)
+    bucket = Column(String, nullable=False)
+    url = Column(String, nullable=False, index=True)
+    variants = Column(JSON, nullable=True)
+    source_url = Column(String, nullable=True, index=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def as_dict(self):
+        return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+
 class AnalyzedArticle(Base):
     """
     Represents an analyzed article.
@@ -1107,6 +1232,7 @@ class AnalyzedArticle(Base):
         article_id (int): The primary key for the analyzed article.
         source (str): The source of the article.
         url (str): The URL of the article.
+        url_hash (str): SHA-256 of the normalized URL (unique), for deduplication.
         is_analyzed (bool): Indicates whether the article has been analyzed.
         created_at (datetime): Timestamp of when the record was created.
         updated_at (datetime): Timestamp of the last update to the record.
@@ -1116,10 +1242,16 @@ class AnalyzedArticle(Base):
     article_id = Column(Integer, primary_key=True, autoincrement=True)
     source = Column(String)
     url = Column(String)
+    url_hash = Column(String(64), unique=True, index=True)
     is_analyzed = Column(Boolean)
     created_at = Column(TIMESTAMP, default=datetime.now)
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    @validates('url')
+    def _set_url_hash(self, key, value):
+        self.url_hash = url_fingerprint(value)
+        return value
+
     def as_dict(self):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
 
@@ -1158,6 +1290,44 @@ class NarrativeTrading(Base):
     def create_entry(cls, content, image_url, category_name, coin_bot_id):
         return cls(narrative_trading=content, image_url=image_url, category_name=category_name, coin_bot_id=coin_bot_id)
 
+class IndexDailyBar(Base):
+    """
+    Represents one daily OHLCV bar of a TradingView index symbol (e.g. CRYPTOCAP:TOTAL3).
+
+    Bars are synced incrementally from TradingView, only fetching the bars newer
+    than the last stored one, and chart endpoints are served from this table.
+
+    Attributes:
+        id (int): The primary key for the bar.
+        symbol (str): The TradingView symbol, e.g. 'CRYPTOCAP:TOTAL3'.
+        exchange (str): The TradingView exchange, e.g. 'CRYPTOCAP'.
+        bar_date (datetime): Opening time of the daily bar.
+        open (float): Opening value.
+        high (float): Highest value.
+        low (float): Lowest value.
+        close (float): Closing value (last value while the bar is still open).
+        volume (float): Volume, if reported by the symbol.
+        updated_at (datetime): Timestamp of the last sync of the bar.
+    """
+    __tablename__ = 'index_daily_bar'
+    __table_args__ = (
+        UniqueConstraint('symbol', 'bar_date', name='uq_index_daily_bar_symbol_bar_date'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String, nullable=False)
+    exchange = Column(String, nullable=False)
+    bar_date = Column(TIMESTAMP, nullable=False)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def as_dict(self):
+        return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+
 class DailyMacroAnalysis(Base):
     """
     Daily Macro Analysis table for storing daily macro-economic analysis content.
@@ -1727,8 +1897,54 @@ class Notification(Base):
     def as_dict(self):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
 
+class NotificationOutbox(Base):
+    """
+    Represents a pending push notification delivery (transactional outbox).
+
+    Rows are written in the same transaction as the content that triggers them,
+    and drained asynchronously by the outbox dispatcher, so the publish path
+    never waits on FCM and a crash cannot lose a notification.
+
+    Attributes:
+        id (int): The primary key for the outbox entry.
+        topic_name (str): The FCM topic the notification will be delivered to.
+        title (str): The title of the notification.
+        body (str): The message content of the notification.
+        type (str): The type of notification (e.g., "alert", "deep_dive").
+        coin (str): Coin reference.
+        timeframe (str): Timeframe of the notification, if any.
+        status (str): Delivery status: pending, sent or dead.
+        attempts (int): Number of delivery attempts made so far.
+        next_attempt_at (datetime): Earliest time the next attempt can be made.
+        last_error (str): Error message of the last failed attempt.
+        sent_at (datetime): Timestamp of the successful delivery.
+        created_at (datetime): Timestamp of when the entry was created.
+        updated_at (datetime): Timestamp of the last update to the entry.
+    """
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic_name = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    body = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    coin = Column(String)
+    timeframe = Column(String)
+    status = Column(String(20), nullable=False, default='pending')
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text)
+    sent_at = Column(TIMESTAMP(timezone=True))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def as_dict(self):
+        return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+
 
-Base.metadata.create_all(engine)
 Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 session = Session()
 ROOT_DIRECTORY = Path(__file__).parent.resolve()
@@ -2305,6 +2521,3 @@ def init_data():
     # init_superadmin()
     # create_superadmin_api_key()
     # init_coingecko_data()
-
-
-init_data()
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Read by gunicorn from the working directory, the other settings are passed in script.sh
+from prometheus_client import multiprocess
+
+# The master imports the app once and forks the workers, so a worker boots in
+# milliseconds. Importing the app opens no connection and starts no thread
+# (benchmarks/micro/bench_startup.py), nothing is shared across the fork.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Pooled connections must never be shared by two processes, in case one was opened on import
+    from config import engine
+    engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of workers that exited so /metrics doesn't count them
+    multiprocess.mark_process_dead(worker.pid)
@@ -6,6 +6,7 @@ from flask import request, Response, jsonify
 import redis
 import os
 from dotenv import load_dotenv
+from utils.metrics import record_cache_lookup
 
 # Load environment variables
 load_dotenv()
@@ -32,18 +33,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-try:
-    # Initialize Redis client with configuration
-    redis_client = redis.Redis(**REDIS_CONFIG)
-    # Test connection
-    redis_client.ping()
-    logger.info("Redis client successfully connected")
-except redis.ConnectionError as e:
-    logger.error(f"Failed to connect to Redis: {str(e)}")
-    raise
-except Exception as e:
-    logger.error(f"Unexpected error while connecting to Redis: {str(e)}")
-    raise
+# The pool connects on the first command, not on import, so workers boot without a round trip to Redis
+redis_client = redis.Redis(**REDIS_CONFIG)
 
 
 def reset_redis_cache():
@@ -66,6 +57,39 @@ def reset_redis_cache():
        return {'error': f'Failed to clear Redis cache: {str(e)}'}, 500
 
 
+def get_cached_json(key: str) -> Any:
+    """
+    Read a JSON value cached with set_cached_json.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        Any: The decoded value, or None on a miss or if Redis is unavailable.
+    """
+    try:
+        cached = redis_client.get(key)
+        return json.loads(cached) if cached else None
+    except (redis.RedisError, ValueError) as e:
+        logger.warning(f"Redis read failed for {key}: {str(e)}")
+        return None
+
+
+def set_cached_json(key: str, value: Any, expiration: int) -> None:
+    """
+    Cache a JSON-serializable value for expiration seconds. Failures are logged, not raised.
+
+    Args:
+        key (str): The cache key.
+        value (Any): The value to cache.
+        expiration (int): Time to live in seconds.
+    """
+    try:
+        redis_client.setex(key, expiration, json.dumps(value))
+    except (redis.RedisError, TypeError, ValueError) as e:
+        logger.warning(f"Redis write failed for {key}: {str(e)}")
+
+
 def cache_with_redis(expiration=300):
     """
     A decorator that caches the result of a function using Redis.
@@ -97,6 +121,7 @@ def cache_with_redis(expiration=300):
             
             # Try to get data from cache
             cached_data = redis_client.get(cache_key)
+            record_cache_lookup(func.__name__, bool(cached_data))
             if cached_data:
                 cached_response = json.loads(cached_data)
                 return jsonify(cached_response['data']), cached_response['status']
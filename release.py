@@ -0,0 +1,30 @@
+"""
+Release step, run once per deploy before the web and jobs processes start (script.sh):
+
+    python release.py
+
+Creates the missing tables, applies the pending Alembic migrations in this
+process, instead of one alembic CLI invocation per check, then adds the default
+rows. The migrations expect the tables to exist (they used to be created when
+config was imported), so the order is the one the app always had. None of this
+runs when the application is imported.
+"""
+import os
+from alembic import command
+from alembic.config import Config
+from config import BASE_DIR, Base, engine, init_data
+
+
+def main():
+    print('---- Creating database tables ----')
+    Base.metadata.create_all(engine)
+
+    print('---- Applying database migrations ----')
+    command.upgrade(Config(os.path.join(BASE_DIR, 'alembic.ini')), 'head')
+
+    init_data()
+    print('---- Database is up to date ----')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import os
-import requests
+from utils.upstream import http_client
 from dotenv import load_dotenv
 from config import session, CoinBot, Alert 
 
@@ -51,7 +51,7 @@ def send_alert_strategy_to_slack(price, alert_name, message):
                 }
     
     try:
-        response = requests.post(SLACK_PRODUCT_ALERTS, json=payload)
+        response = http_client.post(SLACK_PRODUCT_ALERTS, json=payload)
         if response.status_code == 200:
             print('Alert message from Tradingview sent to Slack successfully')
             return 'Alert message from Tradingview sent to Slack successfully', 200
@@ -97,7 +97,7 @@ def send_alert_strategy_to_telegram(price, alert_name, message, symbol):
         
         try:
         
-            response = requests.post(telegram_text_url, data=text_payload)
+            response = http_client.post(telegram_text_url, data=text_payload)
                 
             if response.status_code == 200:
              
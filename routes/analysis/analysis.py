@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Tuple, Dict, Type
 from sqlalchemy.exc import SQLAlchemyError
 from services.notification.index import NotificationService
+from services.notification.outbox import wake_outbox_dispatcher
 from services.aws.s3 import ImageProcessor
 from config import Analysis, CoinBot, Session
 from flask import current_app, jsonify, Blueprint, request
@@ -17,6 +18,8 @@ from apscheduler.jobstores.base import JobLookupError
 from config import Analysis, CoinBot, NarrativeTrading, SAndRAnalysis, Sections, Session, DailyMacroAnalysis, SpotlightAnalysis, Category
 from ws.socket import emit_notification
 from routes.analysis.analysis_scheduler import sched, chosen_timezone
+from utils.scheduling import ensure_started
+from routes.analysis.analysis_feed import COLUMN_MAPPINGS, transform_analyses
 from utils.logging import setup_logger
 
 analysis_bp = Blueprint('analysis_bp', __name__)
@@ -27,6 +30,17 @@ image_processor = ImageProcessor()
 notification_service = NotificationService()
 
 
+def release_unpublished_image(image_url: str) -> None:
+    """
+    Drop the image reference taken by process_and_upload_image for a post that
+    wasn't saved, so the stored image is deleted once nothing uses it.
+    """
+    try:
+        image_processor.delete_from_s3(bucket='appanalysisimages', image_url=image_url)
+    except Exception as e:
+        logger.error(f"Failed to release image {image_url}: {str(e)}")
+
+
 @analysis_bp.route('/analysis/<int:analysis_id>', methods=['GET'])
 def get_single_analysis(analysis_id):
     """
@@ -631,30 +645,6 @@ def get_analyses():
             return jsonify({**response, "error": "Invalid pagination parameters"}), 400
 
         with Session() as session:
-            # Define column mappings for each model
-            COLUMN_MAPPINGS = {
-                'deep_dive': {
-                    'content': 'analysis',
-                    'id': 'analysis_id'
-                },
-                'daily_macro': {
-                    'content': 'content',
-                    'id': 'id'
-                },
-                'narratives': {
-                    'content': 'narrative_trading',
-                    'id': 'narrative_trading_id'
-                },
-                'spotlight': {
-                    'content': 'content',
-                    'id': 'id'
-                },
-                'support_resistance': {
-                    'content': 'analysis',
-                    'id': 'analysis_id'
-                }
-            }
-
             # Pre-fetch reference data
             coins_dict = {
                 coin.bot_id: {
@@ -718,46 +708,7 @@ def get_analyses():
                     # Get results
                     analyses = query.order_by(desc(model_class.created_at)).all()
 
-                    # Transform results
-                    for analysis in analyses:
-                        # Skip if missing reference data
-                        if (analysis.coin_bot_id not in coins_dict or 
-                            analysis.category_name.lower() not in categories_dict or 
-                            target not in sections_dict):
-                            continue
-
-                        coin_data = coins_dict[analysis.coin_bot_id]
-                        category_data = categories_dict[analysis.category_name.lower()]
-                        section_data = sections_dict[target]
-
-                        # Get content and id using correct column names
-                        content_column = COLUMN_MAPPINGS[target]['content']
-                        id_column = COLUMN_MAPPINGS[target]['id']
-                        
-                        content_text = getattr(analysis, content_column)
-                        analysis_id = getattr(analysis, id_column)
-
-                        # Extract and clean title from content
-                        title_end_index = content_text.find('<br>')
-                        title = content_text[:title_end_index].strip() if title_end_index != -1 else ""
-                        content = content_text[title_end_index + 4:].strip() if title_end_index != -1 else content_text
-                        
-                        title = BeautifulSoup(title, 'html.parser').get_text()
-
-                        all_results.append({
-                            "category_icon": category_data['icon'],
-                            "category_name": category_data['name'],
-                            "coin_icon": coin_data['icon'],
-                            "coin_id": analysis.coin_bot_id,
-                            "coin_name": coin_data['name'],
-                            "content": content,
-                            "created_at": analysis.created_at.isoformat(),
-                            "id": analysis_id,
-                            "image_url": analysis.image_url,
-                            "section_id": section_data['id'],
-                            "section_name": section_data['name'],
-                            "title": title
-                        })
+                    all_results.extend(transform_analyses(target, analyses, coins_dict, categories_dict, sections_dict))
 
                 except Exception as e:
                     logger.error(f"Error processing {target} analyses: {str(e)}")
@@ -894,6 +845,8 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
     """
     logger.info(f"Starting publish_analysis for coin_id: {coin_id}, category: {category_name}, section_id: {section_id}")
 
+    # Image stored by this call, released if the analysis isn't saved
+    uploaded_image_url = None
     with Session() as session:
         try:
             # 1. Initial validations
@@ -942,7 +895,6 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
                     logger.info(f"Processing temporary DALL-E image: {image_url}")
                     image_filename = f"{formatted_title}.jpg"
                     
-                    image_processor = ImageProcessor()
                     permanent_image_url = image_processor.process_and_upload_image(
                         image_url=image_url,
                         bucket_name='appanalysisimages',
@@ -952,6 +904,7 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
                     if not permanent_image_url:
                         logger.error("Failed to get permanent URL from S3 upload")
                         raise ValueError("Failed to process and upload image to S3")
+                    uploaded_image_url = permanent_image_url
                     
                 except Exception as e:
                     logger.error(f"Image processing failed with error: {str(e)}", exc_info=True)
@@ -959,19 +912,11 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
 
             coin_name = coin_bot.name
             
-            # 5. Validate notification topics exist
-            found_topics = notification_service.validate_topics(coin_name, target)
-            if not found_topics:
-                logger.error(f"No notification topics found for coin {coin_name} and type {target}")
-                raise ValueError(f"No notification topics found for coin {coin_name} and type {target}")
-            
-            # 6. Create and save content with permanent image URL
+            # 5. Create content with permanent image URL
             new_content = model_class.create_entry(content, permanent_image_url, category_name, coin_id)
             session.add(new_content)
-            session.commit()
-            session.refresh(new_content)
 
-            # 7. Handle notifications
+            # 6. Enqueue push notifications in the same transaction (validates topics exist)
             notification_data = {
                 "coin": coin_name,
                 "title": f"{str(coin_name).upper()} New {section.name} Available",
@@ -979,10 +924,9 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
                 "type": target,
                 "timeframe": ""
             }
-            
-            emit_notification(event_name="new_analysis", data=notification_data)
 
-            notification_service.push_notification(
+            notification_service.enqueue_notification(
+                session,
                 coin=coin_name,
                 title=notification_data["title"],
                 body=notification_data["body"],
@@ -990,6 +934,14 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
                 timeframe=""
             )
 
+            session.commit()
+            uploaded_image_url = None
+            session.refresh(new_content)
+
+            # 7. Realtime event; FCM delivery is handled by the outbox dispatcher
+            emit_notification(event_name="new_analysis", data=notification_data)
+            wake_outbox_dispatcher(ensure_started(sched))
+
             return create_response(
                 data=new_content.to_dict(),
                 message=f"{section.name} published successfully",
@@ -999,6 +951,8 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
         except ValueError as e:
             session.rollback()
             logger.error(f"Validation error in publish_analysis: {str(e)}")
+            if uploaded_image_url:
+                release_unpublished_image(uploaded_image_url)
             return create_response(
                 data=None,
                 message=str(e),
@@ -1007,6 +961,8 @@ def publish_analysis(coin_id: int, content: str, category_name: str, section_id:
         except Exception as e:
             session.rollback()
             logger.error(f"Unexpected error in publish_analysis: {str(e)}", exc_info=True)
+            if uploaded_image_url:
+                release_unpublished_image(uploaded_image_url)
             return create_response(
                 data=None,
                 message=f"An unexpected error occurred: {str(e)}",
@@ -1033,6 +989,8 @@ def schedule_post() -> Tuple[Dict, int]:
            - "2024-03-28T15:30:00Z"
     """
     response = {"message": None, "error": None, "success": False, "job_id": None}
+    # Image stored by this request, released if the post isn't scheduled
+    uploaded_image_url = None
     
     try:
         with Session() as session:
@@ -1099,7 +1057,6 @@ def schedule_post() -> Tuple[Dict, int]:
                 formatted_title = title.replace(':', '').replace(' ', '-').strip().lower()
                 image_filename = f"{formatted_title}.jpg"
                 
-                image_processor = ImageProcessor()
                 permanent_image_url = image_processor.process_and_upload_image(
                     image_url=image_url,
                     bucket_name='appanalysisimages',
@@ -1108,6 +1065,7 @@ def schedule_post() -> Tuple[Dict, int]:
                 
                 if not permanent_image_url:
                     raise ValueError("Failed to process and upload image to S3")
+                uploaded_image_url = permanent_image_url
                 
                 logger.info(f"Image processed and uploaded successfully: {permanent_image_url}")
             except Exception as e:
@@ -1120,7 +1078,7 @@ def schedule_post() -> Tuple[Dict, int]:
                 raise ValueError(f"No notification topics found for coin {coin_bot.name} and type {target}")
 
             # 10. Schedule the job with permanent S3 URL
-            job = sched.add_job(
+            job = ensure_started(sched).add_job(
                 publish_analysis,
                 args=[
                     coin_id,
@@ -1131,6 +1089,8 @@ def schedule_post() -> Tuple[Dict, int]:
                 ],
                 trigger=DateTrigger(run_date=scheduled_datetime)
             )
+            # The scheduled job owns the image from here
+            uploaded_image_url = None
 
             return jsonify({
                 "message": "Post scheduled successfully",
@@ -1141,12 +1101,16 @@ def schedule_post() -> Tuple[Dict, int]:
 
     except ValueError as e:
         logger.error(f"Validation error in schedule_post: {str(e)}")
+        if uploaded_image_url:
+            release_unpublished_image(uploaded_image_url)
         return jsonify({
             **response,
             "error": str(e)
         }), 400
     except Exception as e:
         logger.error(f"Unexpected error in schedule_post: {str(e)}")
+        if uploaded_image_url:
+            release_unpublished_image(uploaded_image_url)
         return jsonify({
             **response,
             "error": f"An unexpected error occurred: {str(e)}"
@@ -1172,14 +1136,14 @@ def delete_scheduled_job(job_id):
 
     try:
         # Find the scheduled job by ID
-        job = sched.get_job(job_id)
+        job = ensure_started(sched).get_job(job_id)
         
         if job is None:
             response["error"] = "Scheduled job not found"
             status_code = 404
         else:
             # Delete the job
-            sched.remove_job(job_id)
+            ensure_started(sched).remove_job(job_id)
             response["message"] = "Scheduled job deleted successfully"
             response["success"] = True
             status_code = 201
@@ -1225,7 +1189,7 @@ def get_scheduled_job(job_id):
     status_code = 500  # Default to server error
     
     try:
-        job = sched.get_job(job_id)
+        job = ensure_started(sched).get_job(job_id)
         
         if job is None:
             response["error"] = "Scheduled job not found"
@@ -1334,7 +1298,7 @@ def get_scheduled_analyses():
             start_date = now
             end_date = now.replace(year=now.year + 10)  # 10 years in the future
 
-        scheduled_jobs = sched.get_jobs()
+        scheduled_jobs = ensure_started(sched).get_jobs()
         formatted_jobs = []
 
         with Session() as session:
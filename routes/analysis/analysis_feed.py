@@ -0,0 +1,96 @@
+"""
+Transformation of the analysis rows listed by /analyses into the response items.
+
+Kept apart from the route (no DB, scheduler or client set up on import) so it
+can be benchmarked on its own, see benchmarks/micro/bench_analyses.py.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+from bs4 import BeautifulSoup
+
+# Content and primary key columns of each analysis model, by section target
+COLUMN_MAPPINGS = {
+    'deep_dive': {
+        'content': 'analysis',
+        'id': 'analysis_id'
+    },
+    'daily_macro': {
+        'content': 'content',
+        'id': 'id'
+    },
+    'narratives': {
+        'content': 'narrative_trading',
+        'id': 'narrative_trading_id'
+    },
+    'spotlight': {
+        'content': 'content',
+        'id': 'id'
+    },
+    'support_resistance': {
+        'content': 'analysis',
+        'id': 'analysis_id'
+    }
+}
+
+
+def split_title(content_text: str) -> Tuple[str, str]:
+    """
+    Split an analysis into its title (the text before the first <br>, without markup) and its content.
+    """
+    title_end_index = content_text.find('<br>')
+    if title_end_index == -1:
+        return "", content_text
+
+    title = content_text[:title_end_index].strip()
+    content = content_text[title_end_index + 4:].strip()
+    return BeautifulSoup(title, 'html.parser').get_text(), content
+
+
+def transform_analyses(target: str,
+                       analyses: Iterable[Any],
+                       coins_dict: Dict[int, Dict[str, Any]],
+                       categories_dict: Dict[str, Dict[str, Any]],
+                       sections_dict: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the /analyses items of one section.
+
+    Args:
+        target (str): The section target, a COLUMN_MAPPINGS key.
+        analyses (Iterable[Any]): Rows of the section's model.
+        coins_dict (Dict[int, Dict[str, Any]]): Coin bot id -> name and icon.
+        categories_dict (Dict[str, Dict[str, Any]]): Lowercased category name -> name and icon.
+        sections_dict (Dict[str, Dict[str, Any]]): Lowercased section target -> id and name.
+
+    Returns:
+        List[Dict[str, Any]]: One item per analysis, skipping those with missing reference data.
+    """
+    section_data = sections_dict.get(target)
+    if section_data is None:
+        return []
+
+    content_column = COLUMN_MAPPINGS[target]['content']
+    id_column = COLUMN_MAPPINGS[target]['id']
+
+    results = []
+    for analysis in analyses:
+        coin_data = coins_dict.get(analysis.coin_bot_id)
+        category_data = categories_dict.get(analysis.category_name.lower())
+        if coin_data is None or category_data is None:
+            continue
+
+        title, content = split_title(getattr(analysis, content_column))
+
+        results.append({
+            "category_icon": category_data['icon'],
+            "category_name": category_data['name'],
+            "coin_icon": coin_data['icon'],
+            "coin_id": analysis.coin_bot_id,
+            "coin_name": coin_data['name'],
+            "content": content,
+            "created_at": analysis.created_at.isoformat(),
+            "id": getattr(analysis, id_column),
+            "image_url": analysis.image_url,
+            "section_id": section_data['id'],
+            "section_name": section_data['name'],
+            "title": title
+        })
+    return results
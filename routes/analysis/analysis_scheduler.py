@@ -5,7 +5,7 @@ from pytz import timezone as tz
 from sqlalchemy.engine.url import make_url
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from services.slack.slack_services import send_INFO_message_to_slack_channel
 from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 
@@ -22,8 +22,7 @@ try:
     'default': SQLAlchemyJobStore(url=sqlite_url)
     }
     executors = {
-        'default': ThreadPoolExecutor(20),
-        'processpool': ProcessPoolExecutor(20)
+        'default': ThreadPoolExecutor(20)
     }
     job_defaults = {
         'coalesce': False,
@@ -33,7 +32,7 @@ try:
 
     chosen_timezone = tz('America/Buenos_Aires')
 
-    # Create the scheduler with the SQLite job store
+    # Create the scheduler with the SQLite job store, started by the jobs process (worker.py)
     sched = BackgroundScheduler(
         jobstores=job_stores,
         executors=executors,
@@ -41,12 +40,8 @@ try:
         timezone=chosen_timezone
     )
 
-    if sched.state != 1:
-        sched.start()
-        print('---- Scheduler started for the Analysis ----')
-
 except Exception as e:
-    print(f"Error starting analysis scheduler: {e}")
+    print(f"Error configuring analysis scheduler: {e}")
 
 
 
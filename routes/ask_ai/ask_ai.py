@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from services.coingecko.coingecko import get_tokenomics_data_for_ask_ai, get_list_of_coins
+from services.coingecko.coingecko import get_tokenomics_data_for_ask_ai, get_list_of_coins, search_coins
 from redis_client.redis_client import cache_with_redis
 
 ask_ai_bp = Blueprint('ask_ai', __name__)
@@ -38,8 +38,52 @@ def list_coins():
         }), 500
 
 
+@ask_ai_bp.route('/ask-ai/coins/search', methods=['GET'])
+def search_coin_list():
+    """
+    Autocomplete cryptocurrencies by name or symbol prefix.
+
+    Query Parameters:
+        q (str): The prefix to search for (case-insensitive)
+        limit (int, optional): Maximum number of results, 1-100. Defaults to 20.
+
+    Returns:
+        dict: A dictionary containing:
+            - coins: List of matching coins (id, symbol, name)
+            - length: Number of coins returned
+            - success: Operation status
+    """
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    if not query.strip():
+        return jsonify({
+            'coins': [],
+            'length': 0,
+            'error': 'The parameter q is required',
+            'success': False
+        }), 400
+
+    try:
+        coins = search_coins(query, limit)
+        return jsonify({
+            'coins': coins,
+            'length': len(coins),
+            'success': True,
+            'error': None
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'coins': [],
+            'length': 0,
+            'error': str(e),
+            'success': False
+        }), 500
+
+
 @ask_ai_bp.route('/ask-ai', methods=['GET'])
-@cache_with_redis(expiration=300)  # Cache for 5 minutes
+@cache_with_redis(expiration=60)  # Cache for 1 minute, sources keep their own TTLs
 def ask_ai():
     """
     Endpoint to retrieve detailed information about a cryptocurrency.
@@ -5,11 +5,17 @@ from http import HTTPStatus
 from dotenv import load_dotenv
 from sqlalchemy.exc import SQLAlchemyError
 from config import Chart, CoinBot, Session
-from routes.chart.total3 import get_total_3_data
+from routes.chart.total3 import BACKFILL_BARS, get_total_3_data
 from flask import current_app, jsonify, request, Blueprint, jsonify  
 from redis_client.redis_client import cache_with_redis
 from decorators.measure_time import measure_execution_time
 from services.notification.index import NotificationService
+from services.coingecko.market_snapshot import (
+    SNAPSHOT_CURRENCIES,
+    SORT_FIELDS,
+    fetch_markets,
+    get_snapshot_movers,
+)
 
 notification_service = NotificationService()
 
@@ -395,15 +401,17 @@ def get_chart_values():
 
 
 @chart_bp.route('/chart/total3', methods=['GET'])
-@cache_with_redis(expiration=5)
+@cache_with_redis(expiration=60)
 def get_total_3_data_route():
     """
     Retrieve and calculate total market cap data for the top 3 cryptocurrencies.
 
-    This endpoint fetches market cap data for the top 3 cryptocurrencies.
+    This endpoint serves the TOTAL3 daily bars from the local store, which is
+    synced incrementally from TradingView.
 
     Query Parameters:
-        days (int): Number of days of data to fetch. Defaults to 15.
+        days (int): Number of days of data to fetch, from 1 to BACKFILL_BARS (the
+                    bars kept in the store). Defaults to 15.
 
     Returns:
         dict: A JSON response containing either the calculated data or an error message.
@@ -418,6 +426,10 @@ def get_total_3_data_route():
 
     try:
         days = int(request.args.get('days', 15))
+        if not 1 <= days <= BACKFILL_BARS:
+            response["error"] = f"Invalid 'days' parameter. It must be between 1 and {BACKFILL_BARS}."
+            response["status"] = HTTPStatus.BAD_REQUEST
+            return jsonify(response), response["status"]
         total3 = get_total_3_data(days)
         response["data"] = total3
         response["message"] = "Data retrieved sucessfully"
@@ -440,8 +452,10 @@ def get_top_movers():
     """
     Retrieve the top movers (gainers and losers) for cryptocurrencies.
 
-    This endpoint fetches cryptocurrency data from the CoinGecko API and returns
-    the top 10 gainers and top 10 losers based on the specified ordering criteria.
+    This endpoint reads the market snapshot refreshed in the background for all
+    tracked coins (falling back to the CoinGecko API for currencies without a
+    snapshot) and returns the top 10 gainers and top 10 losers based on the
+    specified ordering criteria.
 
     Query Parameters:
     - vs_currency (str, optional): The target currency for market data (default: 'usd').
@@ -458,7 +472,8 @@ def get_top_movers():
             "top_10_gainers": list,
             "top_10_losers": list
         },
-        "order": str
+        "order": str,
+        "snapshot_timestamp": float | null
     }
 
     On error, returns a JSON object with "success": false and an error message.
@@ -476,62 +491,49 @@ def get_top_movers():
     if order not in valid_orders:
         return jsonify({"success": False, "error": {"code": 400, "message": "Invalid order parameter"}}), 400
     
-    with Session() as session:
-        try:
-            coins_ids = session.query(CoinBot.gecko_id).all()
-            ids = ','.join([coin[0] for coin in coins_ids if coin[0]])
-
-            if not ids:
-                return jsonify({"success": True, "data": {"top_10_gainers": [], "top_10_losers": []}, "order": order}), 200
-
-            params = {
-                'vs_currency': vs_currency,
-                'ids': ids,
-                'order': 'market_cap_desc',
-                'per_page': 250,
-                'page': 1,
-                'sparkline': False,
-                'price_change_percentage': '24h'
-            }
-            if precision is not None:
-                params['precision'] = precision
-
-            response = requests.get(f'{COINGECKO_API_URL}/coins/markets', params=params, headers=HEADERS)
-            response.raise_for_status()
-            data = response.json()
-
-            # Highlight
-            def filter_properties(coin):
-                return {
-                    "name": coin["name"],
-                    "image": coin["image"],
-                    "symbol": coin["symbol"],
-                    "price_change_percentage_24h": coin["price_change_percentage_24h"],
-                    "id": coin["id"],
-                    "current_price": coin["current_price"],
-                    "last_updated": coin["last_updated"]
-                }
-
-            sort_key = {
-                'market_cap': lambda x: x.get('market_cap') or 0,
-                'volume': lambda x: x.get('total_volume') or 0,
-                'price_change': lambda x: x.get('price_change_percentage_24h') or 0
-            }.get(order.split('_')[0], lambda x: x.get('market_cap') or 0)
-
-            sorted_data = sorted(data, key=sort_key, reverse=order.endswith('desc'))
-
-            # Highlight
-            result = {
-                "success": True,
-                "data": {
-                    "top_10_gainers": [filter_properties(coin) for coin in sorted_data[:10]],
-                    "top_10_losers": [filter_properties(coin) for coin in sorted_data[-10:][::-1]]
-                },
-                "order": order
-            }
-            return jsonify(result), 200
+    # Highlight
+    def filter_properties(coin):
+        current_price = coin["current_price"]
+        if precision is not None and current_price is not None:
+            current_price = round(current_price, precision)
+        return {
+            "name": coin["name"],
+            "image": coin["image"],
+            "symbol": coin["symbol"],
+            "price_change_percentage_24h": coin["price_change_percentage_24h"],
+            "id": coin["id"],
+            "current_price": current_price,
+            "last_updated": coin["last_updated"]
+        }
 
-        except requests.RequestException as e:
-            return jsonify({"success": False, "error": {"code": 500, "message": f"API request failed: {str(e)}"}}), 500
-        except Exception as e:
-            return jsonify({"success": False, "error": {"code": 500, "message": f"An unexpected error occurred: {str(e)}"}}), 500
\ No newline at end of file
+    try:
+        movers = None
+        if vs_currency.lower() in SNAPSHOT_CURRENCIES:
+            movers = get_snapshot_movers(order, vs_currency)
+
+        if movers is None:
+            # No snapshot for this currency (yet): fall back to a live CoinGecko request
+            with Session() as session:
+                ids = [coin[0] for coin in session.query(CoinBot.gecko_id).all() if coin[0]]
+
+            data = fetch_markets(ids, vs_currency) if ids else []
+            sort_field = SORT_FIELDS[order.rpartition('_')[0]]
+            sorted_data = sorted(data, key=lambda x: x.get(sort_field) or 0, reverse=order.endswith('desc'))
+            movers = {'top': sorted_data[:10], 'bottom': sorted_data[-10:][::-1], 'timestamp': None}
+
+        # Highlight
+        result = {
+            "success": True,
+            "data": {
+                "top_10_gainers": [filter_properties(coin) for coin in movers['top']],
+                "top_10_losers": [filter_properties(coin) for coin in movers['bottom']]
+            },
+            "order": order,
+            "snapshot_timestamp": movers['timestamp']
+        }
+        return jsonify(result), 200
+
+    except requests.RequestException as e:
+        return jsonify({"success": False, "error": {"code": 500, "message": f"API request failed: {str(e)}"}}), 500
+    except Exception as e:
+        return jsonify({"success": False, "error": {"code": 500, "message": f"An unexpected error occurred: {str(e)}"}}), 500
\ No newline at end of file
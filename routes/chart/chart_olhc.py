@@ -3,12 +3,11 @@ import time
 import uuid
 import requests
 from typing import Optional
-from bokeh.resources import CDN
 from dotenv import load_dotenv
 from flask import render_template, make_response
-from services.chart.candlestick import ChartWidget, ChartSettings
 from flask import request, jsonify, Blueprint, current_app
 from redis_client.redis_client import cache_with_redis
+from utils.upstream import http_client
 
 chart_graphs_bp = Blueprint('chart_graphs_bp', __name__)
 
@@ -47,7 +46,7 @@ def get_ohlc_binance_data(symbol: str, vs_currency: str, interval: str, precisio
         print(f"[DEBUG] Params: {params}")
 
     try:
-        response = requests.get(endpoint, params=params)
+        response = http_client.get(endpoint, params=params)
         if current_app.debug:
             print(f"[DEBUG] Binance API - Response status: {response.status_code}")
             print(f"[DEBUG] Binance API - Response headers: {dict(response.headers)}")
@@ -108,7 +107,7 @@ def get_ohlc_coingecko_data(gecko_id: str, vs_currency: str, interval: str, prec
             print(f"[DEBUG] Params: {params}")
             print(f"[DEBUG] Headers: {HEADERS}")
 
-        response = requests.get(endpoint, params=params, headers=HEADERS)
+        response = http_client.get(endpoint, params=params, headers=HEADERS)
         
         if current_app.debug:
             print(f"[DEBUG] CoinGecko API - Response status: {response.status_code}")
@@ -227,6 +226,10 @@ def ohlc_chart():
 
 @chart_graphs_bp.route('/chart/widget', methods=['GET'])
 def chart_widget():
+    # bokeh and pandas take about a second to import, only paid by the first widget request
+    from bokeh.resources import CDN
+    from services.chart.candlestick import ChartWidget, ChartSettings
+
     try:
         # Basic parameters
         symbol = request.args.get('symbol', 'BTCUSDT')
@@ -1,83 +1,244 @@
 # chart/total3.py
 
 import os
+import threading
+from datetime import datetime
 from dotenv import load_dotenv
-from typing import List, Dict, Any
-from tvDatafeed import TvDatafeed, Interval
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from config import IndexDailyBar, Session
+from utils.logging import setup_logger
 
 load_dotenv()
 
+logger = setup_logger(__name__)
+
 TW_USER = os.getenv('TW_USER')
 TW_PASS = os.getenv('TW_PASS')
 
-def fetch_total_3_data(days: int = 15) -> Any:
+TOTAL3_SYMBOL = 'CRYPTOCAP:TOTAL3'
+TOTAL3_EXCHANGE = 'CRYPTOCAP'
+
+# Index symbols kept up to date by the scheduled sync, mapped to their exchange
+INDEX_SYMBOLS = {
+    TOTAL3_SYMBOL: TOTAL3_EXCHANGE,
+}
+# Bars backfilled into an empty store, also the largest window served by /chart/total3
+BACKFILL_BARS = 365
+# The open daily bar keeps moving, the store is refreshed this often (worker.py)
+SYNC_INTERVAL_SECONDS = 5 * 60
+SYNC_JOB_ID = 'tradingview_index_bar_sync'
+
+
+class TradingViewClient:
+    """
+    Process-wide TvDatafeed session.
+
+    TvDatafeed logs in when it is constructed, so the client is created once
+    and reused for every request. If a request fails (e.g. the auth token
+    expired), the session is recreated and the request retried once.
+    tvDatafeed (and pandas with it) is only imported on the first request.
+    """
+
+    def __init__(self, username: Optional[str] = TW_USER, password: Optional[str] = TW_PASS):
+        self.username = username
+        self.password = password
+        self.logins = 0
+        self._tv: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def _session(self, relogin: bool = False) -> Any:
+        with self._lock:
+            if self._tv is None or relogin:
+                from tvDatafeed import TvDatafeed
+                self._tv = TvDatafeed(self.username, self.password)
+                self.logins += 1
+                logger.info(f"TradingView session opened (login #{self.logins})")
+            return self._tv
+
+    def get_daily_bars(self, symbol: str, exchange: str, n_bars: int) -> Any:
+        """
+        Fetch the last n_bars daily bars of a symbol, oldest first.
+
+        Raises:
+            RuntimeError: If TradingView returned no data, even after logging in again.
+        """
+        from tvDatafeed import Interval
+        for relogin in (False, True):
+            try:
+                data = self._session(relogin).get_hist(
+                    symbol=symbol,
+                    exchange=exchange,
+                    interval=Interval.in_daily,
+                    n_bars=n_bars,
+                    fut_contract=None,
+                    extended_session=False
+                )
+            except Exception as e:
+                logger.warning(f"TradingView request for {symbol} failed: {str(e)}")
+                data = None
+            if data is not None:
+                return data
+        raise RuntimeError(f"TradingView returned no data for {symbol}")
+
+
+tv_client = TradingViewClient()
+
+_sync_locks: Dict[str, threading.Lock] = {symbol: threading.Lock() for symbol in INDEX_SYMBOLS}
+
+
+def bars_to_records(raw_data: Any, symbol: str, exchange: str) -> List[Dict[str, Any]]:
+    """
+    Convert a TvDatafeed DataFrame into index_daily_bar rows without iterating over it.
     """
-    Fetch raw data for CRYPTOCAP:TOTAL3 from TradingView.
+    frame = raw_data[['open', 'high', 'low', 'close']].astype(float)
+    if 'volume' in raw_data:
+        frame['volume'] = raw_data['volume'].astype(object).where(raw_data['volume'].notna(), None)
+    else:
+        frame['volume'] = None
+    frame['bar_date'] = raw_data.index.to_pydatetime()
+    frame['symbol'] = symbol
+    frame['exchange'] = exchange
+    return frame.to_dict('records')
+
+
+def sync_index_bars(symbol: str = TOTAL3_SYMBOL, exchange: str = TOTAL3_EXCHANGE) -> int:
+    """
+    Store the daily bars of a symbol that are newer than the last stored one.
+
+    The last stored bar is fetched again as well, since it may have been
+    stored while the day was still open. An empty store is backfilled with
+    BACKFILL_BARS bars.
 
     Args:
-        days (int): Number of days of data to fetch. Defaults to 15.
+        symbol (str): The TradingView symbol.
+        exchange (str): The TradingView exchange.
 
     Returns:
-        Any: Raw data from TvDatafeed.
+        int: Number of bars inserted or updated.
 
     Raises:
-        RuntimeError: If there's an error fetching data from TradingView.
+        RuntimeError: If the bars could not be fetched from TradingView.
     """
-    try:
-        tv = TvDatafeed(TW_USER, TW_PASS)
-        data = tv.get_hist(
-            symbol='CRYPTOCAP:TOTAL3',
-            exchange='CRYPTOCAP',
-            interval=Interval.in_daily,
-            n_bars=days,
-            fut_contract=None,
-            extended_session=False
-        )
-        return data.iloc[::-1]
-    except Exception as e:
-        raise RuntimeError(f"Error fetching total3 data: {str(e)}")
+    lock = _sync_locks.setdefault(symbol, threading.Lock())
+    with lock:
+        with Session() as session:
+            last_bar_date = session.query(
+                func.max(IndexDailyBar.bar_date)
+            ).filter(IndexDailyBar.symbol == symbol).scalar()
+
+            if last_bar_date is None:
+                n_bars = BACKFILL_BARS
+            else:
+                n_bars = (datetime.now().date() - last_bar_date.date()).days + 1
+
+            raw_data = tv_client.get_daily_bars(symbol, exchange, n_bars)
+            if last_bar_date is not None:
+                raw_data = raw_data[raw_data.index >= last_bar_date]
+
+            records = bars_to_records(raw_data, symbol, exchange)
+            if records:
+                statement = insert(IndexDailyBar).values(records)
+                session.execute(statement.on_conflict_do_update(
+                    constraint='uq_index_daily_bar_symbol_bar_date',
+                    set_={
+                        'open': statement.excluded.open,
+                        'high': statement.excluded.high,
+                        'low': statement.excluded.low,
+                        'close': statement.excluded.close,
+                        'volume': statement.excluded.volume,
+                        'updated_at': func.now(),
+                    }
+                ))
+                session.commit()
+
+        return len(records)
+
+
+def sync_all_index_bars() -> Dict[str, int]:
+    """
+    Scheduled job entry point: sync every symbol in INDEX_SYMBOLS.
+    """
+    synced = {}
+    for symbol, exchange in INDEX_SYMBOLS.items():
+        try:
+            synced[symbol] = sync_index_bars(symbol, exchange)
+        except Exception as e:
+            logger.warning(f"Daily bar sync failed for {symbol}: {str(e)}")
+    return synced
 
-def process_total_3_data(raw_data: Any) -> List[Dict[str, Any]]:
+
+def register_index_bar_sync(scheduler, interval_seconds: int = SYNC_INTERVAL_SECONDS) -> None:
+    """
+    Register the periodic daily bar sync on the given APScheduler instance.
+    The first run is immediate, so an empty store is backfilled on startup.
     """
-    Process raw data into a list of dictionaries.
+    scheduler.add_job(
+        sync_all_index_bars,
+        'interval',
+        seconds=interval_seconds,
+        id=SYNC_JOB_ID,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=datetime.now()
+    )
+
+
+def get_index_bars(symbol: str, exchange: str, days: int) -> List[Dict[str, Any]]:
+    """
+    Return the last `days` daily bars of a symbol from the local store, newest first.
 
-    Args:
-        raw_data (Any): Raw data from TvDatafeed.
+    Reads never call TradingView: the store is kept up to date by the sync job
+    of the jobs process (register_index_bar_sync), and holds BACKFILL_BARS bars
+    once backfilled.
 
-    Returns:
-        List[Dict[str, Any]]: Processed data as a list of dictionaries.
+    Raises:
+        RuntimeError: If no bar of the symbol is stored yet.
     """
-    results = []
-    for index, row in raw_data.iterrows():
-        package = {
-            'date': index,
-            'open': round(row['open'], 2),
-            'high': round(row['high'], 2),
-            'low': round(row['low'], 2),
-            'close': round(row['close'], 2)
+    with Session() as session:
+        bars = (
+            session.query(IndexDailyBar)
+            .filter(IndexDailyBar.symbol == symbol)
+            .order_by(IndexDailyBar.bar_date.desc())
+            .limit(days)
+            .all()
+        )
+
+    if not bars:
+        raise RuntimeError(f"No {symbol} ({exchange}) bars stored yet, the daily bar sync has not run")
+
+    return [
+        {
+            'date': bar.bar_date,
+            'open': round(bar.open, 2),
+            'high': round(bar.high, 2),
+            'low': round(bar.low, 2),
+            'close': round(bar.close, 2)
         }
-        results.append(package)
-    return results
+        for bar in bars
+    ]
+
 
 def get_total_3_data(days: int = 15) -> List[Dict[str, Any]]:
     """
-    Retrieve and process total market cap data for the top 3 cryptocurrencies.
+    Retrieve total market cap data excluding BTC and ETH (TOTAL3) from the local daily bar store.
 
     Args:
-        days (int): Number of days of data to fetch. Defaults to 15.
+        days (int): Number of days of data to return. Defaults to 15.
 
     Returns:
-        List[Dict[str, Any]]: Processed data as a list of dictionaries.
+        List[Dict[str, Any]]: Processed data as a list of dictionaries, newest first.
 
     Raises:
         RuntimeError: If there's an error fetching or processing the data.
     """
     try:
-        raw_data = fetch_total_3_data(days)
-        return process_total_3_data(raw_data)
+        return get_index_bars(TOTAL3_SYMBOL, TOTAL3_EXCHANGE, days)
     except Exception as e:
         raise RuntimeError(f"Error in get_total_3_data: {str(e)}")
-    
+
 
 
 # Example usage
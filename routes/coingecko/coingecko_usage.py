@@ -3,6 +3,7 @@ from flask import Blueprint, jsonify
 import requests
 from dotenv import load_dotenv
 from utils.session_management import create_response
+from utils.upstream import http_client
 
 load_dotenv()
 
@@ -20,7 +21,7 @@ def coingecko_usage():
     headers = {'X-Cg-Pro-Api-Key': COINGECKO_API_KEY}
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         return jsonify(create_response(success=True, data=response.json())), 200
     except requests.RequestException as e:
@@ -3,6 +3,7 @@ import requests
 from flask import jsonify, Blueprint, request
 from utils.external_apis_values import BINANCE_INTERVAL_VALUES, BINANCE_SYMBOL_VALUES
 from utils.general import parse_timestamp
+from utils.upstream import http_client
 
 binance_bp = Blueprint("binance_bp", __name__)
 
@@ -67,7 +68,7 @@ def get_symbol_klines():
     url = f"https://api3.binance.com/api/v3/klines?interval={interval.lower()}&symbol={symbol.upper()}"
 
     try:
-        data = requests.get(url)
+        data = http_client.get(url)
         data.raise_for_status()
         data = data.json()
         data = parse_response(data)
@@ -4,6 +4,7 @@ import requests
 from dotenv import load_dotenv
 from flask import jsonify, Blueprint, request
 from utils.general import validate_headers, validate_max, validate_resolution
+from utils.upstream import http_client
 
 capitalcom_bp = Blueprint("capitalcom_bp", __name__)
 
@@ -69,7 +70,7 @@ def get_symbol_prices():
             "CST": headers.get("CST"),
         }
 
-        data = requests.get(url, headers=headers)
+        data = http_client.get(url, headers=headers)
         data.raise_for_status()
         data = data.json()
 
@@ -160,7 +161,7 @@ def post_capitalcom_session():
     }
 
     try:
-        data = requests.post(url, json=payload, headers=headers)
+        data = http_client.post(url, json=payload, headers=headers)
         data.raise_for_status()
         response_data = data.json()
 
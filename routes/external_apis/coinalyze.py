@@ -3,6 +3,7 @@ import requests
 from dotenv import load_dotenv
 from flask import jsonify, Blueprint, request
 from utils.external_apis_values import COINALYZE_SYMBOL_VALUES
+from utils.upstream import http_client
 
 coinalyze_bp = Blueprint("coinalyze_bp", __name__)
 
@@ -53,7 +54,7 @@ def get_funding_rates():
     url = f"https://api.coinalyze.net/v1/funding-rate?api_key={COINALYZE_API_KEY}&symbols={symbols.upper()}"
 
     try:
-        data = requests.get(url)
+        data = http_client.get(url)
         data.raise_for_status()
         data = data.json()
 
@@ -3,6 +3,7 @@ import requests
 from dotenv import load_dotenv
 from flask import jsonify, Blueprint, request
 from utils.general import validate_date, validate_int_list
+from utils.upstream import http_client
 
 coindar_bp = Blueprint("coindar_bp", __name__)
 
@@ -93,7 +94,7 @@ def get_crypto_events():
         url += f"&order_by={order_by}"
 
     try:
-        data = requests.get(url)
+        data = http_client.get(url)
         data.raise_for_status()
         data = data.json()
 
@@ -2,6 +2,7 @@ import os
 from dotenv import load_dotenv
 import requests
 from flask import Flask, jsonify, Blueprint
+from utils.upstream import http_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -43,7 +44,7 @@ def get_bitcoin_etfs():
             "coinglassSecret": api_key
         }
 
-        data = requests.get(url, headers=headers)
+        data = http_client.get(url, headers=headers)
         data.raise_for_status()
         data = data.json()
 
@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 from flask import jsonify, Blueprint, request
 from utils.general import validate_date
 from utils.external_apis_values import PROFIT_ISO_CURRENCIES
+from utils.upstream import http_client
 
 profit_bp = Blueprint("profit_bp", __name__)
 
@@ -80,7 +81,7 @@ def get_economic_events():
             url += f"&impact={i}"
 
     try:
-        data = requests.get(url)
+        data = http_client.get(url)
         data.raise_for_status()
         response_data = data.json()
 
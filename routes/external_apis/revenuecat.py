@@ -2,6 +2,7 @@ import os
 import requests
 from dotenv import load_dotenv
 from flask import jsonify, Blueprint, request
+from utils.upstream import http_client
 
 revenuecat_bp = Blueprint("revenuecat_bp", __name__)
 
@@ -52,7 +53,7 @@ def get_subscribers_info():
             "Authorization": f"Bearer {REVENUECAT_API_KEY}"
         }
 
-        data = requests.get(url, headers=headers)
+        data = http_client.get(url, headers=headers)
         data.raise_for_status()
         data = data.json()
 
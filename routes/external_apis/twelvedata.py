@@ -3,6 +3,7 @@ import requests
 from dotenv import load_dotenv
 from flask import jsonify, Blueprint, request
 from utils.external_apis_values import TWELVEDATA_INTERVAL_VALUES
+from utils.upstream import http_client
 
 twelvedata_bp = Blueprint("twelvedata_bp", __name__)
 
@@ -57,7 +58,7 @@ def get_symbol_time_series():
     url = f"https://api.twelvedata.com/time_series?apikey={TUELVEDATA_API_KEY}&symbol={symbol.upper()}&interval={interval.lower()}&outputsize={outputsize}"
 
     try:
-        data = requests.get(url)
+        data = http_client.get(url)
         data.raise_for_status()
         data = data.json()
 
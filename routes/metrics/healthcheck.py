@@ -2,6 +2,8 @@
 
 from flask import Blueprint, jsonify, current_app, render_template
 import psutil
+from services.notification.outbox import get_outbox_metrics
+from utils.metrics import render_metrics
 
 healthcheck = Blueprint('healthcheck', __name__, template_folder='templates')
 
@@ -10,6 +12,34 @@ def health():
     return jsonify({"status": "ok"}), 200
 
 
+@healthcheck.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus exposition of the request latency, size, in-flight and cache metrics
+    of every worker.
+
+    Response:
+        200: Metrics in the Prometheus text format.
+    """
+    body, content_type = render_metrics()
+    return current_app.response_class(body, status=200, content_type=content_type)
+
+
+@healthcheck.route('/health/notification-outbox', methods=['GET'])
+def notification_outbox_health():
+    """
+    Report the push notification outbox backlog and dispatcher counters.
+
+    Response:
+        200: Outbox metrics (status counts, oldest pending age, batch counters).
+        500: The outbox table could not be queried.
+    """
+    try:
+        return jsonify({"status": "ok", "metrics": get_outbox_metrics()}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "error": str(e)}), 500
+
+
 @healthcheck.route('/', methods=['GET'])
 def welcome():
     """
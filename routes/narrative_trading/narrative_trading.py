@@ -11,9 +11,12 @@ from sqlalchemy.exc import SQLAlchemyError
 from services.openai.dalle import ImageGenerator
 from services.aws.s3 import ImageProcessor
 from routes.narrative_trading.nt_scheduler import sched
+from utils.scheduling import ensure_started
 from redis_client.redis_client import cache_with_redis, update_cache_with_redis
+from utils.logging import setup_logger
 
 narrative_trading_bp = Blueprint('narrative_trading', __name__)
+logger = setup_logger(__name__)
 
 image_generator = ImageGenerator()
 image_processor = ImageProcessor()
@@ -408,6 +411,11 @@ def publish_narrative_trading(coin_bot_id, content, category_name):
         try:
             new_narrative_trading = create_narrative_trading(coin_bot_id, content, category_name, image_url)
         except Exception as e:
+            # Nothing uses the stored image, drop its reference
+            try:
+                image_processor.delete_from_s3(bucket='appnarrativetradingimages', image_url=image_url)
+            except Exception as release_error:
+                logger.error(f"Failed to release image {image_url}: {str(release_error)}")
             raise ValueError(f"Error creating narrative trading: {str(e)}")
 
         session.commit()
@@ -531,7 +539,7 @@ def schedule_post():
             return jsonify(create_response(success=False, 
                                            error=f'Invalid date format: {str(e)}')), 400
 
-        job = sched.add_job(publish_narrative_trading, 
+        job = ensure_started(sched).add_job(publish_narrative_trading, 
                             args=[coin_id, content, category_name],
                             trigger=DateTrigger(run_date=scheduled_datetime))
 
@@ -556,7 +564,7 @@ def get_jobs():
     """
     try:
         job_listing = []
-        for job in sched.get_jobs():
+        for job in ensure_started(sched).get_jobs():
             job_info = {
                 'id': job.id,
                 'name': job.name,
@@ -589,12 +597,12 @@ def delete_scheduled_job(job_id):
             - 'status': HTTP status code
     """
     try:
-        job = sched.get_job(job_id)
+        job = ensure_started(sched).get_job(job_id)
         if not job:
             return jsonify(create_response(success=False, 
                                            error='Scheduled job not found')), 404
 
-        sched.remove_job(job_id)
+        ensure_started(sched).remove_job(job_id)
         return jsonify(create_response(success=True, 
                                        message='Scheduled job deleted successfully')), 200
 
@@ -25,16 +25,17 @@ try:
         'default': ThreadPoolExecutor(20)
     }
 
-    # Set job defaults
+    # Set job defaults, the grace time covers the jobs process picking up posts scheduled for right now
     job_defaults = {
         'coalesce': False,
-        'max_instances': 1
+        'max_instances': 1,
+        'misfire_grace_time': 30
     }
 
     # Set timezone
     chosen_timezone = tz('America/Argentina/Buenos_Aires')
 
-    # Create and configure the scheduler
+    # Create and configure the scheduler, started by the jobs process (worker.py)
     sched = BackgroundScheduler(
         jobstores=job_stores,
         executors=executors,
@@ -42,13 +43,8 @@ try:
         timezone=chosen_timezone
     )
 
-    # Start the scheduler if it's not already running
-    if not sched.running:
-        sched.start()
-        print('---- Scheduler started for Narrative Trading ----')
-
 except Exception as e:
-    print(f"Error starting narrative trading scheduler: {e}")
+    print(f"Error configuring narrative trading scheduler: {e}")
 
 
 
@@ -0,0 +1,153 @@
+import hashlib
+import threading
+from typing import Iterable, List, Optional
+from sqlalchemy import event
+from config import AnalyzedArticle, Article, ArticleSource, Session
+from redis_client.redis_client import redis_client
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# One bitmap per namespace, so the URL, title and analyzed fingerprints don't fill the same filter
+NAMESPACES = ('url', 'title', 'analyzed')
+BLOOM_KEY_PREFIX = 'article_dedup:bloom'
+REBUILD_LOCK_KEY = 'article_dedup:bloom:rebuilding'
+# 2^26 bits (8 MiB) and 10 hashes per namespace: ~0.03% false positives at four
+# million fingerprints, the 'url' filter of two million articles (article and article_source)
+BLOOM_BITS = 1 << 26
+BLOOM_HASHES = 10
+# Set once the bitmap is rebuilt, in the bitmap itself: if Redis evicts the key
+# the marker goes with it and the filter is rebuilt instead of answering "new"
+READY_BIT = BLOOM_BITS
+REBUILD_BATCH_SIZE = 5000
+
+
+def bloom_key(namespace: str) -> str:
+    return f"{BLOOM_KEY_PREFIX}:{namespace}"
+
+
+def _positions(namespace: str, digest: str) -> List[int]:
+    hashed = hashlib.sha256(f"{namespace}:{digest}".encode()).digest()
+    h1 = int.from_bytes(hashed[:8], 'big')
+    h2 = int.from_bytes(hashed[8:16], 'big') | 1
+    return [(h1 + i * h2) % BLOOM_BITS for i in range(BLOOM_HASHES)]
+
+
+class ArticleDedupBloom:
+    """
+    Redis bitmap Bloom filters over the article and analyzed-article fingerprints,
+    one per namespace.
+
+    A negative answer means the fingerprint was never stored, so the common
+    "new article" case is answered without touching the database; positive
+    answers must be confirmed with the indexed hash lookup. A filter is only
+    trusted once it has been rebuilt from the database (READY_BIT); until then,
+    or when Redis is unavailable, might_contain() returns None and callers go
+    straight to the database.
+    """
+
+    def add(self, namespace: str, digest: Optional[str]) -> None:
+        if not digest:
+            return
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            for position in _positions(namespace, digest):
+                pipeline.setbit(bloom_key(namespace), position, 1)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Could not add {namespace} fingerprint to the dedup Bloom filter: {str(e)}")
+
+    def might_contain(self, namespace: str, digest: str) -> Optional[bool]:
+        """
+        Returns:
+            Optional[bool]: False if the fingerprint is certainly new, True if it may
+                            have been seen, None if the filter cannot be used.
+        """
+        try:
+            key = bloom_key(namespace)
+            pipeline = redis_client.pipeline(transaction=False)
+            pipeline.getbit(key, READY_BIT)
+            for position in _positions(namespace, digest):
+                pipeline.getbit(key, position)
+            ready, *bits = pipeline.execute()
+            if not ready:
+                self.rebuild_in_background()
+                return None
+            return all(bits)
+        except Exception as e:
+            logger.warning(f"Dedup Bloom filter unavailable: {str(e)}")
+            return None
+
+    def _add_many(self, key: str, namespace: str, digests: Iterable[Optional[str]]) -> None:
+        pipeline = redis_client.pipeline(transaction=False)
+        pending = 0
+        for digest in digests:
+            if not digest:
+                continue
+            for position in _positions(namespace, digest):
+                pipeline.setbit(key, position, 1)
+            pending += 1
+            if pending >= REBUILD_BATCH_SIZE:
+                pipeline.execute()
+                pending = 0
+        pipeline.execute()
+
+    def rebuild(self) -> bool:
+        """
+        Rebuild the filter from every stored fingerprint and mark it ready.
+
+        Returns:
+            bool: False if another process is already rebuilding it.
+        """
+        if not redis_client.set(REBUILD_LOCK_KEY, 1, nx=True, ex=600):
+            return False
+
+        # Bits are only ever set, never cleared, so fingerprints added by
+        # concurrent inserts during the rebuild are kept.
+        try:
+            with Session() as session:
+                self._add_many(bloom_key('url'), 'url', (digest for (digest,) in session.query(Article.url_hash).yield_per(REBUILD_BATCH_SIZE)))
+                self._add_many(bloom_key('url'), 'url', (digest for (digest,) in session.query(ArticleSource.url_hash).yield_per(REBUILD_BATCH_SIZE)))
+                self._add_many(bloom_key('title'), 'title', (digest for (digest,) in session.query(Article.title_hash).yield_per(REBUILD_BATCH_SIZE)))
+                self._add_many(bloom_key('analyzed'), 'analyzed', (digest for (digest,) in session.query(AnalyzedArticle.url_hash).yield_per(REBUILD_BATCH_SIZE)))
+            pipeline = redis_client.pipeline(transaction=False)
+            for namespace in NAMESPACES:
+                pipeline.setbit(bloom_key(namespace), READY_BIT, 1)
+            pipeline.execute()
+            logger.info("Article dedup Bloom filter rebuilt")
+            return True
+        finally:
+            redis_client.delete(REBUILD_LOCK_KEY)
+
+    def rebuild_in_background(self) -> None:
+        if redis_client.exists(REBUILD_LOCK_KEY):
+            return
+        threading.Thread(target=self._safe_rebuild, daemon=True).start()
+
+    def _safe_rebuild(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"Dedup Bloom filter rebuild failed: {str(e)}")
+
+
+article_dedup_bloom = ArticleDedupBloom()
+
+
+@event.listens_for(Article, 'after_insert')
+@event.listens_for(Article, 'after_update')
+def _add_article_fingerprints(mapper, connection, target):
+    article_dedup_bloom.add('url', target.url_hash)
+    article_dedup_bloom.add('title', target.title_hash)
+
+
+@event.listens_for(AnalyzedArticle, 'after_insert')
+@event.listens_for(AnalyzedArticle, 'after_update')
+def _add_analyzed_article_fingerprint(mapper, connection, target):
+    article_dedup_bloom.add('analyzed', target.url_hash)
+
+
+@event.listens_for(ArticleSource, 'after_insert')
+@event.listens_for(ArticleSource, 'after_update')
+def _add_article_source_fingerprint(mapper, connection, target):
+    article_dedup_bloom.add('url', target.url_hash)
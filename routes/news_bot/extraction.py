@@ -0,0 +1,245 @@
+"""
+Shared HTML extraction for the news site parsers in routes/news_bot/sites.
+
+A page is parsed once with selectolax (lexbor, a C HTML5 parser) and each
+field is read with one CSS query described declaratively in SITE_SELECTORS,
+instead of a BeautifulSoup 'html.parser' tree walked with find/find_all for
+each field. The body is built with a single join.
+
+Usage:
+    page = parse_article(article_response.text, 'Ambcrypto')
+    page.title, page.content, page.date, page.images
+
+Only the selectors live here; what a site does with the raw date or image
+values (parsing, freshness checks) stays in its module.
+"""
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from selectolax.lexbor import LexborHTMLParser
+
+_TEXT_NODE_SEPARATOR = '\x00'
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    Where one value lives on an article page.
+
+    Attributes:
+        selector (str): CSS selector of the element(s).
+        attr (str | tuple): Attribute to read instead of the text. With several,
+            the first non-empty one wins.
+        many (bool): Collect the values of every match instead of the first one.
+        prefix (str): Only keep values starting with it.
+        separator (str): Strip every text node and join the non-empty ones with
+            it, like BeautifulSoup's get_text(separator, strip=True). By default
+            the whole text of the element is taken.
+        strip (bool): Strip the value (ignored when a separator is given).
+    """
+    selector: str
+    attr: Union[str, Tuple[str, ...], None] = None
+    many: bool = False
+    prefix: Optional[str] = None
+    separator: Optional[str] = None
+    strip: bool = True
+
+
+@dataclass(frozen=True)
+class SiteSelectors:
+    """
+    Declarative description of a site's article pages.
+
+    Attributes:
+        title (Field): The article title.
+        body (Field): The paragraphs joined into the article content.
+        date (Field): The raw publication date, validated by the site module.
+        images (Field): The image URL(s).
+        lowercase_body (bool): Lowercase the content.
+    """
+    title: Field = Field('h1')
+    body: Field = Field('p', many=True)
+    date: Optional[Field] = None
+    images: Optional[Field] = None
+    lowercase_body: bool = False
+
+
+SITE_SELECTORS = {
+    'Ambcrypto': SiteSelectors(
+        date=Field('time'),
+        images=Field('img', 'src', many=True, prefix='https://statics.ambcrypto.com/wp-content/'),
+    ),
+    'Beincrypto': SiteSelectors(
+        body=Field('p', many=True, strip=False),
+        lowercase_body=True,
+        date=Field('time', 'datetime'),
+        images=Field('img', 'src', many=True, prefix='https://s32679.pcdn.co/'),
+    ),
+    'Bitcoinist': SiteSelectors(
+        date=Field('div.jeg_meta_date a'),
+        images=Field('img', 'src', many=True, prefix='https://bitcoinist.com/wp-content/uploads/'),
+    ),
+    'Blockworks': SiteSelectors(
+        date=Field('time', 'datetime'),
+        images=Field('img', 'srcset'),
+    ),
+    'Coincodex': SiteSelectors(
+        date=Field('time', 'datetime'),
+        images=Field('img.img-fluid.loaded', 'src'),
+    ),
+    'Coindesk': SiteSelectors(
+        date=Field('span.typography__StyledTypography-sc-owin6q-0.hcIsFR'),
+        images=Field('img', 'src', many=True, prefix='https://www.coindesk.com/resizer/'),
+    ),
+    'Coingape': SiteSelectors(
+        date=Field('div.publishby.d-flex'),
+        images=Field('img', 'src', many=True, prefix='https://coingape.com/wp-content/uploads/'),
+    ),
+    'Coinpedia': SiteSelectors(
+        date=Field('span.post_date_display', separator=''),
+        images=Field('img', 'src', prefix='https://image.coinpedia.org/wp-content/uploads'),
+    ),
+    'Cointelegraph': SiteSelectors(
+        body=Field('p', many=True, strip=False),
+        lowercase_body=True,
+        date=Field('time', 'datetime'),
+        images=Field('img', ('srcset', 'src')),
+    ),
+    'Cryptonews': SiteSelectors(
+        body=Field('p', many=True, strip=False),
+        lowercase_body=True,
+        date=Field('time', 'datetime'),
+        images=Field('div.detail-image-wrap', 'style', many=True),
+    ),
+    'Cryptodaily': SiteSelectors(
+        date=Field('div.date-count b', many=True, separator=' '),
+        images=Field('img.img-fluid.post-image', ('data-src', 'src')),
+    ),
+    'Cryptopotato': SiteSelectors(
+        date=Field('span.last-modified-timestamp', separator=''),
+        images=Field('img.wp-post-image', ('src', 'data-src')),
+    ),
+    'Cryptoslate': SiteSelectors(
+        date=Field('div.post-date', separator=''),
+        images=Field('img', 'src'),
+    ),
+    'Dailyhodl': SiteSelectors(
+        date=Field('div.jeg_meta_date a', separator=''),
+        images=Field('img.wp-post-image', 'src'),
+    ),
+    'Decrypt': SiteSelectors(
+        date=Field('time[datetime]'),
+        images=Field('img', 'src', many=True),
+    ),
+    'Google News': SiteSelectors(),
+    'Investing': SiteSelectors(
+        date=Field('div.contentSectionDetails span', many=True),
+        images=Field('img#carouselImage', 'src', prefix='https://i-invdn-com.investing.com/news/'),
+    ),
+    'Theblock': SiteSelectors(
+        date=Field('div.timestamp.tbcoTimestamp'),
+        images=Field('img', 'src', many=True),
+    ),
+    'Utoday': SiteSelectors(
+        date=Field('div.humble.article__short-humble span', separator=''),
+        images=Field('img', 'src', many=True, prefix='https://u.today/sites/default/files/'),
+    ),
+}
+
+# Publishers reached through Google News whose pages need their own selectors
+HOST_SELECTORS = {
+    'blockchainreporter.net': SiteSelectors(body=Field('div.content-inner p', many=True)),
+}
+
+
+def _node_value(node, field: Field) -> Optional[str]:
+    if field.attr is not None:
+        attributes = node.attributes
+        names = (field.attr,) if isinstance(field.attr, str) else field.attr
+        for name in names:
+            value = attributes.get(name)
+            if value:
+                return value.strip() if field.strip else value
+        return None
+
+    if field.separator is not None:
+        parts = node.text(separator=_TEXT_NODE_SEPARATOR, strip=True).split(_TEXT_NODE_SEPARATOR)
+        return field.separator.join(part for part in parts if part)
+
+    text = node.text()
+    return text.strip() if field.strip else text
+
+
+def select(tree, field: Field) -> Union[str, List[str], None]:
+    """
+    Read a field from a parsed page.
+
+    Returns:
+        Union[str, List[str], None]: The list of values for `many` fields, otherwise
+                                     the first value or None.
+    """
+    if not field.many and field.prefix is None:
+        node = tree.css_first(field.selector)
+        return _node_value(node, field) if node is not None else None
+
+    values = []
+    for node in tree.css(field.selector):
+        value = _node_value(node, field)
+        if value is None or (field.prefix is not None and not value.startswith(field.prefix)):
+            continue
+        if not field.many:
+            return value
+        values.append(value)
+    return values if field.many else None
+
+
+class ArticlePage:
+    """
+    An article page parsed once; each field is extracted on first access.
+    """
+
+    def __init__(self, html: str, selectors: SiteSelectors):
+        self.selectors = selectors
+        self.tree = LexborHTMLParser(html)
+
+    @cached_property
+    def title(self) -> Optional[str]:
+        return select(self.tree, self.selectors.title)
+
+    @cached_property
+    def content(self) -> str:
+        content = ''.join(select(self.tree, self.selectors.body))
+        return content.lower() if self.selectors.lowercase_body else content
+
+    @cached_property
+    def date(self) -> Union[str, List[str], None]:
+        return select(self.tree, self.selectors.date) if self.selectors.date else None
+
+    @cached_property
+    def images(self) -> Union[str, List[str], None]:
+        return select(self.tree, self.selectors.images) if self.selectors.images else None
+
+
+def parse_article(html: str, site: Union[str, SiteSelectors], url: Optional[str] = None) -> ArticlePage:
+    """
+    Parse an article page with the selectors of its site.
+
+    Args:
+        html (str): The page.
+        site (str | SiteSelectors): A SITE_SELECTORS key or the selectors themselves.
+        url (str): The article URL, when a publisher in HOST_SELECTORS may serve it.
+
+    Returns:
+        ArticlePage: The parsed page.
+
+    Raises:
+        KeyError: If the site has no selectors.
+    """
+    selectors = site if isinstance(site, SiteSelectors) else SITE_SELECTORS[site]
+    if url:
+        host = (urlsplit(url).hostname or '').lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        selectors = HOST_SELECTORS.get(host, selectors)
+    return ArticlePage(html, selectors)
@@ -1,12 +1,16 @@
 from routes.slack.templates.poduct_alert_notification import send_notification_to_product_alerts_slack_channel
-from config import CoinBot, PurchasedPlan, User, session, Category, Article, TopStory, TopStoryImage
+from config import PurchasedPlan, User, session, Category, TopStory, TopStoryImage
+from routes.news_bot.news_feed import (
+    DEFAULT_PAGE_SIZE, DEFAULT_TOP_STORIES_PAGE_SIZE, TIME_RANGES, InvalidCursor,
+    get_news_page, get_top_stories_page, invalidate_top_stories
+)
 # from routes.news_bot.scrapper import start_periodic_scraping
 from apscheduler.jobstores.base import JobLookupError
 from flask import request, Blueprint, jsonify
 from datetime import datetime, timedelta
 from scheduler import scheduler
+from utils.scheduling import ensure_started
 from sqlalchemy import exists
-from sqlalchemy import desc
 from sqlalchemy import exc
 
 scrapper_bp = Blueprint(
@@ -16,39 +20,44 @@ scrapper_bp = Blueprint(
 )
 
 
-# Gets all top stories 
+# Gets the top stories, one page at a time
 @scrapper_bp.route('/api/get/allTopStories', methods=['GET'])
 def get_all_top_stories():
-    try:
-        top_stories_list = []
-        top_stories = session.query(TopStory).order_by(desc(TopStory.created_at)).all()
+    """
+    Top stories, newest first.
 
-        if not top_stories:
-            return jsonify({'top_stories': 'No top stories found'}), 204
-        else:
-            for top_story in top_stories:
-                top_story_dict = {
-                    'top_story_id': top_story.top_story_id,
-                    'story_date': top_story.story_date,
-                    'summary': top_story.summary,
-                    'created_at': top_story.created_at.isoformat(),
-                    'coin_bot_id': top_story.coin_bot_id,
-                    'images': []
-                }
-
-                for image in top_story.images:
-                     top_story_dict['images'].append({
-                         'image_id': image.image_id,
-                         'image': image.image,
-                         'created_at': image.created_at.isoformat(),
-                         'top_story_id': image.top_story_id
-                     })
-
-                top_stories_list.append(top_story_dict)
+    Query params:
+        coin (str): Only the stories of this coin bot.
+        start_date (str): YYYY-MM-DD, only the stories created that day or later.
+        end_date (str): YYYY-MM-DD, only the stories created that day or earlier.
+        limit (int): Page size, 20 by default, at most 100.
+        cursor (str): next_cursor of the previous page.
 
-        
-            return jsonify({'top_stories': top_stories_list}), 200
-           
+    Response:
+        200: {'top_stories': [...], 'next_cursor': str or null}
+        204: No top stories.
+        400: Invalid date or cursor.
+        404: Coin not found.
+        500: Internal server error.
+    """
+    try:
+        try:
+            start_date = request.args.get('start_date')
+            start_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+            end_date = request.args.get('end_date')
+            end_date = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1) if end_date else None
+        except ValueError:
+            return jsonify({'error': 'Dates must be formatted as YYYY-MM-DD'}), 400
+
+        res, status = get_top_stories_page(coin=request.args.get('coin'),
+                                           start_date=start_date,
+                                           end_date=end_date,
+                                           limit=request.args.get('limit', default=DEFAULT_TOP_STORIES_PAGE_SIZE, type=int),
+                                           cursor=request.args.get('cursor'))
+        return jsonify(res), status
+
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'An error occurred getting the top stories: {str(e)}'}), 500
 
@@ -69,6 +78,7 @@ def delete_top_story(top_story_id):
         session.delete(top_story)
         session.delete(top_story_image)
         session.commit()
+        invalidate_top_stories()
 
         return jsonify({'message': 'Top story deleted'}), 200
 
@@ -77,83 +87,45 @@ def delete_top_story(top_story_id):
         return jsonify({'error': f'An error occurred deleting the top story: {str(e)}'}), 500
     
 
-def get_news(bot_name, time_range, limit):
+def get_news(bot_name, time_range, limit, cursor=None):
     try:
-        coin_bot = session.query(CoinBot).filter(CoinBot.bot_name == bot_name.casefold()).first()
-
-        if not coin_bot:
-            return {'error': f'Coin {bot_name} not found'}, 404
-
-        coin_bot_id = coin_bot.bot_id
-        articles = None
-
-        if time_range == 'today':
-            start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        elif time_range == 'this week':
-            today = datetime.now()
-            start_date = today - timedelta(days=today.weekday())
-            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif time_range == 'last month':
-            today = datetime.now()
-            start_date = today - timedelta(days=(today.weekday() + 30))
-            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            start_date = None
-
-        # Ahora incluimos el límite en la consulta
-        if start_date:
-            articles = session.query(Article).filter(Article.coin_bot_id == coin_bot_id, Article.created_at >= start_date).order_by(desc(Article.created_at)).limit(limit).all()
-        else:
-            articles = session.query(Article).filter(Article.coin_bot_id == coin_bot_id).order_by(desc(Article.created_at)).limit(limit).all()
-
-
-        if articles:
-            articles_list = []
-
-            for article in articles:
-                article_dict = {
-                    'article_id': article.article_id,
-                    'date': article.date,
-                    'title': article.title,
-                    'url': article.url,
-                    'summary': article.summary,
-                    'created_at': article.created_at.isoformat(),
-                    'coin_bot_id': article.coin_bot_id,
-                    'images': []
-                }
-
-                # Include image information
-                for image in article.images:
-                    article_dict['images'].append({
-                        'image_id': image.image_id,
-                        'image': image.image,
-                        'created_at': image.created_at.isoformat(),
-                        'article_id': image.article_id
-                    })
-
-                articles_list.append(article_dict)
-
-            return {'articles': articles_list}, 200
-        else:
-            return {'message': f'No articles found for {bot_name}'}, 204
- 
+        return get_news_page(bot_name=bot_name, time_range=time_range, limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        return {'error': str(e)}, 400
     except Exception as e:
         return {'error': f'An error occurred getting the news for {bot_name}: {str(e)}'}, 500
 
 @scrapper_bp.route('/api/get/news', methods=['GET'])
 def get_news_by_bot_name():
+    """
+    Articles of a coin bot, newest first, one page at a time.
+
+    Query params:
+        coin (str): The coin bot name (required).
+        time_range (str): 'today', 'this week' or 'last month'. All time by default.
+        limit (int): Page size, 10 by default, at most 100.
+        cursor (str): next_cursor of the previous page.
+
+    Response:
+        200: {'articles': [...], 'next_cursor': str or null}
+        204: No articles.
+        400: Missing coin, invalid time range or cursor.
+        404: Coin not found.
+        500: Internal server error.
+    """
     try:
         coin = request.args.get('coin')
         time_range = request.args.get('time_range')
-        limit = request.args.get('limit', default=10, type=int)
+        limit = request.args.get('limit', default=DEFAULT_PAGE_SIZE, type=int)
+        cursor = request.args.get('cursor')
 
-        if time_range and time_range not in ["today", "this week", "last month"]:
+        if time_range and time_range not in TIME_RANGES:
             return {'error': "Time range isn't valid"}, 400
 
         if not coin:
             return {'error': 'Coin is required'}, 400
         else:
-            res, status = get_news(bot_name=coin, time_range=time_range, limit=limit)
+            res, status = get_news(bot_name=coin, time_range=time_range, limit=limit, cursor=cursor)
             return res, status
     except Exception as e:
         return {'error': f'An error occurred getting the news: {str(e)}'}, 500
@@ -261,7 +233,7 @@ def deactivate_news_bot(category_name):
             return f'{category_name.capitalize()} does not match any in the database', 404
 
 
-        scheduler.remove_job(category_name)
+        ensure_started(scheduler).remove_job(category_name)
         category.is_active = False
         session.commit()
 
@@ -0,0 +1,93 @@
+"""
+Near-duplicate clustering of incoming articles.
+
+The same story is often republished by several sites with a different
+title and URL, so the exact URL/title fingerprints miss it. Each body gets a
+64-bit SimHash (utils.fingerprint.simhash) stored on its Article. A new
+article whose SimHash is within SIMHASH_MAX_DISTANCE bits of an article
+saved for the same coin bot in the last NEAR_DUPLICATE_WINDOW joins that
+article's cluster as an ArticleSource, instead of being summarized, stored
+and posted again.
+
+Lookups are LSH over the band expression indexes on article: the 64 bits
+are split in SIMHASH_BANDS bands and any article sharing one band is a
+candidate, then the exact distance is checked. With 8 bands of 8 bits, two
+fingerprints within 7 bits always share a band.
+"""
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from config import Article, ArticleSource, SIMHASH_BANDS, simhash_band
+from utils.fingerprint import hamming_distance
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+NEAR_DUPLICATE_WINDOW = timedelta(hours=72)
+# Pigeonhole bound of the banding. Unrelated articles differ by about 32 bits, lightly
+# edited copies by a handful; heavier rewrites (beyond ~3% of the words) are let through.
+SIMHASH_MAX_DISTANCE = SIMHASH_BANDS - 1
+# First key of the transaction-level advisory locks taken per coin bot
+CLUSTER_LOCK_CLASS = 40
+
+
+def lock_clusters(coin_bot_id: int, session_instance) -> None:
+    """
+    Serialize the check-then-insert of new articles of a coin bot until the transaction ends,
+    so two copies of a story saved at the same time don't both start a cluster.
+    """
+    session_instance.execute(func.pg_advisory_xact_lock(CLUSTER_LOCK_CLASS, coin_bot_id).select())
+
+
+def find_near_duplicate(fingerprint: Optional[int], coin_bot_id: int, session_instance) -> Optional[Tuple[int, int]]:
+    """
+    Closest recent article of the coin bot within SIMHASH_MAX_DISTANCE bits.
+
+    Returns:
+        Optional[Tuple[int, int]]: The article_id and the distance, or None.
+    """
+    if fingerprint is None:
+        return None
+
+    candidates = (
+        session_instance.query(Article.article_id, Article.simhash)
+        .filter(
+            Article.coin_bot_id == coin_bot_id,
+            Article.simhash.isnot(None),
+            Article.created_at >= datetime.now() - NEAR_DUPLICATE_WINDOW,
+            or_(*(simhash_band(Article.simhash, band) == simhash_band(fingerprint, band) for band in range(SIMHASH_BANDS)))
+        )
+        .all()
+    )
+
+    best = None
+    for article_id, candidate in candidates:
+        distance = hamming_distance(fingerprint, candidate)
+        if distance <= SIMHASH_MAX_DISTANCE and (best is None or distance < best[1]):
+            best = (article_id, distance)
+    return best
+
+
+def attach_alternate_source(article_id: int, url: str, title: str, fingerprint: Optional[int],
+                            distance: int, session_instance) -> bool:
+    """
+    Record a copy of an article.
+
+    Returns:
+        bool: False if the URL was already recorded.
+    """
+    try:
+        session_instance.add(ArticleSource(
+            article_id=article_id,
+            url=url,
+            title=title,
+            simhash=fingerprint,
+            distance=distance
+        ))
+        session_instance.commit()
+        return True
+    except IntegrityError:
+        session_instance.rollback()
+        logger.info(f"{url} is already an alternate source")
+        return False
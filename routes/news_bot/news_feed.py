@@ -0,0 +1,289 @@
+"""
+Cached, cursor-paginated news feeds: a coin bot's articles (/api/get/news)
+and the top stories (/api/get/allTopStories).
+
+Pages are read newest first with a keyset cursor on (created_at, article_id),
+so a page costs the same whatever its depth, and the images of the whole page
+are loaded with a single selectin query. Each page is cached in Redis under a
+per-coin version number. Committing a new, changed or deleted article of a coin
+bumps its version, so every cached page of that coin is dropped at once and
+the other coins keep theirs.
+
+Top stories are paginated the same way on (created_at, top_story_id). They
+are only written by the Slack top-story action and the delete endpoints,
+which call invalidate_top_stories() after committing.
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event, tuple_
+from sqlalchemy.orm import object_session, selectinload
+from config import Article, CoinBot, Session, TopStory
+from redis_client.redis_client import get_cached_json, redis_client, set_cached_json
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+NEWS_FEED_CACHE_TTL = 300
+COIN_BOT_ID_CACHE_TTL = 24 * 60 * 60
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+TIME_RANGES = ('today', 'this week', 'last month')
+TOP_STORIES_CACHE_TTL = 600
+DEFAULT_TOP_STORIES_PAGE_SIZE = 20
+TOP_STORIES_VERSION_KEY = 'top_stories:version'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _version_key(coin_bot_id: int) -> str:
+    return f"news:feed:version:{coin_bot_id}"
+
+
+def _read_version(key: str) -> int:
+    try:
+        return int(redis_client.get(key) or 0)
+    except Exception as e:
+        logger.warning(f"Cache version read failed for {key}: {str(e)}")
+        return 0
+
+
+def _bump_version(key: str) -> None:
+    try:
+        redis_client.incr(key)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {key}: {str(e)}")
+
+
+def feed_version(coin_bot_id: int) -> int:
+    return _read_version(_version_key(coin_bot_id))
+
+
+def invalidate_news_feed(coin_bot_id: int) -> None:
+    """
+    Drop every cached page of a coin bot's feed.
+    """
+    _bump_version(_version_key(coin_bot_id))
+
+
+def invalidate_top_stories() -> None:
+    """
+    Drop every cached page of the top stories.
+    """
+    _bump_version(TOP_STORIES_VERSION_KEY)
+
+
+def _start_date(time_range: Optional[str]) -> Optional[datetime]:
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if time_range == 'today':
+        return today
+    if time_range == 'this week':
+        return today - timedelta(days=today.weekday())
+    if time_range == 'last month':
+        return today - timedelta(days=today.weekday() + 30)
+    return None
+
+
+def _coin_bot_id(bot_name: str, db_session) -> Optional[int]:
+    name = bot_name.casefold()
+    key = f"news:coin_bot_id:{name}"
+    cached = get_cached_json(key)
+    if cached is not None:
+        return cached
+
+    coin_bot_id = db_session.query(CoinBot.bot_id).filter(CoinBot.name == name).scalar()
+    if coin_bot_id is not None:
+        set_cached_json(key, coin_bot_id, COIN_BOT_ID_CACHE_TTL)
+    return coin_bot_id
+
+
+def _serialize_article(article: Article) -> Dict[str, Any]:
+    return {
+        'article_id': article.article_id,
+        'date': article.date,
+        'title': article.title,
+        'url': article.url,
+        'summary': article.summary,
+        'created_at': article.created_at.isoformat(),
+        'coin_bot_id': article.coin_bot_id,
+        'images': [{
+            'image_id': image.image_id,
+            'image': image.image,
+            'created_at': image.created_at.isoformat(),
+            'article_id': image.article_id
+        } for image in article.images]
+    }
+
+
+def get_news_page(bot_name: str,
+                  time_range: Optional[str] = None,
+                  limit: int = DEFAULT_PAGE_SIZE,
+                  cursor: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    One page of a coin bot's articles, newest first.
+
+    Args:
+        bot_name (str): The coin bot name.
+        time_range (str): 'today', 'this week', 'last month' or None for all time.
+        limit (int): Page size, capped to MAX_PAGE_SIZE.
+        cursor (str): next_cursor of the previous page, None for the first page.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: {'articles': [...], 'next_cursor': str or None} and 200,
+                                    or a message and 204/404.
+
+    Raises:
+        InvalidCursor: If the cursor can't be decoded.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    with Session() as db_session:
+        coin_bot_id = _coin_bot_id(bot_name, db_session)
+        if coin_bot_id is None:
+            return {'error': f'Coin {bot_name} not found'}, 404
+
+        cache_key = f"news:feed:{coin_bot_id}:{feed_version(coin_bot_id)}:{time_range or 'all'}:{limit}:{cursor or ''}"
+        cached = get_cached_json(cache_key)
+        if cached is not None:
+            return cached['data'], cached['status']
+
+        query = (
+            db_session.query(Article)
+            .options(selectinload(Article.images))
+            .filter(Article.coin_bot_id == coin_bot_id)
+        )
+        start_date = _start_date(time_range)
+        if start_date:
+            query = query.filter(Article.created_at >= start_date)
+        if after:
+            query = query.filter(tuple_(Article.created_at, Article.article_id) < after)
+
+        # One row more than the page tells whether there is a next one
+        articles = query.order_by(Article.created_at.desc(), Article.article_id.desc()).limit(limit + 1).all()
+
+    if not articles:
+        result = {'message': f'No articles found for {bot_name}'}, 204
+    else:
+        page = articles[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].article_id) if len(articles) > limit else None
+        result = {'articles': [_serialize_article(article) for article in page], 'next_cursor': next_cursor}, 200
+
+    set_cached_json(cache_key, {'data': result[0], 'status': result[1]}, NEWS_FEED_CACHE_TTL)
+    return result
+
+
+def _serialize_top_story(top_story: TopStory) -> Dict[str, Any]:
+    return {
+        'top_story_id': top_story.top_story_id,
+        'story_date': top_story.story_date,
+        'summary': top_story.summary,
+        'created_at': top_story.created_at.isoformat(),
+        'coin_bot_id': top_story.coin_bot_id,
+        'images': [{
+            'image_id': image.image_id,
+            'image': image.image,
+            'created_at': image.created_at.isoformat(),
+            'top_story_id': image.top_story_id
+        } for image in top_story.images]
+    }
+
+
+def get_top_stories_page(coin: Optional[str] = None,
+                         start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None,
+                         limit: int = DEFAULT_TOP_STORIES_PAGE_SIZE,
+                         cursor: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    One page of top stories, newest first.
+
+    Args:
+        coin (str): Only the stories of this coin bot.
+        start_date (datetime): Only the stories created at or after it.
+        end_date (datetime): Only the stories created before it.
+        limit (int): Page size, capped to MAX_PAGE_SIZE.
+        cursor (str): next_cursor of the previous page, None for the first page.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: {'top_stories': [...], 'next_cursor': str or None} and 200,
+                                    or a message and 204/404.
+
+    Raises:
+        InvalidCursor: If the cursor can't be decoded.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    with Session() as db_session:
+        coin_bot_id = None
+        if coin:
+            coin_bot_id = _coin_bot_id(coin, db_session)
+            if coin_bot_id is None:
+                return {'error': f'Coin {coin} not found'}, 404
+
+        cache_key = ':'.join((
+            'top_stories', str(_read_version(TOP_STORIES_VERSION_KEY)), str(coin_bot_id or 'all'),
+            start_date.isoformat() if start_date else '', end_date.isoformat() if end_date else '',
+            str(limit), cursor or ''
+        ))
+        cached = get_cached_json(cache_key)
+        if cached is not None:
+            return cached['data'], cached['status']
+
+        query = db_session.query(TopStory).options(selectinload(TopStory.images))
+        if coin_bot_id is not None:
+            query = query.filter(TopStory.coin_bot_id == coin_bot_id)
+        if start_date:
+            query = query.filter(TopStory.created_at >= start_date)
+        if end_date:
+            query = query.filter(TopStory.created_at < end_date)
+        if after:
+            query = query.filter(tuple_(TopStory.created_at, TopStory.top_story_id) < after)
+
+        top_stories = query.order_by(TopStory.created_at.desc(), TopStory.top_story_id.desc()).limit(limit + 1).all()
+
+    if not top_stories:
+        result = {'top_stories': 'No top stories found'}, 204
+    else:
+        page = top_stories[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].top_story_id) if len(top_stories) > limit else None
+        result = {'top_stories': [_serialize_top_story(top_story) for top_story in page], 'next_cursor': next_cursor}, 200
+
+    set_cached_json(cache_key, {'data': result[0], 'status': result[1]}, TOP_STORIES_CACHE_TTL)
+    return result
+
+
+# Versions are bumped once the article is committed, so a page can't be cached
+# from the old rows under the new version in between
+@event.listens_for(Article, 'after_insert')
+@event.listens_for(Article, 'after_update')
+@event.listens_for(Article, 'after_delete')
+def _mark_news_feed_changed(mapper, connection, target):
+    db_session = object_session(target)
+    if db_session is not None and target.coin_bot_id is not None:
+        db_session.info.setdefault('news_feed_changed', set()).add(target.coin_bot_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_news_feeds(db_session):
+    for coin_bot_id in db_session.info.pop('news_feed_changed', ()):
+        invalidate_news_feed(coin_bot_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_news_feeds(db_session):
+    db_session.info.pop('news_feed_changed', None)
@@ -0,0 +1,620 @@
+"""
+Asynchronous news scraping engine.
+
+A category sweep runs as a pipeline of four stages connected by asyncio queues:
+
+    discover -> fetch -> validate -> persist
+
+- discover: fetches each site's listing page with a conditional GET (ETag /
+  Last-Modified remembered in Redis, so unchanged listings cost a 304) and
+  registers the new links in AnalyzedArticle.
+- fetch: downloads the article pages with httpx, bounded by a global
+  connection pool, a per-domain concurrency limit and a per-domain minimum
+  interval between requests.
+- validate: runs the site validator from routes/news_bot/sites on the
+  already downloaded response, in a worker thread.
+- persist: summarizes, stores the Article and Used_keywords rows and posts
+  the Slack message. Near-duplicates of a recent article of the same coin
+  bot are attached to it as alternate sources instead (near_duplicates).
+
+run_scraping_sweep(category_name) is the synchronous entry point for the
+scheduler and replaces the sequential start_periodic_scraping loop.
+"""
+
+import time
+import asyncio
+import hashlib
+import datetime
+from dataclasses import dataclass, field
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+import httpx
+from bs4 import BeautifulSoup
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from config import AnalyzedArticle, Article, Category, CoinBot, Session, Used_keywords
+from redis_client.redis_client import redis_client
+from routes.news_bot.near_duplicates import attach_alternate_source, find_near_duplicate, lock_clusters
+from routes.news_bot.summarizer import summary_generator
+from routes.news_bot.validations import find_analyzed_article, title_in_blacklist, title_in_db, url_in_db
+from routes.news_bot.sites.ambcrypto import validate_ambcrypto_article
+from routes.news_bot.sites.beincrypto import validate_beincrypto_article
+from routes.news_bot.sites.bitcoinist import validate_bitcoinist_article
+from routes.news_bot.sites.blockworks import validate_blockworks_article
+from routes.news_bot.sites.coincodex import validate_coincodex_article
+from routes.news_bot.sites.coindesk import validate_coindesk_article
+from routes.news_bot.sites.coingape import validate_coingape_article
+from routes.news_bot.sites.coinpedia import validate_coinpedia_article
+from routes.news_bot.sites.cointelegraph import validate_cointelegraph_article
+from routes.news_bot.sites.criptonews import validate_cryptonews_article
+from routes.news_bot.sites.cryptodaily import validate_cryptodaily_article
+from routes.news_bot.sites.cryptopotato import validate_cryptopotato_article
+from routes.news_bot.sites.cryptoslate import validate_cryptoslate_article
+from routes.news_bot.sites.dailyhodl import validate_dailyhodl_article
+from routes.news_bot.sites.decrypto import validate_decrypt_article
+from routes.news_bot.sites.googlenews import validate_google_news_article
+from routes.news_bot.sites.investing import validate_investing_article
+from routes.news_bot.sites.theblock import validate_theblock_article
+from routes.news_bot.sites.utoday import validate_utoday_article
+from routes.slack.templates.news_message import send_NEWS_message_to_slack
+from utils.fingerprint import simhash
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+GLOBAL_CONCURRENCY = 32
+PER_DOMAIN_CONCURRENCY = 2
+# Minimum time between two request starts on the same domain
+PER_DOMAIN_MIN_INTERVAL = 0.5
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+VALIDATE_WORKERS = 8
+# Summaries are paced by the OpenAI gateway's rate limits, not by the number of persist workers
+PERSIST_WORKERS = 16
+MAX_GOOGLE_NEWS_LINKS = 30
+LISTING_VALIDATORS_TTL = 24 * 60 * 60
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
+}
+
+SITE_VALIDATORS: Dict[str, Callable] = {
+    'Ambcrypto': validate_ambcrypto_article,
+    'Beincrypto': validate_beincrypto_article,
+    'Bitcoinist': validate_bitcoinist_article,
+    'Blockworks': validate_blockworks_article,
+    'Coincodex': validate_coincodex_article,
+    'Coindesk': validate_coindesk_article,
+    'Coingape': validate_coingape_article,
+    'Coinpedia': validate_coinpedia_article,
+    'Cointelegraph': validate_cointelegraph_article,
+    'Cryptonews': validate_cryptonews_article,
+    'Cryptodaily': validate_cryptodaily_article,
+    'Cryptopotato': validate_cryptopotato_article,
+    'Cryptoslate': validate_cryptoslate_article,
+    'Dailyhodl': validate_dailyhodl_article,
+    'Decrypt': validate_decrypt_article,
+    'Google News': validate_google_news_article,
+    'Investing': validate_investing_article,
+    'Theblock': validate_theblock_article,
+    'Utoday': validate_utoday_article,
+}
+
+# Link prefixes accepted on the listing pages of the direct (non Google News) sources
+ARTICLE_LINK_PREFIXES = (
+    "/news", "/article", "/post",
+    "https://cointelegraph.com",
+    "https://beincrypto.com",
+    "https://bitcoinist.com",
+    "https://coingape.com/markets",
+    "https://www.coingape.com/markets",
+    "https://www.coindesk.com/markets/",
+    "https://www.coindesk.com/tech",
+    "https://www.coindesk.com/consensus-magazine",
+    "https://www.coindesk.com/business",
+    "https://www.cryptonews.net",
+    "https://cryptoslate.com",
+    "https://cryptopotato.com",
+    "https://www.theblock.co/news",
+    "https://blockworks.co/news",
+    "https://cryptodaily.co.uk/20",
+    "https://dailyhodl.com",
+    "https://cryptonews.net",
+    "https://www.investing.com/news/cryptocurrency-news",
+    "https://u.today",
+    "https://blockworks.co",
+    "https://www.theblock.co/post",
+    "https://theblock.co/post",
+    "https://coinpedia.org/news",
+    "https://coinpedia.org/press-release",
+    "https://coinpedia.org/guest-post",
+    "https://ambcrypto.com",
+    "https://coincodex.com",
+)
+
+# Sources we don't want Google News articles from
+GOOGLE_NEWS_BLACKLIST = (
+    'https://tech-gate.org', 'https://medium.com/', 'https://learn.bybit.com', 'https://www.roubaixxl.fr/',
+    'https://cryptonews.com/editors/sead-fadilpasic', 'https://uk.movies.yahoo.com',
+)
+
+CATEGORY_KEYWORDS = {
+    'bitcoin': ['bitcoin', 'btc'],
+    'ethereum': ['ethereum', 'ether', 'eth'],
+}
+
+btc_slack_channel_id = 'C05RK7CCDEK'
+eth_slack_channel_id = 'C05URLDF3JP'
+hacks_slack_channel_id = 'C05UU8JBKKN'
+layer_1_lmc_slack_channel_id = 'C05URM66B5Z'
+layer_0_slack_channel_id = 'C05URM3UY8K'
+layer_2_slack_channel = 'C05UB8G8B0F'
+layer_1_mmc_slack_channel_id = 'C067ZA4GGNM'
+cross_border_payment_slack_channel = 'C067P4CNC92'
+lsd_slack_channel_id = 'C05UNS3M8R3'
+oracles_slack_channel = 'C0600Q7UPS4'
+defi_slack_channel = 'C067P43P8MA'
+defi_perpetual_slack_channel = 'C05UU8EKME0'
+defi_others_slack_channel = 'C067HNE4V0D'
+ai_slack_channel = 'C067E1LJYKY'
+
+SLACK_CHANNELS = {
+    'btc': btc_slack_channel_id,
+    'eth': eth_slack_channel_id,
+    'hacks': hacks_slack_channel_id,
+    'ldo': lsd_slack_channel_id,
+    'rpl': lsd_slack_channel_id,
+    'fxs': lsd_slack_channel_id,
+    'atom': layer_0_slack_channel_id,
+    'dot': layer_0_slack_channel_id,
+    'qnt': layer_0_slack_channel_id,
+    'ada': layer_1_lmc_slack_channel_id,
+    'sol': layer_1_lmc_slack_channel_id,
+    'avax': layer_1_lmc_slack_channel_id,
+    'near': layer_1_mmc_slack_channel_id,
+    'ftm': layer_1_mmc_slack_channel_id,
+    'kas': layer_1_mmc_slack_channel_id,
+    'matic': layer_2_slack_channel,
+    'arb': layer_2_slack_channel,
+    'op': layer_2_slack_channel,
+    'link': oracles_slack_channel,
+    'api3': oracles_slack_channel,
+    'band': oracles_slack_channel,
+    'xlm': cross_border_payment_slack_channel,
+    'algo': cross_border_payment_slack_channel,
+    'xrp': cross_border_payment_slack_channel,
+    'dydx': defi_perpetual_slack_channel,
+    'velo': defi_perpetual_slack_channel,
+    'gmx': defi_perpetual_slack_channel,
+    'uni': defi_slack_channel,
+    'sushi': defi_slack_channel,
+    'cake': defi_slack_channel,
+    'aave': defi_others_slack_channel,
+    'pendle': defi_others_slack_channel,
+    '1inch': defi_others_slack_channel,
+    'ocean': ai_slack_channel,
+    'fet': ai_slack_channel,
+    'rndr': ai_slack_channel,
+}
+
+
+@dataclass
+class SiteSource:
+    """A listing page to sweep, detached from the DB session."""
+    site_name: str
+    data_source_url: str
+    base_url: str
+    main_container: Optional[str]
+    bot_name: str
+    coin_bot_id: int
+
+
+@dataclass
+class ArticleJob:
+    """An article link travelling through the pipeline."""
+    source: SiteSource
+    url: str
+    link_title: str
+    response: Any = None
+    article: Dict[str, Any] = field(default_factory=dict)
+
+
+class DomainLimiter:
+    """
+    Per-domain politeness: at most `concurrency` requests in flight per domain
+    and at least `min_interval` seconds between two request starts.
+    """
+
+    def __init__(self, concurrency: int = PER_DOMAIN_CONCURRENCY, min_interval: float = PER_DOMAIN_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._semaphores = defaultdict(lambda: asyncio.Semaphore(concurrency))
+        self._locks = defaultdict(asyncio.Lock)
+        self._next_start: Dict[str, float] = defaultdict(float)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        domain = urlparse(url).netloc.lower()
+        async with self._semaphores[domain]:
+            async with self._locks[domain]:
+                loop = asyncio.get_running_loop()
+                wait = self._next_start[domain] - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[domain] = loop.time() + self.min_interval
+            yield
+
+
+def _validators_key(url: str) -> str:
+    return f"scrape:validators:{hashlib.sha1(url.encode()).hexdigest()}"
+
+
+def _conditional_headers(url: str) -> Dict[str, str]:
+    stored = redis_client.hgetall(_validators_key(url))
+    headers = {}
+    if stored.get('etag'):
+        headers['If-None-Match'] = stored['etag']
+    if stored.get('last_modified'):
+        headers['If-Modified-Since'] = stored['last_modified']
+    return headers
+
+
+def _store_validators(url: str, response: httpx.Response) -> None:
+    validators = {
+        'etag': response.headers.get('ETag', ''),
+        'last_modified': response.headers.get('Last-Modified', ''),
+    }
+    if validators['etag'] or validators['last_modified']:
+        key = _validators_key(url)
+        redis_client.hset(key, mapping=validators)
+        redis_client.expire(key, LISTING_VALIDATORS_TTL)
+
+
+def _load_sources(category_name: str) -> List[SiteSource]:
+    with Session() as session:
+        category = (
+            session.query(Category)
+            .options(joinedload(Category.coin_bot).joinedload(CoinBot.sites))
+            .filter(Category.name == category_name)
+            .first()
+        )
+        if not category:
+            return []
+        return [
+            SiteSource(
+                site_name=site.site_name,
+                data_source_url=site.data_source_url,
+                base_url=site.base_url or '',
+                main_container=site.main_container,
+                bot_name=coin_bot.name,
+                coin_bot_id=coin_bot.bot_id
+            )
+            for coin_bot in category.coin_bot
+            for site in coin_bot.sites
+        ]
+
+
+def _is_google_news(source: SiteSource) -> bool:
+    return urlparse(source.data_source_url).netloc == 'news.google.com'
+
+
+def extract_links(source: SiteSource, html: str) -> List[Tuple[str, str]]:
+    """
+    Extract the (url, casefolded title) article links of a listing page.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    container = soup
+    if source.main_container and source.main_container != "None":
+        container = soup.select_one(source.main_container) or soup
+
+    google_news = _is_google_news(source)
+    links, seen = [], set()
+    for anchor in container.find_all('a', href=True):
+        href = anchor['href'].strip()
+        title = anchor.get_text(strip=True).casefold()
+        if not href or not title:
+            continue
+
+        if google_news:
+            url = urljoin(source.data_source_url, href)
+            if not url.startswith('https://news.google.com/articles') and not url.startswith('https://news.google.com/read'):
+                continue
+        else:
+            if not href.startswith(ARTICLE_LINK_PREFIXES):
+                continue
+            url = href if href.startswith('http') else source.base_url + href
+
+        if url not in seen:
+            seen.add(url)
+            links.append((url, title))
+            if google_news and len(links) >= MAX_GOOGLE_NEWS_LINKS:
+                break
+    return links
+
+
+def register_links(source: SiteSource, category_name: str, links: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Record the links in AnalyzedArticle and keep the ones that pass the title/URL pre-checks.
+    """
+    keywords = CATEGORY_KEYWORDS.get(category_name)
+    accepted = []
+    with Session() as session:
+        for url, title in links:
+            normalized_url = url.casefold().strip()
+            existing = find_analyzed_article(normalized_url, session)
+            if existing and existing.is_analyzed:
+                continue
+            if not existing:
+                # A concurrent sweep may register the same URL first (unique url_hash):
+                # only this row's savepoint is rolled back, the rest of the batch goes on
+                try:
+                    with session.begin_nested():
+                        session.add(AnalyzedArticle(source=source.site_name, url=normalized_url, is_analyzed=False))
+                    session.commit()
+                except IntegrityError:
+                    logger.info(f"{normalized_url} was registered by another sweep")
+
+            if title_in_blacklist(title, session) or url_in_db(normalized_url, session) or title_in_db(title, session):
+                continue
+            if keywords and not any(keyword in title for keyword in keywords):
+                continue
+            accepted.append((url, title))
+    return accepted
+
+
+def validate_article(job: ArticleJob) -> Optional[Dict[str, Any]]:
+    """
+    Run the site validator on the downloaded response.
+
+    Returns:
+        Optional[Dict[str, Any]]: title, content, date, image_urls and matched_keywords, or None if rejected.
+    """
+    validator = SITE_VALIDATORS.get(job.source.site_name)
+    if validator is None:
+        return None
+
+    with Session() as session:
+        result = validator(job.url, job.source.bot_name, session, article_response=job.response)
+
+    # Some validators return None instead of an empty tuple when they reject the article
+    if not result:
+        return None
+    if len(result) == 3:
+        title, content, matched_keywords = result
+        date, image_urls = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'), []
+    else:
+        title, content, date, image_urls, matched_keywords = result
+
+    if not (title and content and date):
+        return None
+    return {
+        'title': title,
+        'content': content,
+        'date': date,
+        'image_urls': list(image_urls or []),
+        'matched_keywords': matched_keywords,
+    }
+
+
+def _cluster(job: ArticleJob, fingerprint: Optional[int], session) -> bool:
+    duplicate = find_near_duplicate(fingerprint, job.source.coin_bot_id, session)
+    if duplicate is None:
+        return False
+
+    article_id, distance = duplicate
+    attach_alternate_source(article_id, job.url, job.article['title'], fingerprint, distance, session)
+    logger.info(f"{job.url} is a copy of article {article_id} ({distance} bits), attached as a source")
+    return True
+
+
+def persist_article(job: ArticleJob, category_name: str) -> Optional[str]:
+    """
+    Summarize and store a validated article, then post it to its Slack channel.
+
+    Returns:
+        Optional[str]: 'saved', 'clustered' if it was attached to a recent copy
+                       of the same story, or None if it could not be summarized.
+    """
+    article = job.article
+    fingerprint = simhash(article['content'])
+    with Session() as session:
+        if _cluster(job, fingerprint, session):
+            return 'clustered'
+
+    summary = summary_generator(article['content'], category_name)
+    if not summary:
+        logger.info(f"No summary available for {job.url}")
+        return None
+
+    matched_keywords = article['matched_keywords']
+    matched_keywords_string = ', '.join(sorted(matched_keywords)) if matched_keywords else 'No keywords found.'
+
+    with Session() as session:
+        # Another worker may have saved a copy while this one was being summarized
+        lock_clusters(job.source.coin_bot_id, session)
+        if _cluster(job, fingerprint, session):
+            return 'clustered'
+
+        new_article = Article(
+            title=article['title'],
+            summary=summary,
+            simhash=fingerprint,
+            date=article['date'],
+            url=job.url,
+            coin_bot_id=job.source.coin_bot_id
+        )
+        session.add(new_article)
+        session.flush()
+        session.add(Used_keywords(
+            article_id=new_article.article_id,
+            article_content=summary,
+            article_date=article['date'],
+            article_url=job.url,
+            keywords=matched_keywords_string,
+            source=job.url.split(".com")[0],
+            coin_bot_id=job.source.coin_bot_id
+        ))
+        session.commit()
+
+    channel_id = SLACK_CHANNELS.get(job.source.bot_name)
+    if channel_id:
+        send_NEWS_message_to_slack(channel_id=channel_id,
+                                   title=article['title'],
+                                   date_time=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                   url=job.url,
+                                   summary=summary,
+                                   image=article['image_urls'][0] if article['image_urls'] else 'No image',
+                                   category_name=category_name,
+                                   extra_info=matched_keywords_string
+                                   )
+    return 'saved'
+
+
+class ScrapingEngine:
+    """
+    One category sweep: the discover -> fetch -> validate -> persist pipeline.
+    """
+
+    def __init__(self,
+                 category_name: str,
+                 global_concurrency: int = GLOBAL_CONCURRENCY,
+                 validate_workers: int = VALIDATE_WORKERS,
+                 persist_workers: int = PERSIST_WORKERS):
+        self.category_name = category_name
+        self.global_concurrency = global_concurrency
+        self.validate_workers = validate_workers
+        self.persist_workers = persist_workers
+        self.limiter = DomainLimiter()
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    async def _get(self, client: httpx.AsyncClient, url: str, conditional: bool = False) -> Optional[httpx.Response]:
+        request_headers = await asyncio.to_thread(_conditional_headers, url) if conditional else {}
+        try:
+            async with self.limiter.slot(url), self._global_slots:
+                response = await client.get(url, headers=request_headers)
+        except httpx.HTTPError as e:
+            self.stats['fetch_errors'] += 1
+            logger.warning(f"Request to {url} failed: {str(e)}")
+            return None
+
+        if conditional and response.status_code == 200:
+            await asyncio.to_thread(_store_validators, url, response)
+        return response
+
+    async def _discover(self, client: httpx.AsyncClient, source: SiteSource) -> None:
+        response = await self._get(client, source.data_source_url, conditional=True)
+        if response is None:
+            return
+        if response.status_code == 304:
+            self.stats['listings_unchanged'] += 1
+            return
+        if response.status_code != 200:
+            self.stats['fetch_errors'] += 1
+            return
+
+        self.stats['listings_fetched'] += 1
+        links = extract_links(source, response.text)
+        accepted = await asyncio.to_thread(register_links, source, self.category_name, links)
+        self.stats['links_found'] += len(links)
+        for url, title in accepted:
+            await self._fetch_queue.put(ArticleJob(source=source, url=url, link_title=title))
+
+    async def _fetch_worker(self, client: httpx.AsyncClient) -> None:
+        while True:
+            job = await self._fetch_queue.get()
+            try:
+                response = await self._get(client, job.url)
+                if response is None:
+                    continue
+                final_url = str(response.url)
+                if _is_google_news(job.source) and final_url.startswith(GOOGLE_NEWS_BLACKLIST):
+                    continue
+                job.url, job.response = final_url, response
+                self.stats['articles_fetched'] += 1
+                await self._validate_queue.put(job)
+            finally:
+                self._fetch_queue.task_done()
+
+    async def _validate_worker(self) -> None:
+        while True:
+            job = await self._validate_queue.get()
+            try:
+                article = await asyncio.to_thread(validate_article, job)
+                if article:
+                    job.article = article
+                    job.response = None
+                    self.stats['articles_validated'] += 1
+                    await self._persist_queue.put(job)
+            except Exception as e:
+                logger.warning(f"Validation of {job.url} failed: {str(e)}")
+            finally:
+                self._validate_queue.task_done()
+
+    async def _persist_worker(self) -> None:
+        while True:
+            job = await self._persist_queue.get()
+            try:
+                status = await asyncio.to_thread(persist_article, job, self.category_name)
+                if status:
+                    self.stats[f'articles_{status}'] += 1
+            except Exception as e:
+                logger.warning(f"Saving {job.url} failed: {str(e)}")
+            finally:
+                self._persist_queue.task_done()
+
+    async def run(self) -> Dict[str, int]:
+        """
+        Sweep every site of every coin bot of the category.
+
+        Returns:
+            Dict[str, int]: Counters for each stage plus the elapsed milliseconds.
+        """
+        start = time.monotonic()
+        sources = await asyncio.to_thread(_load_sources, self.category_name)
+
+        self._global_slots = asyncio.Semaphore(self.global_concurrency)
+        self._fetch_queue: asyncio.Queue = asyncio.Queue()
+        self._validate_queue: asyncio.Queue = asyncio.Queue(maxsize=self.validate_workers * 4)
+        self._persist_queue: asyncio.Queue = asyncio.Queue()
+
+        limits = httpx.Limits(max_connections=self.global_concurrency, max_keepalive_connections=self.global_concurrency)
+        async with httpx.AsyncClient(headers=HEADERS, timeout=REQUEST_TIMEOUT, limits=limits,
+                                     follow_redirects=True) as client:
+            workers = (
+                [asyncio.create_task(self._fetch_worker(client)) for _ in range(self.global_concurrency)]
+                + [asyncio.create_task(self._validate_worker()) for _ in range(self.validate_workers)]
+                + [asyncio.create_task(self._persist_worker()) for _ in range(self.persist_workers)]
+            )
+            try:
+                results = await asyncio.gather(*(self._discover(client, source) for source in sources),
+                                               return_exceptions=True)
+                for source, result in zip(sources, results):
+                    if isinstance(result, Exception):
+                        self.stats['discover_errors'] += 1
+                        logger.warning(f"Discovering {source.data_source_url} failed: {str(result)}")
+                await self._fetch_queue.join()
+                await self._validate_queue.join()
+                await self._persist_queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        self.stats['sites'] = len(sources)
+        self.stats['elapsed_ms'] = int((time.monotonic() - start) * 1000)
+        return dict(self.stats)
+
+
+def run_scraping_sweep(category_name: str) -> Tuple[str, int]:
+    """
+    Scheduler entry point: run one sweep of a category to completion.
+
+    Returns:
+        Tuple[str, int]: A message and an HTTP-like status code, as start_periodic_scraping did.
+    """
+    stats = asyncio.run(ScrapingEngine(category_name).run())
+    if not stats.get('sites'):
+        return f"No sites found for category: {category_name}", 404
+
+    logger.info(f"{category_name} sweep finished: {stats}")
+    return f'All {category_name.capitalize()} sites were analized', 200
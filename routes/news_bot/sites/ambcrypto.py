@@ -1,8 +1,7 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from config import AnalyzedArticle as ANALIZED_ARTICLE
-from routes.news_bot.validations import validate_content, title_in_blacklist, title_in_db, url_in_db, find_matched_keywords
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, title_in_db, url_in_db, find_analyzed_article
 
 def validate_date_ambcrypto(date_text):
     try:
@@ -17,44 +16,7 @@ def validate_date_ambcrypto(date_text):
         print("Error proccessing date in Ambcrypto" + str(e))
         return None
 
-def extract_image_urls_ambcrypto(soup):
-
-    try:
-        image_urls = []
-        base_url = "https://statics.ambcrypto.com/wp-content/"
-
-        img_elements = soup.find_all('img')
-
-        for img in img_elements:
-            src = img.get('src')
-
-            if src and src.startswith(base_url):
-                image_urls.append(src)
-        return image_urls
-    
-    except Exception as e:
-        print('Error proccessing the images in Ambcrypto' + str(e))
-        return []
-
-def extract_article_content_ambcrypto(html):
-
-    try:
-        title_element = html.find('h1')
-        title = title_element.text.strip() if title_element else None
-
-        content = ""
-        content_paragraphs = html.find_all('p')
-
-        for paragraph in content_paragraphs:
-            content += paragraph.text.strip()
-
-        return title, content
-
-    except Exception as e:
-        print('Error proccessing title and content in Ambcrypto', str(e))
-        return None, None
-
-def validate_ambcrypto_article(article_link, main_keyword, session_instance):
+def validate_ambcrypto_article(article_link, main_keyword, session_instance, article_response=None):
 
     normalized_article_url = article_link.strip().casefold()
 
@@ -63,18 +25,18 @@ def validate_ambcrypto_article(article_link, main_keyword, session_instance):
     }
 
     try:
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            html = BeautifulSoup(article_response.text, 'html.parser')
-
-            title, content = extract_article_content_ambcrypto(html)
+            page = parse_article(article_response.text, 'Ambcrypto')
+            title, content = page.title, page.content
             
             # These three following lines changes the status of the article to ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -83,21 +45,18 @@ def validate_ambcrypto_article(article_link, main_keyword, session_instance):
             try:
                 if title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
 
-                        date_element = html.find('time')
-                        date_text = date_element.text.strip() if date_element else None
-                        valid_date = validate_date_ambcrypto(date_text)
+                        valid_date = validate_date_ambcrypto(page.date)
                         
-                        image_urls = extract_image_urls_ambcrypto(html)
+                        image_urls = page.images
                     
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
 
                     return None, None, None, None, None
@@ -1,7 +1,6 @@
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
-from config import AnalyzedArticle as ANALIZED_ARTICLE
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 import requests
 import re
 
@@ -28,24 +27,7 @@ def validate_date_beincrypto(date):
         return None
 
 
-def extract_image_urls(soup):
-
-    try:
-        image_urls = []
-        img_elements = soup.find_all('img')
-        
-        for img in img_elements:
-            src = img.get('src')
-            if src and src.startswith('https://s32679.pcdn.co/'):
-                image_urls.append(src)
-        return image_urls
-    
-    except Exception as e:
-        print("Error extracting images in Beincrypto", str(e))
-        return []
-
-
-def validate_beincrypto_article(article_link, main_keyword, session_instance):
+def validate_beincrypto_article(article_link, main_keyword, session_instance, article_response=None):
 
     normalized_article_url = article_link.strip().casefold()
     
@@ -54,27 +36,18 @@ def validate_beincrypto_article(article_link, main_keyword, session_instance):
         }
     
     try:
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower() 
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-
-            # title
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None
-
-
-            # content
-            content = ""
-            all_p_elements = article_soup.findAll("p")
-            for el in all_p_elements:
-                content += el.text.lower()
+            page = parse_article(article_response.text, 'Beincrypto')
+            title, content = page.title, page.content
 
             # These three following lines changes the status of the article to ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -83,7 +56,7 @@ def validate_beincrypto_article(article_link, main_keyword, session_instance):
             try:
                 if title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
@@ -91,16 +64,10 @@ def validate_beincrypto_article(article_link, main_keyword, session_instance):
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
 
-                        # get date and extract it
-                        date_time_element = article_soup.find('time')
-                        date = date_time_element['datetime'].strip() if date_time_element and 'datetime' in date_time_element.attrs else None
-                        valid_date = validate_date_beincrypto(date)
-
-                        # Extract images
-                        image_urls = extract_image_urls(article_soup)
+                        valid_date = validate_date_beincrypto(page.date)
+                        image_urls = page.images
                        
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
@@ -1,20 +1,15 @@
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
-from config import AnalyzedArticle as ANALIZED_ARTICLE
-from bs4 import BeautifulSoup
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 import requests
 
-def validate_date_bitcoinist(html):
+def validate_date_bitcoinist(date_text):
 
     try:  
-        date_div = html.find('div', class_='jeg_meta_date')
-
-        if date_div:
-            date_link = date_div.find('a')
-            if date_link:
-                date_text = date_link.text.lower()
+        if date_text:
+            date_text = date_text.lower()
                 
-                if "hours ago" in date_text:
-                    return date_text
+            if "hours ago" in date_text:
+                return date_text
 
         return False
     
@@ -23,26 +18,7 @@ def validate_date_bitcoinist(html):
         return False
 
 
-def extract_image_urls(soup):
-
-    try:
-        image_urls = []
-        img_elements = soup.find_all('img')
-
-        for img in img_elements:
-            src = img.get('src')
-
-            if src and src.startswith('https://bitcoinist.com/wp-content/uploads/'):
-                image_urls.append(src)
-
-        return image_urls
-    
-    except Exception as e:
-        print("Error extracting images in Bitcoinist", str(e))
-        return []
-
-
-def validate_bitcoinist_article(article_link, main_keyword, session_instance):
+def validate_bitcoinist_article(article_link, main_keyword, session_instance, article_response=None):
 
     normalized_article_url = article_link.strip().casefold()
 
@@ -52,26 +28,18 @@ def validate_bitcoinist_article(article_link, main_keyword, session_instance):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
             }
         
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower() 
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-
-
-            #Firstly extract the title and content
-            content = ""
-            a_elements = article_soup.find_all("p")
-            for a in a_elements:
-                content += a.text.strip()
-
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None
+            page = parse_article(article_response.text, 'Bitcoinist')
+            title, content = page.title, page.content
 
             # These three following lines changes the status of the article to ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -80,19 +48,18 @@ def validate_bitcoinist_article(article_link, main_keyword, session_instance):
             try:
                 if title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
-                        valid_date = validate_date_bitcoinist(article_soup)
+                        valid_date = validate_date_bitcoinist(page.date)
 
                         # Extract image URLs from the article
-                        image_urls = extract_image_urls(article_soup)
+                        image_urls = page.images
                         
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
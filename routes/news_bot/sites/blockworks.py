@@ -1,14 +1,13 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from config import AnalyzedArticle as ANALIZED_ARTICLE
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
 
 def validate_date_blockworks(date_text):
 
     try:
-        date = datetime.fromisoformat(date_text['datetime'])
+        date = datetime.fromisoformat(date_text)
         current_time = datetime.now(date.tzinfo)
         time_difference = current_time - date
 
@@ -21,17 +20,14 @@ def validate_date_blockworks(date_text):
         print("Error proccessing date in Blockworks", str(e))
         return None
 
-def extract_image_url_blockworks(html):
+def extract_image_url_blockworks(srcset):
 
     try:
-        image = html.find('img')
-        if image:
-            srcset = image.get('srcset')
-            if srcset:
-                parts = srcset.split()
-                for i in range(0, len(parts), 2):
-                    if parts[i].startswith("https://blockworks-co.imgix.net/"):
-                        return parts[i]
+        if srcset:
+            parts = srcset.split()
+            for i in range(0, len(parts), 2):
+                if parts[i].startswith("https://blockworks-co.imgix.net/"):
+                    return parts[i]
         return None
     
     except Exception as e:
@@ -39,7 +35,7 @@ def extract_image_url_blockworks(html):
         return None
 
 
-def validate_blockworks_article(article_link, main_keyword, session_instance):
+def validate_blockworks_article(article_link, main_keyword, session_instance, article_response=None):
 
     normalized_article_url = article_link.strip().casefold()
 
@@ -48,25 +44,18 @@ def validate_blockworks_article(article_link, main_keyword, session_instance):
     }
 
     try:
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-
-            #Firstly extract the title and content
-            content = ""
-            a_elements = article_soup.find_all("p")
-            for a in a_elements:
-                content += a.text.strip()
-
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None
+            page = parse_article(article_response.text, 'Blockworks')
+            title, content = page.title, page.content
 
              # These three following lines changes the status of the article to ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -75,7 +64,7 @@ def validate_blockworks_article(article_link, main_keyword, session_instance):
             try:
                 if title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
@@ -84,14 +73,12 @@ def validate_blockworks_article(article_link, main_keyword, session_instance):
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
 
                         # Extract date
-                        date_element = article_soup.find('time')
-                        valid_date = validate_date_blockworks(date_element)
+                        valid_date = validate_date_blockworks(page.date)
 
                         # Extract image URL
-                        image_urls = extract_image_url_blockworks(article_soup)
+                        image_urls = extract_image_url_blockworks(page.images)
                        
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
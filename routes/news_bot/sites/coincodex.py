@@ -1,15 +1,12 @@
-from bs4 import BeautifulSoup
 import requests
 from datetime import datetime, timedelta
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
-from config import AnalyzedArticle as ANALIZED_ARTICLE
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
-def validate_date_coincodex(article_soup):
+def validate_date_coincodex(date_text):
     try:
-        # Find the time element containing the datetime attribute
-        time_element = article_soup.find('time')
-        if time_element and 'datetime' in time_element.attrs:
-            date_text = time_element['datetime']
+        # date_text is the datetime attribute of the time element
+        if date_text:
             date = datetime.strptime(date_text, '%Y-%m-%d %H:%M:%S')
             current_time = datetime.now()
             time_difference = current_time - date
@@ -21,24 +18,21 @@ def validate_date_coincodex(article_soup):
 
 
 
-def extract_image_url_coincodex(base_url, article_soup):
+def extract_image_url_coincodex(base_url, src):
     try:
-        image_element = article_soup.find('img', class_='img-fluid loaded')
-        if image_element:
-            src = image_element.get('src')
-            if src:
-                # Check if the URL is already an absolute URL
-                if src.startswith(('http:', 'https:')):
-                    return src
-                # If not, join it with the base URL
-                return base_url + src
+        if src:
+            # Check if the URL is already an absolute URL
+            if src.startswith(('http:', 'https:')):
+                return src
+            # If not, join it with the base URL
+            return base_url + src
     except Exception as e:
         print("Error in extract_image_url_coincodex:", str(e))
     return None
 
 
 
-def validate_coincodex_article(article_link, main_keyword, session_instance):
+def validate_coincodex_article(article_link, main_keyword, session_instance, article_response=None):
     normalized_article_url = article_link.strip().casefold()
 
     try:
@@ -46,25 +40,17 @@ def validate_coincodex_article(article_link, main_keyword, session_instance):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
         }
 
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
+            page = parse_article(article_response.text, 'Coincodex')
+            title, content = page.title, page.content
 
-            #Firstly extract the title and content
-
-            content = ""
-            a_elements = article_soup.find_all("p")
-            for a in a_elements:
-                content += a.text.strip()
-
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None
-
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             if is_url_analized:
                 is_url_analized.is_analyzed = True
                 session_instance.commit()
@@ -73,19 +59,18 @@ def validate_coincodex_article(article_link, main_keyword, session_instance):
             try:
                 if title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
 
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
-                        valid_date = validate_date_coincodex(article_soup)
+                        valid_date = validate_date_coincodex(page.date)
                         
-                        image_urls = extract_image_url_coincodex("https://coincodex.com/en/resources/images/", article_soup)
+                        image_urls = extract_image_url_coincodex("https://coincodex.com/en/resources/images/", page.images)
 
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
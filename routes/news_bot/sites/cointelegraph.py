@@ -1,9 +1,8 @@
 import re
 import requests
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
-from config import AnalyzedArticle as ANALIZED_ARTICLE
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
 
 def validate_date_cointelegraph(date):
@@ -27,30 +26,23 @@ def validate_date_cointelegraph(date):
 
         
 
-def extract_image_urls(html):
+def extract_image_urls(image_source):
+    # image_source is the srcset of the first image, or its src when it has none
     try:
         image_urls = []
-        soup = BeautifulSoup(html, 'html.parser')
-        img_elements = soup.find_all('img')
-
-        for img in img_elements:
-            srcset = img.get('srcset')
-            src = img.get('src')
-
-            if srcset:
-                srcset_parts = srcset.split(',')
-                largest_img_url = srcset_parts[-1].strip().split(' ')[-1]
-                image_urls.append(largest_img_url)
-            elif src and not src.startswith('data:'):
-                image_urls.append(src)
-            return image_urls
+
+        if image_source and not image_source.startswith('data:'):
+            srcset_parts = image_source.split(',')
+            largest_img_url = srcset_parts[-1].strip().split(' ')[0]
+            image_urls.append(largest_img_url)
+        return image_urls
     except Exception as e:
         print("Error in Cointelegraph:", str(e))
         return None
 
     
 
-def validate_cointelegraph_article(article_link, main_keyword, session_instance):
+def validate_cointelegraph_article(article_link, main_keyword, session_instance, article_response=None):
 
     try:
 
@@ -58,21 +50,15 @@ def validate_cointelegraph_article(article_link, main_keyword, session_instance)
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
             }
    
-        article_response = requests.get(article_link, headers=headers)
+        if article_response is None:
+            article_response = requests.get(article_link, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower() 
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None 
-
-            content = "" 
-            all_p_elements = article_soup.findAll("p")
-            for el in all_p_elements:
-                content += el.text.lower()
+            page = parse_article(article_response.text, 'Cointelegraph')
+            title, content = page.title, page.content
         
 
             if not title or not content:
@@ -80,27 +66,24 @@ def validate_cointelegraph_article(article_link, main_keyword, session_instance)
             else:
                 # These three following lines change the status of the article to ANALYZED.
                 normalized_article_url = article_link.strip().casefold()
-                is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+                is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
                 if is_url_analized:
                     is_url_analized.is_analyzed = True
                     session_instance.commit()
 
                 is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                is_valid_content = validate_content(main_keyword, content, session_instance)
+                is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                 is_url_in_db = url_in_db(normalized_article_url, session_instance)
                 is_title_in_db = title_in_db(title, session_instance)
 
                 if is_title_in_blacklist or not is_valid_content or is_url_in_db or is_title_in_db:
                     return None, None, None, None, None
 
-                date_time_element = article_soup.find('time')
-                date = date_time_element['datetime'].strip() if date_time_element and 'datetime' in date_time_element.attrs else None
-                valid_date = validate_date_cointelegraph(date)
+                valid_date = validate_date_cointelegraph(page.date)
 
-                image_urls = extract_image_urls(article_response.text)
+                image_urls = extract_image_urls(page.images)
 
                 if is_valid_content and valid_date and title:
-                    matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                     return title, content, valid_date, image_urls, matched_keywords
                 else:
                     return None, None, None, None, None
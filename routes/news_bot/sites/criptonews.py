@@ -1,9 +1,8 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from dateutil.parser import parse
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
-from config import AnalyzedArticle as ANALIZED_ARTICLE
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
 
 def validate_date_cryptonews(date_text):
@@ -18,16 +17,13 @@ def validate_date_cryptonews(date_text):
         print(f"Error in cryptonews: {str(e)}")
     return None
 
-def extract_image_urls_cryptonews(html):
+def extract_image_urls_cryptonews(styles):
+    # styles are the style attributes of the detail-image-wrap divs
     try:
         image_urls = []
         base_url = "https://cnews24.ru/uploads/"
 
-        soup = BeautifulSoup(html, 'html.parser')
-        image_divs = soup.find_all('div', class_='detail-image-wrap')
-
-        for div in image_divs:
-            style = div.get('style')
+        for style in styles:
             if style:
                 url_start = style.find('(') + 1
                 url_end = style.find(')')
@@ -40,7 +36,7 @@ def extract_image_urls_cryptonews(html):
         return None
         
         
-def validate_cryptonews_article(article_link, main_keyword, session_instance):
+def validate_cryptonews_article(article_link, main_keyword, session_instance, article_response=None):
 
     try:
 
@@ -48,21 +44,15 @@ def validate_cryptonews_article(article_link, main_keyword, session_instance):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
             }
    
-        article_response = requests.get(article_link, headers=headers)
+        if article_response is None:
+            article_response = requests.get(article_link, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower() 
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None 
-
-            content = "" 
-            all_p_elements = article_soup.findAll("p")
-            for el in all_p_elements:
-                content += el.text.lower()
+            page = parse_article(article_response.text, 'Cryptonews')
+            title, content = page.title, page.content
         
 
             if not title or not content:
@@ -70,27 +60,24 @@ def validate_cryptonews_article(article_link, main_keyword, session_instance):
             else:
                 # These three following lines change the status of the article to ANALYZED.
                 normalized_article_url = article_link.strip().casefold()
-                is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+                is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
                 if is_url_analized:
                     is_url_analized.is_analyzed = True
                     session_instance.commit()
 
                 is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                is_valid_content = validate_content(main_keyword, content, session_instance)
+                is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                 is_url_in_db = url_in_db(normalized_article_url, session_instance)
                 is_title_in_db = title_in_db(title, session_instance)
 
                 if is_title_in_blacklist or not is_valid_content or is_url_in_db or is_title_in_db:
                     return None, None, None, None, None
 
-                date_time_element = article_soup.find('time')
-                date = date_time_element['datetime'].strip() if date_time_element and 'datetime' in date_time_element.attrs else None
-                valid_date = validate_date_cryptonews(date)
+                valid_date = validate_date_cryptonews(page.date)
 
-                image_urls = extract_image_urls_cryptonews(article_response.text)
+                image_urls = extract_image_urls_cryptonews(page.images)
 
                 if is_valid_content and valid_date and title:
-                    matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                     return title, content, valid_date, image_urls, matched_keywords
                 else:
                     return None, None, None, None, None
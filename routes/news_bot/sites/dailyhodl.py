@@ -1,48 +1,27 @@
-from bs4 import BeautifulSoup
 import requests
 from datetime import datetime, timedelta
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
-from config import AnalyzedArticle as ANALIZED_ARTICLE
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
 
-def validate_date_dailyhodl(html):
+def validate_date_dailyhodl(date_text):
     try:
-        # Find the div with class "jeg_meta_date"
-        date_div = html.find('div', class_='jeg_meta_date')
-
-        if date_div:
-            # Extract the link inside the div
-            link = date_div.find('a')
+        # date_text is the text of the link inside the div with class "jeg_meta_date"
+        if date_text:
+            # Convert the date text to a datetime object
+            date = datetime.strptime(date_text, "%B %d, %Y")
+            
+            # Get today's date without the time
+            today_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             
-            if link:
-                # Extract the text from the link, which is the date
-                date_text = link.get_text(strip=True)
-                
-                # Convert the date text to a datetime object
-                date = datetime.strptime(date_text, "%B %d, %Y")
-                
-                # Get today's date without the time
-                today_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                
-                # Check if the article date is the same as today
-                if date.date() == today_date.date():
-                    return date
+            # Check if the article date is the same as today
+            if date.date() == today_date.date():
+                return date
     except Exception as e:
         print("Error in DailyHodl:", str(e))
     return None
 
-def extract_image_url_dailyhodl(html):
-    try:
-        image = html.find('img', class_='wp-post-image')
-        if image:
-            src = image.get('src')
-            if src:
-                return src
-    except Exception as e:
-        print("Error in DailyHodl:", str(e))
-        return False
-
-def validate_dailyhodl_article(article_link, main_keyword, session_instance):
+def validate_dailyhodl_article(article_link, main_keyword, session_instance, article_response=None):
     
     normalized_article_url = article_link.strip().casefold()
 
@@ -51,25 +30,17 @@ def validate_dailyhodl_article(article_link, main_keyword, session_instance):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.61 Safari/537.36'
         }
 
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            article_soup = BeautifulSoup(article_response.text, 'html.parser')
-
-            #Firstly extract the title and content
-
-            content = ""
-            a_elements = article_soup.find_all("p")
-            for a in a_elements:
-                content += a.text.strip()
-
-            title_element = article_soup.find('h1')
-            title = title_element.text.strip() if title_element else None
+            page = parse_article(article_response.text, 'Dailyhodl')
+            title, content = page.title, page.content
 
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             if is_url_analized:
                 is_url_analized.is_analyzed = True
                 session_instance.commit()
@@ -78,17 +49,16 @@ def validate_dailyhodl_article(article_link, main_keyword, session_instance):
             try:
                 if title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
-                        valid_date = validate_date_dailyhodl(article_soup)
-                        image_urls = extract_image_url_dailyhodl(article_soup)
+                        valid_date = validate_date_dailyhodl(page.date)
+                        image_urls = page.images
                        
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
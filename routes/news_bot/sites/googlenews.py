@@ -1,10 +1,9 @@
 import requests
-from bs4 import BeautifulSoup
-from config import AnalyzedArticle as ANALIZED_ARTICLE
-from routes.news_bot.validations import title_in_blacklist, validate_content, url_in_db, title_in_db, find_matched_keywords
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import title_in_blacklist, match_keywords, url_in_db, title_in_db, find_analyzed_article
 
 
-def validate_google_news_article(article_link, main_keyword, session_instance):
+def validate_google_news_article(article_link, main_keyword, session_instance, article_response=None):
     normalized_article_url = article_link.strip().casefold()
 
     headers = {
@@ -12,31 +11,19 @@ def validate_google_news_article(article_link, main_keyword, session_instance):
     }
 
     try:
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None
         else:
-            html = BeautifulSoup(article_response.text, 'html.parser')
-
-            title_element = html.find('h1')
-            title = title_element.text.strip() if title_element else None
-
-            content = ""
-            if normalized_article_url.startswith("https://blockchainreporter.net/"):
-                content_div = html.find('div', class_='content-inner')
-                if content_div:
-                    p_elements = content_div.find_all("p")
-                    for p in p_elements:
-                        content += p.text.strip()
-            else:
-                p_elements = html.find_all("p")
-                for p in p_elements:
-                    content += p.text.strip()
+            # Publishers such as blockchainreporter.net have their own selectors (HOST_SELECTORS)
+            page = parse_article(article_response.text, 'Google News', url=normalized_article_url)
+            title, content = page.title, page.content
             
             # Estas tres siguientes líneas cambian el estado del artículo a ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -45,12 +32,11 @@ def validate_google_news_article(article_link, main_keyword, session_instance):
             try:
                 if  title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
-                        matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                         return title, content, matched_keywords
                 return None, None, None
                         
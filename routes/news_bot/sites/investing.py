@@ -1,34 +1,30 @@
 import re
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from config import AnalyzedArticle as ANALIZED_ARTICLE
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
 
-def validate_date_investing(soup):
+def validate_date_investing(span_texts):
     try:
-        content_sections = soup.find_all('div', class_='contentSectionDetails')
+        # span_texts are the texts of the spans inside the divs with class "contentSectionDetails"
 
         # Define a regular expression pattern for matching the date
         date_pattern = re.compile(r'Published (\w+ \d+, \d{4} \d+:\d{2}[APMapm ]+)', re.IGNORECASE)
 
-        for content_section in content_sections:
-            span_tag = content_section.find('span')
+        for span_text in span_texts or []:
+            match = date_pattern.search(span_text)
             
-            if span_tag:
-                match = date_pattern.search(span_tag.text)
+            if match:
+                published_date_text = match.group(1)
                 
-                if match:
-                    published_date_text = match.group(1)
-                    
-                    # Corrected format specifier with rstrip() to remove trailing whitespace
-                    date = datetime.strptime(published_date_text.rstrip(), "%b %d, %Y %I:%M%p")
-            
-                    current_time = datetime.now()
-                    time_difference = current_time - date
-                    if time_difference <= timedelta(hours=24):
-                        return date
+                # Corrected format specifier with rstrip() to remove trailing whitespace
+                date = datetime.strptime(published_date_text.rstrip(), "%b %d, %Y %I:%M%p")
+        
+                current_time = datetime.now()
+                time_difference = current_time - date
+                if time_difference <= timedelta(hours=24):
+                    return date
 
         return None
         
@@ -36,24 +32,7 @@ def validate_date_investing(soup):
         print("Error processing date in Investing:", str(e))
         return None
 
-def extract_image_url_investing(soup):
-
-    try:
-        image = soup.find('img', id='carouselImage')
-       
-        if image:
-            src = image.get('src')
-            if src and src.startswith("https://i-invdn-com.investing.com/news/"):
-                return src
-
-        return None
-    
-    except Exception as e:
-        print("Error extracting images in Investing", str(e))
-        return None
-
-
-def validate_investing_article(article_link, main_keyword, session_instance):
+def validate_investing_article(article_link, main_keyword, session_instance, article_response=None):
 
     normalized_article_url = article_link.strip().casefold()
 
@@ -62,25 +41,19 @@ def validate_investing_article(article_link, main_keyword, session_instance):
     }
 
     try:
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            html = BeautifulSoup(article_response.text, 'html.parser')
-
-            title_element = html.find('h1')
-            title = title_element.text.strip() if title_element else None
-
-            content = ""
-            a_elements = html.find_all("p")
-            for a in a_elements:
-                content += a.text.strip()
+            page = parse_article(article_response.text, 'Investing')
+            title, content = page.title, page.content
 
 
             # These three following lines changes the status of the article to ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -89,20 +62,19 @@ def validate_investing_article(article_link, main_keyword, session_instance):
             try:
                 if  title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db: 
 
-                        valid_date = validate_date_investing(html)
+                        valid_date = validate_date_investing(page.date)
 
                         # Extract image URL
-                        image_urls = extract_image_url_investing(html)   
+                        image_urls = page.images   
 
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
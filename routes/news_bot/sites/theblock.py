@@ -1,18 +1,14 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-from config import AnalyzedArticle as ANALIZED_ARTICLE
-from routes.news_bot.validations import find_matched_keywords, validate_content, title_in_blacklist, url_in_db, title_in_db
+from routes.news_bot.extraction import parse_article
+from routes.news_bot.validations import match_keywords, title_in_blacklist, url_in_db, title_in_db, find_analyzed_article
 
 
 
-def validate_date_theblock(html):
+def validate_date_theblock(date_text):
 
     try:
-        date_div = html.find('div', class_='timestamp tbcoTimestamp')
-
-        if date_div:
-            date_text = date_div.get_text().strip()
+        if date_text:
             date = date_text.split('• ')[1]
             datex = date.replace(',', '').split(' ')
             if datex:
@@ -31,24 +27,7 @@ def validate_date_theblock(html):
         return None
 
 
-def extract_image_urls_theblock(html):
-
-    try:
-        image_urls = []
-        img_elements = html.find_all('img')
-        for img in img_elements:
-            src = img.get('src')
-            if src:
-                image_urls.append(src)
-      
-        return image_urls
-    
-    except Exception as e:
-        print("Error extracting images in Theblock", str(e))
-        return []
-
-
-def validate_theblock_article(article_link, main_keyword, session_instance):
+def validate_theblock_article(article_link, main_keyword, session_instance, article_response=None):
 
     normalized_article_url = article_link.strip().casefold()
 
@@ -57,25 +36,19 @@ def validate_theblock_article(article_link, main_keyword, session_instance):
     }
 
     try:
-        article_response = requests.get(normalized_article_url, headers=headers)
+        if article_response is None:
+            article_response = requests.get(normalized_article_url, headers=headers, timeout=10)
         article_content_type = article_response.headers.get("Content-Type", "").lower()
 
         if not 'text/html' in article_content_type or article_response.status_code != 200:
             return None, None, None, None, None
         else:
-            html = BeautifulSoup(article_response.text, 'html.parser')
-
-            title_element = html.find('h1')
-            title = title_element.text.strip() if title_element else None
-
-            content = ""
-            a_elements = html.find_all("p")
-            for a in a_elements:
-                content += a.text.strip()
+            page = parse_article(article_response.text, 'Theblock')
+            title, content = page.title, page.content
 
             
             # These three following lines changes the status of the article to ANALIZED.
-            is_url_analized = session_instance.query(ANALIZED_ARTICLE).filter(ANALIZED_ARTICLE.url == normalized_article_url).first()
+            is_url_analized = find_analyzed_article(normalized_article_url, session_instance)
             
             if is_url_analized:
                 is_url_analized.is_analyzed = True
@@ -84,18 +57,17 @@ def validate_theblock_article(article_link, main_keyword, session_instance):
             try:
                 if  title and content:
                     is_title_in_blacklist = title_in_blacklist(title, session_instance)
-                    is_valid_content = validate_content(main_keyword, content, session_instance)
+                    is_valid_content, matched_keywords = match_keywords(main_keyword, content, session_instance)
                     is_url_in_db = url_in_db(normalized_article_url, session_instance)
                     is_title_in_db = title_in_db(title, session_instance)
 
                     # if the all conditions passed then go on
                     if not is_title_in_blacklist and is_valid_content and not is_url_in_db and not is_title_in_db:
                     
-                        valid_date = validate_date_theblock(html)
-                        image_urls = extract_image_urls_theblock(html)
+                        valid_date = validate_date_theblock(page.date)
+                        image_urls = page.images
             
                         if valid_date:
-                            matched_keywords = find_matched_keywords(main_keyword, content, session_instance)
                             return title, content, valid_date, image_urls, matched_keywords
                         
                 return None, None, None, None, None
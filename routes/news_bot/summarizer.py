@@ -1,18 +1,18 @@
 from routes.slack.templates.poduct_alert_notification import send_notification_to_product_alerts_slack_channel
 from openai import APIError, RateLimitError, APIConnectionError
-from openai import OpenAI
-import os
+from redis_client.redis_client import get_cached_json, set_cached_json
+from services.openai.gateway import openai_gateway, BULK
+from utils.fingerprint import content_fingerprint
+import hashlib
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
+SUMMARY_MODEL = "gpt-4"
+# Summaries are keyed by content and prompt, a week covers the syndication window of a story
+SUMMARY_CACHE_TTL = 60 * 60 * 24 * 7
+# A scraper thread gives up on a summary after this long (queue and retries included)
+SUMMARY_TIMEOUT = 300
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
-NEWS_BOT_API_KEY = os.getenv('NEWS_BOT_API_KEY')
-
-client = OpenAI(
-    api_key=NEWS_BOT_API_KEY,
-)
 btc_prompt = """
 Imagine that you are one of the world's foremost experts on Bitcoin and also a globally renowned journalist skilled at summarizing articles about Bitcoin. Your job involves two steps.
 Step One: Rewrite the headline of the article you are summarizing. Follow these rules for the headline:
@@ -231,47 +231,84 @@ Step Two: Summarize the article in bullet points. Follow these rules for the art
 """
 
 
-def summary_generator(text, main_keyword):
+PROMPTS = {
+    'bitcoin': btc_prompt,
+    'ethereum': eth_prompt,
+    'hacks': hacks_prompt,
+    'lsd': lsd_prompt,
+    'layer 0': layer_0_prompt,
+    'layer 1 lmc': layer_1_lmc_prompt,
+    'layer 1 mmc': layer_1_mmc_prompt,
+    'layer 2': layer_2_prompt,
+    'oracle': oracle_prompt,
+    'cross border payments': cross_border_payment_prompt,
+    'defip': defi_perpetual_prompt,
+    'defi': defi_prompt,
+    'defio': defi_others_prompt,
+    'ai': ai_prompt,
+}
+
+# Summaries being generated in this process, so concurrent copies of a story share one request
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def summary_cache_key(text, main_keyword):
+    """
+    Cache key of a summary: the prompt id (keyword and prompt version) and the normalized content hash.
+    Returns None if the keyword has no prompt or the content is empty.
+    """
+    prompt = PROMPTS.get(main_keyword)
+    digest = content_fingerprint(text)
+    if prompt is None or digest is None:
+        return None
+    prompt_id = f"{main_keyword}:{hashlib.sha256(prompt.encode()).hexdigest()[:12]}"
+    return f"summary:{SUMMARY_MODEL}:{prompt_id}:{digest}"
+
+
+def summary_generator(text, main_keyword, priority=BULK):
     try:
-        if main_keyword == 'bitcoin':
-            prompt = btc_prompt
-        elif main_keyword == 'ethereum':
-            prompt = eth_prompt
-        elif main_keyword == 'hacks':
-            prompt = hacks_prompt
-        elif main_keyword == 'lsd':
-            prompt = lsd_prompt
-        elif main_keyword == 'layer 0':
-            prompt = layer_0_prompt
-        elif main_keyword == 'layer 1 lmc':
-            prompt = layer_1_lmc_prompt
-        elif main_keyword == 'layer 1 mmc':
-            prompt = layer_1_mmc_prompt
-        elif main_keyword == 'layer 2':
-            prompt = layer_2_prompt
-        elif main_keyword == 'oracle':
-            prompt = oracle_prompt
-        elif main_keyword == 'cross border payments':
-            prompt = cross_border_payment_prompt
-        elif main_keyword == 'defip':
-            prompt = defi_perpetual_prompt
-        elif main_keyword == 'defi':
-            prompt = defi_prompt
-        elif main_keyword == 'defio':
-            prompt = defi_others_prompt
-        elif main_keyword == 'ai':
-            prompt = ai_prompt
-        else:
-            prompt = None
-
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[ {"role": "system", "content": prompt},
-                       {"role": "user", "content": text}],
-            temperature=0.6,
-            max_tokens=1024,
-        )
-        summary = response.choices[0].message.content
+        prompt = PROMPTS.get(main_keyword)
+        if prompt is None:
+            print(f"No summary prompt for {main_keyword}")
+            return None
+
+        cache_key = summary_cache_key(text, main_keyword)
+        if cache_key:
+            cached_summary = get_cached_json(cache_key)
+            if cached_summary:
+                return cached_summary
+
+        with _in_flight_lock:
+            future = _in_flight.get(cache_key) if cache_key else None
+            is_owner = future is None
+            if is_owner:
+                future = openai_gateway.submit(
+                    model=SUMMARY_MODEL,
+                    messages=[ {"role": "system", "content": prompt},
+                               {"role": "user", "content": text}],
+                    temperature=0.6,
+                    max_tokens=1024,
+                    priority=priority,
+                    timeout=SUMMARY_TIMEOUT,
+                )
+                if cache_key:
+                    _in_flight[cache_key] = future
+
+        try:
+            # The gateway fails the future at SUMMARY_TIMEOUT, this is only a backstop
+            summary = future.result(SUMMARY_TIMEOUT)
+        except FutureTimeoutError:
+            if is_owner:
+                future.cancel()
+            raise TimeoutError(f"No summary after {SUMMARY_TIMEOUT}s")
+        finally:
+            if is_owner and cache_key:
+                with _in_flight_lock:
+                    _in_flight.pop(cache_key, None)
+
+        if is_owner and cache_key and summary:
+            set_cached_json(cache_key, summary, SUMMARY_CACHE_TTL)
         return summary
 
     except APIConnectionError as e:
@@ -292,3 +329,6 @@ def summary_generator(text, main_keyword):
                                                           message=str(e))
         print(f"OpenAI API returned an API Error: {e}")
         return None
+    except TimeoutError as e:
+        print(f"OpenAI summary timed out: {e}")
+        return None
@@ -1,110 +1,314 @@
-from config import Article, CoinBot, Blacklist
+from config import AnalyzedArticle, Article, ArticleSource, CoinBot, Blacklist, Keyword
+from routes.news_bot.dedup_bloom import article_dedup_bloom
+from utils.fingerprint import url_fingerprint, title_fingerprint
 from difflib import SequenceMatcher
+from collections import Counter
+from abc import ABC, abstractmethod
+from sqlalchemy import event, func
 import ahocorasick
+import bisect
+import threading
+import time
 
 
-def title_in_db(article_title, session_instance): # True if Title already in DB  
-    try:    
-        existing_title =session_instance.query(Article).filter(Article.title.ilike(article_title)).first()
+def title_in_db(article_title, session_instance): # True if Title already in DB
+    try:
+        digest = title_fingerprint(article_title)
+        if not digest or article_dedup_bloom.might_contain('title', digest) is False:
+            return False
 
+        existing_title = session_instance.query(Article.article_id).filter(Article.title_hash == digest).first()
         return existing_title is not None
 
     except Exception as e:
         print(f'Error in title_in_db: {str(e)}')
         return False
     
-def url_in_db(input_url, session_instance): # True if URL already in DB
+def url_in_db(input_url, session_instance): # True if URL already in DB, as an article or an alternate source
     try:
-        existing_url = session_instance.query(Article).filter(Article.url.ilike(input_url.casefold().strip())).first()
+        digest = url_fingerprint(input_url)
+        if not digest or article_dedup_bloom.might_contain('url', digest) is False:
+            return False
+
+        existing_url = session_instance.query(Article.article_id).filter(Article.url_hash == digest).first()
+        if existing_url is not None:
+            return True
 
-        return existing_url is not None
+        existing_source = session_instance.query(ArticleSource.source_id).filter(ArticleSource.url_hash == digest).first()
+        return existing_source is not None
 
     except Exception as e:
         print(f'Error in url_in_db: {str(e)}')
         return False
 
-def validate_content(bot_name, content, session_instance):
+def find_analyzed_article(input_url, session_instance): # AnalyzedArticle with the same URL, or None
     try:
-        coin_name = session_instance.query(CoinBot).filter(CoinBot.bot_name == bot_name.casefold()).first()
+        digest = url_fingerprint(input_url)
+        if not digest or article_dedup_bloom.might_contain('analyzed', digest) is False:
+            return None
 
-        if not coin_name:
-            # Handle the case where no matching SCRAPPING_DATA object is found
-            return False
+        return session_instance.query(AnalyzedArticle).filter(AnalyzedArticle.url_hash == digest).first()
 
-        keywords = coin_name.keywords
-        keyword_values = {keyword.word.casefold() for keyword in keywords}  # Set of case-folded keywords for faster lookup
-        # Build Aho-Corasick automaton
-        A = ahocorasick.Automaton()
-        for idx, keyword in enumerate(keyword_values):
-            A.add_word(keyword, (idx, keyword))
-        A.make_automaton()
-
-        # Iterate through matches in content
-        for _, keyword in A.iter(content.casefold()):
-            # If a match is found, return True
-            savedKeyword = {'keyword: ':  keyword, 'coin Bot: ': bot_name}
-            # print('Found Keyword:', savedKeyword)
-            return True
+    except Exception as e:
+        print(f'Error in find_analyzed_article: {str(e)}')
+        return None
 
-        # No matches found
-        print('No Keywords matches found')
-        return False
+class CachedTableIndex(ABC):
+    """
+    An in-memory index built from DB tables and rebuilt only when they change.
+
+    In-process writes invalidate it right away (ORM events, see watch()),
+    writes from other processes are picked up through a cheap fingerprint
+    query made at most every FINGERPRINT_CHECK_INTERVAL seconds.
+    Subclasses implement _table_fingerprint() and _build().
+    """
+
+    FINGERPRINT_CHECK_INTERVAL = 10
+
+    def __init__(self):
+        self._index = None
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self, *args):
+        self._checked_at = 0.0
+        self._fingerprint = None
+
+    def watch(self, *models):
+        for model in models:
+            for event_name in ('after_insert', 'after_update', 'after_delete'):
+                event.listen(model, event_name, self.invalidate)
+
+    @abstractmethod
+    def _table_fingerprint(self, session_instance):
+        """A cheap value that changes whenever the indexed tables change."""
+
+    @abstractmethod
+    def _build(self, session_instance):
+        """Build the index from the tables."""
+
+    def _current(self, session_instance):
+        if time.monotonic() - self._checked_at < self.FINGERPRINT_CHECK_INTERVAL:
+            return self._index
+
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.FINGERPRINT_CHECK_INTERVAL:
+                fingerprint = self._table_fingerprint(session_instance)
+                if fingerprint != self._fingerprint:
+                    self._index = self._build(session_instance)
+                    self._fingerprint = fingerprint
+                self._checked_at = time.monotonic()
+            return self._index
+
+
+class KeywordMatcher(CachedTableIndex):
+    """
+    One Aho-Corasick automaton over the keywords of every CoinBot.
+
+    Each keyword maps to the set of bot names that use it, so a single scan of
+    an article gives the matched keywords of every bot at once.
+    """
+
+    def _table_fingerprint(self, session_instance):
+        keywords = session_instance.query(
+            func.count(Keyword.keyword_id), func.max(Keyword.updated_at), func.sum(Keyword.coin_bot_id)
+        ).one()
+        coin_bots = session_instance.query(func.count(CoinBot.bot_id), func.max(CoinBot.updated_at)).one()
+        return tuple(keywords) + tuple(coin_bots)
+
+    def _build(self, session_instance):
+        bots_by_word = {}
+        rows = session_instance.query(CoinBot.name, Keyword.word).join(Keyword, Keyword.coin_bot_id == CoinBot.bot_id)
+        for bot_name, word in rows:
+            if bot_name and word:
+                bots_by_word.setdefault(word.casefold(), set()).add(bot_name.casefold())
+
+        if not bots_by_word:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for word, bot_names in bots_by_word.items():
+            automaton.add_word(word, (word, frozenset(bot_names)))
+        automaton.make_automaton()
+        return automaton
+
+    def classify(self, content, session_instance):
+        """
+        Scan the content once and return the matched keywords of every bot.
+
+        Returns:
+            dict: bot name -> set of matched keywords, only for bots with at least one match.
+        """
+        automaton = self._current(session_instance)
+        matches = {}
+        if automaton is None or not content:
+            return matches
+
+        for _, (keyword, bot_names) in automaton.iter(content.casefold()):
+            for bot_name in bot_names:
+                matches.setdefault(bot_name, set()).add(keyword)
+        return matches
+
+    def match(self, bot_name, content, session_instance):
+        """
+        Return the keywords of one bot found in the content (single pass).
+        """
+        return self.classify(content, session_instance).get(bot_name.casefold(), set())
+
+
+keyword_matcher = KeywordMatcher()
+keyword_matcher.watch(Keyword, CoinBot)
+
+
+def match_keywords(bot_name, content, session_instance): # (is relevant, matched keywords) in one pass
+    try:
+        matched_keywords = keyword_matcher.match(bot_name, content, session_instance)
+        if not matched_keywords:
+            print('No Keywords matches found')
+        return bool(matched_keywords), matched_keywords
 
     except Exception as e:
-        print(f'Error in validate_content: {str(e)}')
-        return False
+        print(f'Error in match_keywords: {str(e)}')
+        return False, set()
 
-def find_matched_keywords(bot_name, content, session_instance):
+def classify_content(content, session_instance): # Matched keywords of every bot in one pass
     try:
-        coin_name = session_instance.query(CoinBot).filter(CoinBot.bot_name == bot_name.casefold()).first()
-        if not coin_name:
-            # Handle the case where no matching SCRAPPING_DATA object is found
-            return set()
-        keywords = coin_name.keywords
-        keyword_values = {keyword.word.casefold() for keyword in keywords}  # Set of case-folded keywords for faster lookup
-        
-        # Build Aho-Corasick automaton
-        A = ahocorasick.Automaton()
-        for idx, keyword in enumerate(keyword_values):
-            A.add_word(keyword, (idx, keyword))
-        A.make_automaton()
-
-        # Keep track of matched keywords
-        matched_keywords = set()
-
-        # Iterate through matches in content
-        for _, keyword in A.iter(content.casefold()):
-            matched_keywords.add(keyword)
-
-        return matched_keywords
+        return keyword_matcher.classify(content, session_instance)
 
     except Exception as e:
-        print(f'Error in find_matched_keywords: {str(e)}')
-        return set()
+        print(f'Error in classify_content: {str(e)}')
+        return {}
 
+def validate_content(bot_name, content, session_instance):
+    is_valid_content, _ = match_keywords(bot_name, content, session_instance)
+    return is_valid_content
+
+def find_matched_keywords(bot_name, content, session_instance):
+    _, matched_keywords = match_keywords(bot_name, content, session_instance)
+    return matched_keywords
 
 
-def title_in_blacklist(input_title_formatted, session_instance): # True if Title in blacklist
-    
-    try:
-        black_list = session_instance.query(Blacklist).all()
-        black_list_values = {keyword.word.casefold() for keyword in black_list}  # Set for faster lookup
 
-        similarity_threshold = 0.9
+BLACKLIST_SIMILARITY_THRESHOLD = 0.9
 
-        for title in black_list_values:
-            title_similarity_ratio = SequenceMatcher(None, input_title_formatted.casefold(), title).ratio()
 
-            if title_similarity_ratio >= similarity_threshold:
-                return True  # If a similar title is found in the blacklist, return True
+def _bigrams(text):
+    return Counter(text[i:i + 2] for i in range(len(text) - 1))
 
-        # No similar title found in the blacklist
+
+def indel_distance_within(a, b, limit):
+    """
+    True if a can be turned into b with at most `limit` insertions/deletions.
+
+    Banded dynamic programming over |i - j| <= limit that stops as soon as a
+    whole row exceeds the limit, so it costs O(limit * len) at most.
+    """
+    la, lb = len(a), len(b)
+    if abs(la - lb) > limit:
         return False
 
-    except Exception as e:
-        print(f'Error in title_in_blacklist: {str(e)}')
+    big = limit + 1
+    previous = [j if j <= limit else big for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        current = [big] * (lb + 1)
+        current[0] = i if i <= limit else big
+        lo, hi = max(1, i - limit), min(lb, i + limit)
+        row_min = current[0]
+        for j in range(lo, hi + 1):
+            if a[i - 1] == b[j - 1]:
+                value = previous[j - 1]
+            else:
+                value = min(previous[j], current[j - 1]) + 1
+            current[j] = value if value <= limit else big
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return False
+        previous = current
+    return previous[lb] <= limit
+
+
+class BlacklistMatcher(CachedTableIndex):
+    """
+    Fuzzy title matcher over the Blacklist table with the semantics of
+    SequenceMatcher(None, title, word).ratio() >= BLACKLIST_SIMILARITY_THRESHOLD.
+
+    Candidates are pruned with filters that can never reject a real match:
+
+    - length: ratio <= 2 * min(la, lb) / (la + lb);
+    - character bigrams: a ratio >= 0.9 implies an insert/delete distance
+      k <= (la + lb) / 10, and k edits destroy at most 2k bigrams, so a
+      match shares at least max(la, lb) - 1 - 2k bigrams with the title
+      (counted with an inverted bigram index);
+    - bounded insert/delete distance with early exit.
+
+    Only the few survivors are verified with SequenceMatcher itself.
+    """
+
+    def _table_fingerprint(self, session_instance):
+        return tuple(session_instance.query(
+            func.count(Blacklist.blacklist_id), func.max(Blacklist.updated_at)
+        ).one())
+
+    def _build(self, session_instance):
+        words = sorted({
+            word.casefold() for (word,) in session_instance.query(Blacklist.word) if word
+        }, key=len)
+        postings = {}
+        for entry_id, word in enumerate(words):
+            for bigram, count in _bigrams(word).items():
+                postings.setdefault(bigram, []).append((entry_id, count))
+        return words, [len(word) for word in words], postings
+
+    def _candidates(self, title):
+        words, lengths, postings = self._index
+        la = len(title)
+        # 2 * min(la, lb) >= 0.9 * (la + lb)  <=>  9 * la / 11 <= lb <= 11 * la / 9
+        lo = bisect.bisect_left(lengths, (9 * la) // 11)
+        hi = bisect.bisect_right(lengths, (11 * la) // 9 + 1)
+        if lo >= hi:
+            return
+
+        shared = Counter()
+        for bigram, count in _bigrams(title).items():
+            for entry_id, entry_count in postings.get(bigram, ()):
+                if lo <= entry_id < hi:
+                    shared[entry_id] += min(count, entry_count)
+
+        for entry_id in range(lo, hi):
+            word = words[entry_id]
+            lb = lengths[entry_id]
+            total = la + lb
+            if 20 * min(la, lb) < 9 * total:
+                continue
+            max_distance = total // 10
+            if shared[entry_id] < max(la, lb) - 1 - 2 * max_distance:
+                continue
+            if indel_distance_within(title, word, max_distance):
+                yield word
+
+    def matches(self, title, session_instance):
+        """
+        True if the title is at least 90% similar to a blacklist entry.
+        """
+        if self._current(session_instance) is None:
+            return False
+
+        title = title.casefold()
+        for word in self._candidates(title):
+            if SequenceMatcher(None, title, word).ratio() >= BLACKLIST_SIMILARITY_THRESHOLD:
+                return True
         return False
 
 
+blacklist_matcher = BlacklistMatcher()
+blacklist_matcher.watch(Blacklist)
 
 
+def title_in_blacklist(input_title_formatted, session_instance): # True if Title in blacklist
+    try:
+        return blacklist_matcher.matches(input_title_formatted, session_instance)
+
+    except Exception as e:
+        print(f'Error in title_in_blacklist: {str(e)}')
+        return False
@@ -1,12 +1,13 @@
 import os
 import json
-from sqlalchemy import func
 from dotenv import load_dotenv
 from urllib.parse import unquote
 from json import JSONDecodeError
 from flask import request, Blueprint
 # from slackeventsapi import SlackEventAdapter
 from config import session, Article, TopStory, TopStoryImage, ArticleImage
+from utils.fingerprint import url_fingerprint
+from routes.news_bot.news_feed import invalidate_top_stories
 from routes.slack.templates.news_message import send_INFO_message_to_slack_channel
 
 load_dotenv()
@@ -43,6 +44,7 @@ def delete_top_story():
             # Delete the TopStory
             session.delete(top_story)
             session.commit()
+            invalidate_top_stories()
             
             return f"Top Story with ID {id} deleted successfully", 200
         except Exception as e:
@@ -71,7 +73,7 @@ def slack_events():
         url = unquote(value).replace('+', ' ').strip()
         url = url.split('linkToArticle:')[1]
         
-        article = session.query(Article).filter(func.trim(Article.url) == url.strip()).first()
+        article = session.query(Article).filter(Article.url_hash == url_fingerprint(url)).first()
         if not article:
             print('Article not found')
             send_INFO_message_to_slack_channel(channel_id="C06FTS38JRX",
@@ -104,6 +106,7 @@ def slack_events():
                                                     top_story_id=new_topstory.top_story_id)
                 session.add(new_topstory_image)
                 session.commit()
+                invalidate_top_stories()
 
                 return 'Message received', 200
 
@@ -1,5 +1,5 @@
 import os
-import requests
+from utils.upstream import http_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -37,7 +37,7 @@ def send_notification_to_product_alerts_slack_channel(title_message, sub_title,
 
     try:
 
-        slack_response = requests.post(SLACK_PRODUCT_ALERTS, json=payload) 
+        slack_response = http_client.post(SLACK_PRODUCT_ALERTS, json=payload) 
         if slack_response.status_code == 200:
             return 'Notification sent to Slack successfully', 200
         else:
@@ -1,7 +1,7 @@
 import os
 import time
 import smtplib
-import requests
+from utils.upstream import http_client
 from pathlib import Path
 from flask import jsonify
 from email.mime.text import MIMEText
@@ -101,7 +101,7 @@ async def send_email():
          
 
     if email:
-        response = requests.post(createChatInviteLink, data=payload) 
+        response = http_client.post(createChatInviteLink, data=payload) 
         print('Telegram response for invitaion link:', response.content)
         if response.status_code == 200:
             response_data = response.json()
@@ -1,5 +1,5 @@
 import os
-import requests
+from utils.upstream import http_client
 from flask import Blueprint, request, jsonify
 from dotenv import load_dotenv
 from typing import Dict, Any
@@ -37,7 +37,7 @@ def send_telegram_message(chat_id: int, text: str) -> Dict[str, Any]:
         Dict[str, Any]: A dictionary containing the response status and message.
     """
     payload = {'chat_id': chat_id, 'text': text}
-    response = requests.post(SEND_MESSAGE_URL, data=payload)
+    response = http_client.post(SEND_MESSAGE_URL, data=payload)
     
     if response.status_code == HTTPStatus.OK:
         print('Message to Telegram sent successfully')
@@ -1,4 +1,3 @@
-import httpx
 import os
 from dotenv import load_dotenv
 
@@ -10,6 +9,9 @@ auth0ManagementAPI_Client = os.getenv("AUTH0_CLIENT_ID")
 auth0ManagementAPI_Secret = os.getenv("AUTH0_CLIENT_SECRET")
 
 async def get_management_api_token():
+    # Imported here, only the password reset uses httpx
+    import httpx
+
     url = f"https://{auth0Domain}/oauth/token"
     headers = {'Content-Type': 'application/json'}
     body = {
@@ -30,6 +32,8 @@ async def get_management_api_token():
             return None
 
 async def patchPassword(email, new_password):
+    import httpx
+
     try:
         # Step 1: Get the Auth0 Management API token
         token = await get_management_api_token()
@@ -5,11 +5,9 @@ from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MAX_INSTANCES, EVENT_J
 
 SLACK_LOGS_CHANNEL_ID = "C06FTS38JRX"
 
+# Not started on import: the jobs process (worker.py) runs it, web processes go through utils.scheduling.ensure_started
 scheduler = BackgroundScheduler(executors={'default': {'type': 'threadpool', 'max_workers': 50}})
 scheduler.add_jobstore('sqlalchemy', url=DATABASE_URL)
-if scheduler.state != 1:
-    scheduler.start()
-    print("---- Main Scheduler started ----")
 
 def job_error(event):
     job_id = str(event.job_id).capitalize()
@@ -5,34 +5,79 @@ set -e  # Exit immediately if a command exits with a non-zero status.
 export FLASK_APP=server.py
 export FLASK_ENV=${FLASK_ENV:-development} # if FLASK_ENV not set in .env file, then this variable will be used.
 
-# Function to check, create, and apply Alembic migrations
-check_create_and_apply_migrations() {
-    echo "Checking for pending database migrations..."
-    
-    # Get the current revision and the head revision
-    current_rev=$(alembic current 2>/dev/null | grep "^[a-f0-9]\+" | cut -d' ' -f1)
-    head_rev=$(alembic heads 2>/dev/null | grep "^[a-f0-9]\+" | cut -d' ' -f1)
-
-    if [ -z "$current_rev" ] && [ -z "$head_rev" ]; then
-        echo "No migrations found. Creating initial migration..."
-        alembic revision --autogenerate -m "Initial migration"
-        if [ $? -eq 0 ]; then
-            echo "Initial migration created successfully."
-            alembic upgrade head
-        else
-            echo "Error creating initial migration. Exiting."
-            exit 1
-        fi
-    elif [ "$current_rev" != "$head_rev" ]; then
-        echo "Pending migrations found. Applying migrations..."
-        alembic upgrade head
-    else
-        echo "Database schema is up to date."
-    fi
+# nginx in front of the gunicorn instances, sticky by client for Socket.IO
+write_nginx_config() {
+    cat > "$1" <<EOF
+worker_processes auto;
+worker_rlimit_nofile 65535;
+pid /tmp/nginx.pid;
+error_log stderr warn;
+
+events {
+    worker_connections 16384;
 }
 
-# Check, create, and apply migration
-check_create_and_apply_migrations
+http {
+    access_log off;
+    # Analysis images are uploaded as multipart forms
+    client_max_body_size 25m;
+    client_body_temp_path /tmp/nginx_client_body;
+    proxy_temp_path /tmp/nginx_proxy;
+
+    # The first X-Forwarded-For address is the client behind ngrok, the peer address otherwise
+    map \$http_x_forwarded_for \$client_key {
+        default \$remote_addr;
+        "~^(?<first>[^,\s]+)" \$first;
+    }
+
+    map \$http_upgrade \$connection_upgrade {
+        default upgrade;
+        '' close;
+    }
+
+    upstream api {
+        server 127.0.0.1:$API_PORT;
+        keepalive 32;
+    }
+
+    # Polling requests and the websocket upgrade of a session must reach the same instance
+    upstream socketio {
+        hash \$client_key consistent;
+$SOCKETIO_SERVERS    }
+
+    server {
+        listen $PORT;
+
+        location /socket.io/ {
+            proxy_pass http://socketio;
+            proxy_http_version 1.1;
+            proxy_set_header Upgrade \$http_upgrade;
+            proxy_set_header Connection \$connection_upgrade;
+            proxy_set_header Host \$host;
+            proxy_set_header X-Forwarded-For \$proxy_add_x_forwarded_for;
+            proxy_buffering off;
+            # Longer than the ping interval of the Socket.IO server
+            proxy_read_timeout 120s;
+        }
+
+        location / {
+            proxy_pass http://api;
+            proxy_http_version 1.1;
+            proxy_set_header Connection "";
+            proxy_set_header Host \$host;
+            proxy_set_header X-Forwarded-For \$proxy_add_x_forwarded_for;
+            proxy_read_timeout 120s;
+        }
+    }
+}
+EOF
+}
+
+# Release step: migrations and default rows, run before any web worker imports the app.
+# Replicas added by autoscaling can skip it with RUN_RELEASE=0.
+if [ "${RUN_RELEASE:-1}" != "0" ]; then
+    python release.py
+fi
 
 # Start the application
 if [ "$FLASK_ENV" = "development" ]; then
@@ -41,5 +86,57 @@ if [ "$FLASK_ENV" = "development" ]; then
 else
     echo "Starting Gunicorn production server..."
     PORT=${PORT:-9002}
-    exec gunicorn --bind 0.0.0.0:$PORT --workers 3 --threads 2 --timeout 120 server:app
+    # Shared by the workers for /metrics, stale files of a previous run are dropped
+    export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    # Every process below is a child of this shell, which forwards SIGTERM to
+    # them (graceful drain) and stops the container as soon as one of them exits,
+    # instead of nginx answering 502 for a dead instance.
+    CHILDREN=()
+    start_child() {
+        "$@" &
+        CHILDREN+=($!)
+    }
+    stop_children() {
+        trap - TERM INT
+        # QUIT is the graceful shutdown of nginx, TERM the one of gunicorn and worker.py
+        kill -QUIT "$NGINX_PID" 2>/dev/null || true
+        kill -TERM "${CHILDREN[@]}" 2>/dev/null || true
+        wait
+    }
+    trap 'echo "Stopping..."; stop_children; exit 0' TERM INT
+
+    # Scheduled posts and periodic jobs run in their own process, once per container
+    # (RUN_SCHEDULER=0 for replicas that should only serve requests)
+    if [ "${RUN_SCHEDULER:-1}" != "0" ]; then
+        start_child python worker.py
+    fi
+
+    # A Socket.IO session lives in the process that accepted its handshake, so
+    # Socket.IO clients are pinned by nginx to single-worker gunicorn instances
+    # (each websocket holds one of their threads), while API requests are spread
+    # over the workers of a separate gunicorn. Events reach the clients of every
+    # instance through the Redis message queue (ws/socket.py).
+    API_PORT=9100
+    SOCKETIO_INSTANCES=${SOCKETIO_INSTANCES:-2}
+    SOCKETIO_THREADS=${SOCKETIO_THREADS:-1000}
+
+    start_child gunicorn --bind 127.0.0.1:$API_PORT --workers ${GUNICORN_WORKERS:-3} --threads ${GUNICORN_THREADS:-2} --timeout 120 server:app
+    SOCKETIO_SERVERS=""
+    for i in $(seq 1 "$SOCKETIO_INSTANCES"); do
+        start_child gunicorn --bind 127.0.0.1:$((API_PORT + i)) --workers 1 --threads "$SOCKETIO_THREADS" \
+            --worker-connections "$SOCKETIO_THREADS" --timeout 120 server:app
+        SOCKETIO_SERVERS+="        server 127.0.0.1:$((API_PORT + i));"$'\n'
+    done
+
+    write_nginx_config /tmp/nginx.conf
+    # Not in CHILDREN: it gets QUIT only, TERM would drop its connections right away
+    nginx -c /tmp/nginx.conf -g 'daemon off;' &
+    NGINX_PID=$!
+
+    # Returns when the first child exits (or a signal interrupts it, handled by the trap)
+    wait -n || true
+    echo "A server process exited, stopping the container"
+    stop_children
+    exit 1
 fi
@@ -42,6 +42,8 @@ from routes.alerts.topics import topics_bp
 from decorators.api_key import check_api_key
 from services.email.email_service import EmailService
 from ws.socket import init_socketio
+from utils.metrics import init_metrics
+from utils.query_stats import init_query_stats
 
 app = Flask(__name__, template_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'))
 app.name = 'AI Alpha API'
@@ -49,6 +51,9 @@ app.static_folder = 'static'
 app.secret_key = os.urandom(24)
 swagger_template_path = os.path.join(app.root_path, 'static', 'swagger.json')
 
+# Request metrics, registered first so requests rejected below are measured too
+init_metrics(app)
+init_query_stats(app)
 
 # Check API key for all requests
 @app.before_request
@@ -138,6 +143,10 @@ app.register_blueprint(ask_ai_bp)
 
 if __name__ == '__main__':
     try:
+        # The development server runs the jobs itself, in production they run in worker.py
+        from worker import start_schedulers
+        start_schedulers()
+
         print('---- AI Alpha Server is starting ----') 
         app.run(port=9002, debug=False, use_reloader=False, threaded=True, host='0.0.0.0') 
     except Exception as e:
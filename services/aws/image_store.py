@@ -0,0 +1,196 @@
+import hashlib
+from io import BytesIO
+from typing import Optional, Dict, List
+from PIL import Image
+from sqlalchemy import func, cast
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from config import ImageAsset, Session
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# dHash bits that may differ for two images to be treated as the same picture
+PERCEPTUAL_HASH_MAX_DISTANCE = 3
+
+
+def content_hash(image_content: bytes) -> str:
+    """
+    Hex SHA-256 of the raw image bytes, used as the S3 key of the image.
+    """
+    return hashlib.sha256(image_content).hexdigest()
+
+
+def content_key(digest: str, extension: str = 'jpg') -> str:
+    """
+    Build the S3 key for a content hash, e.g. '3f5a...e1.jpg'.
+    """
+    return f"{digest}.{extension}"
+
+
+def perceptual_hash(image_content: bytes) -> int:
+    """
+    64-bit difference hash (dHash) of an image, as a signed integer for BIGINT storage.
+
+    The image is reduced to 9x8 grayscale and each bit records whether a pixel
+    is brighter than its right neighbour, so re-encodes, resizes and small
+    compression differences of the same picture produce (nearly) the same hash.
+    Module-level so it can run in the image process pool.
+    """
+    with Image.open(BytesIO(image_content)) as image:
+        pixels = list(image.convert('L').resize((9, 8), Image.LANCZOS).getdata())
+
+    value = 0
+    for row in range(8):
+        offset = row * 9
+        for col in range(8):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _acquire(session, asset: ImageAsset, source_url: Optional[str]) -> Optional[ImageAsset]:
+    # Incremented in the UPDATE itself, so concurrent acquires and releases don't lose a count
+    values = {ImageAsset.ref_count: ImageAsset.ref_count + 1}
+    if source_url:
+        values[ImageAsset.source_url] = source_url
+    updated = session.query(ImageAsset).filter(ImageAsset.asset_id == asset.asset_id).update(
+        values, synchronize_session=False
+    )
+    session.commit()
+    if not updated:
+        # Deleted by the release of its last reference in the meantime
+        return None
+    session.refresh(asset)
+    return asset
+
+
+def acquire_by_source_url(source_url: str, bucket: str) -> Optional[ImageAsset]:
+    """
+    Reuse the asset previously fetched from source_url, without downloading it again.
+
+    Returns:
+        Optional[ImageAsset]: The asset with its reference count incremented, or None.
+    """
+    with Session() as session:
+        asset = session.query(ImageAsset).filter(
+            ImageAsset.source_url == source_url,
+            ImageAsset.bucket == bucket
+        ).first()
+        return _acquire(session, asset, None) if asset else None
+
+
+def acquire_by_content(digest: str, bucket: str, source_url: Optional[str] = None) -> Optional[ImageAsset]:
+    """
+    Reuse the asset with exactly the same bytes.
+
+    Returns:
+        Optional[ImageAsset]: The asset with its reference count incremented, or None.
+    """
+    with Session() as session:
+        asset = session.query(ImageAsset).filter(
+            ImageAsset.content_hash == digest,
+            ImageAsset.bucket == bucket
+        ).first()
+        return _acquire(session, asset, source_url) if asset else None
+
+
+def acquire_near_duplicate(phash: int, bucket: str, source_url: Optional[str] = None) -> Optional[ImageAsset]:
+    """
+    Reuse the closest asset fetched from the same source whose perceptual hash
+    is within PERCEPTUAL_HASH_MAX_DISTANCE bits.
+
+    Only assets whose source URL has the same address without its query string
+    are compared (e.g. the same DALL-E blob under a new signature): unrelated
+    images can be that close on a 64-bit dHash. The Hamming distance is computed
+    in Postgres with bit_count over the XOR of both hashes.
+
+    Returns:
+        Optional[ImageAsset]: The asset with its reference count incremented, or None.
+    """
+    if not source_url:
+        return None
+
+    source = source_url.split('?', 1)[0]
+    with Session() as session:
+        distance = func.bit_count(cast(ImageAsset.perceptual_hash.op('#')(phash), BIT(64)))
+        asset = (
+            session.query(ImageAsset)
+            .filter(
+                ImageAsset.bucket == bucket,
+                ImageAsset.source_url.startswith(source, autoescape=True),
+                ImageAsset.perceptual_hash.isnot(None),
+                distance <= PERCEPTUAL_HASH_MAX_DISTANCE
+            )
+            .order_by(distance)
+            .first()
+        )
+        return _acquire(session, asset, source_url) if asset else None
+
+
+def register_asset(digest: str,
+                   phash: Optional[int],
+                   bucket: str,
+                   url: str,
+                   variants: Optional[Dict[str, str]] = None,
+                   source_url: Optional[str] = None) -> ImageAsset:
+    """
+    Index a newly stored image with one reference.
+
+    If another worker indexed the same content concurrently, the existing
+    asset is reused and its reference count incremented instead.
+    """
+    with Session() as session:
+        try:
+            asset = ImageAsset(
+                content_hash=digest,
+                perceptual_hash=phash,
+                bucket=bucket,
+                url=url,
+                variants=variants,
+                source_url=source_url,
+                ref_count=1
+            )
+            session.add(asset)
+            session.commit()
+            return asset
+        except IntegrityError:
+            session.rollback()
+
+    existing = acquire_by_content(digest, bucket, source_url)
+    if existing is None:
+        raise SQLAlchemyError(f"Image asset {digest} could not be registered")
+    return existing
+
+
+def release_image(url: str) -> List[str]:
+    """
+    Drop one reference to the image at url and return the S3 keys that can be deleted.
+
+    Images that are not content-addressed (not in the index) are returned as
+    their own single key, preserving the previous delete behaviour. Indexed
+    images are only deleted, with all their variants, once no content uses them.
+
+    Args:
+        url (str): The stored image URL.
+
+    Returns:
+        List[str]: S3 keys to delete; empty while the image is still referenced.
+    """
+    key = str(url).split('/')[-1]
+
+    with Session() as session:
+        asset = session.query(ImageAsset).filter(ImageAsset.url == url).with_for_update().first()
+        if not asset:
+            return [key]
+
+        asset.ref_count = max(asset.ref_count - 1, 0)
+        if asset.ref_count > 0:
+            session.commit()
+            logger.info(f"Image {key} still used by {asset.ref_count} item(s), keeping it in S3")
+            return []
+
+        keys = [key] + [str(variant_url).split('/')[-1] for variant_url in (asset.variants or {}).values()]
+        session.delete(asset)
+        session.commit()
+        return keys
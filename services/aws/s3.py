@@ -1,20 +1,143 @@
 import os
-import boto3
+import hashlib
+import threading
 import requests
 from PIL import Image
 from io import BytesIO
 from dotenv import load_dotenv
 from urllib.parse import urlparse
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Dict, List, Iterable
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from requests.exceptions import RequestException
 from botocore.exceptions import ClientError, BotoCoreError
 import werkzeug
+from services.aws.image_store import (
+    content_hash, content_key, perceptual_hash, acquire_by_source_url,
+    acquire_by_content, acquire_near_duplicate, register_asset, release_image
+)
 
 load_dotenv()
 
-import os
-import boto3
-from typing import Optional
+# Upper bound for a downloaded source image; DALL-E 1024x1024 PNGs are ~2-3MB
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Responsive variants generated next to the primary image
+DEFAULT_VARIANT_SIZES = (256, 512, 1024)
+DEFAULT_VARIANT_FORMATS = ('WEBP', 'JPEG')
+
+FORMAT_SETTINGS = {
+    'JPEG': {'extension': 'jpg', 'content_type': 'image/jpeg', 'save_kwargs': {'quality': 85, 'optimize': True}},
+    'WEBP': {'extension': 'webp', 'content_type': 'image/webp', 'save_kwargs': {'quality': 80, 'method': 4}},
+}
+
+_clients: Dict[Tuple[str, str], object] = {}
+_clients_lock = threading.Lock()
+_transfer_config = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_upload_pool: Optional[ThreadPoolExecutor] = None
+_pools_lock = threading.Lock()
+
+
+def get_s3_client(aws_region: str, aws_access_key: str, aws_secret_key: str):
+    """
+    Return the process-wide S3 client for the given region and credentials.
+
+    boto3 clients are thread-safe (sessions are not), so a single client with a
+    connection pool sized for concurrent uploads is shared by every ImageProcessor.
+    boto3 is only imported here, on first use, not when the app starts.
+    """
+    key = (aws_region, aws_access_key)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                import boto3
+                from botocore.config import Config as BotoConfig
+                client = boto3.session.Session().client(
+                    's3',
+                    region_name=aws_region,
+                    aws_access_key_id=aws_access_key,
+                    aws_secret_access_key=aws_secret_key,
+                    config=BotoConfig(max_pool_connections=32, retries={'max_attempts': 3, 'mode': 'standard'})
+                )
+                _clients[key] = client
+    return client
+
+
+def _get_transfer_config():
+    global _transfer_config
+    if _transfer_config is None:
+        from boto3.s3.transfer import TransferConfig
+        # Multipart only kicks in for large payloads; each part is uploaded concurrently
+        _transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=4,
+            use_threads=True
+        )
+    return _transfer_config
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        with _pools_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(max_workers=max(2, min(4, os.cpu_count() or 2)))
+    return _process_pool
+
+
+def _get_upload_pool() -> ThreadPoolExecutor:
+    global _upload_pool
+    if _upload_pool is None:
+        with _pools_lock:
+            if _upload_pool is None:
+                _upload_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='s3-upload')
+    return _upload_pool
+
+
+def render_variants(image_content: bytes, sizes: Iterable[int], formats: Iterable[str]) -> List[Tuple[int, str, bytes]]:
+    """
+    Decode an image once and encode it at every (size, format) combination.
+
+    Runs in a worker process so LANCZOS resampling and encoding do not hold the
+    GIL of the web worker. Must stay a module-level function to be picklable.
+
+    Args:
+        image_content (bytes): The raw source image.
+        sizes (Iterable[int]): Longest edge in pixels; the aspect ratio is kept.
+        formats (Iterable[str]): PIL format names, keys of FORMAT_SETTINGS.
+
+    Returns:
+        List[Tuple[int, str, bytes]]: (size, format, encoded bytes) per variant,
+        one per distinct size and format.
+    """
+    variants = []
+    formats = tuple(dict.fromkeys(formats))
+    with Image.open(BytesIO(image_content)) as source:
+        source = source.convert('RGB')
+        width, height = source.size
+        # Resize from the largest size down so each step resamples fewer pixels
+        for size in sorted(set(sizes), reverse=True):
+            scale = size / max(width, height)
+            resized = source.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+            for image_format in formats:
+                with BytesIO() as output:
+                    resized.save(output, format=image_format, **FORMAT_SETTINGS[image_format]['save_kwargs'])
+                    variants.append((size, image_format, output.getvalue()))
+            source = resized
+    return variants
+
+
+def variant_filename(image_filename: str, size: int, image_format: str) -> str:
+    """
+    Build the S3 key of a variant, e.g. 'my-title.jpg' -> 'my-title-512.webp'.
+    """
+    stem = os.path.splitext(image_filename)[0]
+    return f"{stem}-{size}.{FORMAT_SETTINGS[image_format]['extension']}"
+
 
 class ImageProcessor:
     def __init__(self,
@@ -34,18 +157,21 @@ class ImageProcessor:
         
         if not self.aws_access_key or not self.aws_secret_key:
             raise ValueError("AWS access key and secret key must be provided.")
-        
-        self.s3_client = boto3.client(
-            's3',
-            region_name=self.aws_region,
-            aws_access_key_id=self.aws_access_key,
-            aws_secret_access_key=self.aws_secret_key
-        )
+
+    @property
+    def s3_client(self):
+        """
+        The shared S3 client, created on first use.
+        """
+        return get_s3_client(self.aws_region, self.aws_access_key, self.aws_secret_key)
 
     def fetch_image(self, image_url: str) -> bytes:
         """
         Fetch an image from a URL.
 
+        The body is streamed into a buffer bounded by MAX_IMAGE_BYTES instead of
+        being read in one go, so an oversized or endless response is rejected early.
+
         Args:
             image_url (str): URL of the image to fetch.
 
@@ -54,6 +180,7 @@ class ImageProcessor:
 
         Raises:
             RequestException: If there's an error fetching the image.
+            ValueError: If the image is larger than MAX_IMAGE_BYTES.
         """
         try:
             # Check if it's a DALL-E URL
@@ -73,9 +200,19 @@ class ImageProcessor:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(image_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            return response.content
+            with requests.get(image_url, headers=headers, timeout=10, stream=True) as response:
+                response.raise_for_status()
+
+                content_length = int(response.headers.get('Content-Length') or 0)
+                if content_length > MAX_IMAGE_BYTES:
+                    raise ValueError(f"Image too large: {content_length} bytes (max {MAX_IMAGE_BYTES})")
+
+                buffer = bytearray()
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    buffer.extend(chunk)
+                    if len(buffer) > MAX_IMAGE_BYTES:
+                        raise ValueError(f"Image exceeds the maximum size of {MAX_IMAGE_BYTES} bytes")
+                return bytes(buffer)
         except RequestException as e:
             raise RequestException(f"Error fetching image: {e}")
 
@@ -114,7 +251,9 @@ class ImageProcessor:
         Delete an image from S3.
 
         This method parses the provided S3 URL to extract the bucket name and image key,
-        then attempts to delete the corresponding object from the S3 bucket.
+        then attempts to delete the corresponding object from the S3 bucket. Images from
+        the content-addressed store are only deleted (with their variants) when no other
+        content still references them.
 
         Args:
             image_url (str): URL of the image to delete from S3.
@@ -136,8 +275,9 @@ class ImageProcessor:
             if not bucket_name or not image_key:
                 raise ValueError("Invalid S3 URL format")
 
-            # Delete the object
-            self.s3_client.delete_object(Bucket=bucket_name, Key=image_key)
+            # Content-addressed images may be shared: only delete once unreferenced
+            for key in release_image(image_url):
+                self.s3_client.delete_object(Bucket=bucket_name, Key=key)
 
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -198,35 +338,137 @@ class ImageProcessor:
         """
         if svg_file and svg_filename.lower().endswith('.svg'):
             try:
-                if hasattr(svg_file, 'read'):
-                    # svg_file is a file-like object
-                    self.s3_client.upload_fileobj(
-                        svg_file,
-                        bucket_name,
-                        svg_filename,
-                        ExtraArgs={'ContentType': 'image/svg+xml'}
-                    )
-                else:
-                    # svg_file is bytes
-                    self.s3_client.upload_bytes(
-                        svg_file,
-                        bucket_name,
-                        svg_filename,
-                        ExtraArgs={'ContentType': 'image/svg+xml'}
-                    )
-                return f"https://{bucket_name}.s3.{self.aws_region}.amazonaws.com/{svg_filename}"
+                data = svg_file.read() if hasattr(svg_file, 'read') else svg_file
+                url = f"https://{bucket_name}.s3.{self.aws_region}.amazonaws.com/{svg_filename}"
+
+                # Re-uploading an unchanged icon costs a single HEAD request
+                if self.object_etag(bucket_name, svg_filename) == hashlib.md5(data).hexdigest():
+                    return url
+
+                self.s3_client.upload_fileobj(
+                    BytesIO(data),
+                    bucket_name,
+                    svg_filename,
+                    ExtraArgs={'ContentType': 'image/svg+xml'}
+                )
+                return url
             except (BotoCoreError, ClientError) as e:
                 return None
         return None
 
+    def object_etag(self, bucket_name: str, key: str) -> Optional[str]:
+        """
+        Return the ETag of an S3 object (the MD5 of single-part uploads), or None if it does not exist.
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=key)
+            return response['ETag'].strip('"')
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def upload_bytes_to_s3(self, data: bytes, bucket_name: str, key: str, content_type: str) -> str:
+        """
+        Upload already-encoded bytes to S3, switching to multipart for large payloads.
+
+        Args:
+            data (bytes): The encoded file content.
+            bucket_name (str): Name of the S3 bucket.
+            key (str): Object key in the bucket.
+            content_type (str): MIME type stored with the object.
+
+        Returns:
+            str: URL of the uploaded object in S3.
+        """
+        with BytesIO(data) as body:
+            self.s3_client.upload_fileobj(
+                body,
+                bucket_name,
+                key,
+                ExtraArgs={'ContentType': content_type, 'CacheControl': 'public, max-age=31536000'},
+                Config=_get_transfer_config()
+            )
+        return f"https://{bucket_name}.s3.{self.aws_region}.amazonaws.com/{key}"
+
+    def object_exists(self, bucket_name: str, key: str) -> bool:
+        """
+        Check with a single HEAD request whether an object already exists in S3.
+        """
+        return self.object_etag(bucket_name, key) is not None
+
+    def render_and_upload(self,
+                          image_content: bytes,
+                          bucket_name: str,
+                          image_filename: str,
+                          target_size: Tuple[int, int] = (1024, 1024),
+                          variant_sizes: Iterable[int] = DEFAULT_VARIANT_SIZES,
+                          variant_formats: Iterable[str] = DEFAULT_VARIANT_FORMATS) -> Tuple[str, Dict[str, str]]:
+        """
+        Resize an image and upload it together with its variants.
+
+        Returns:
+            Tuple[str, Dict[str, str]]: URL of the primary JPEG and the variant URLs by name.
+        """
+        width, height = target_size
+        if width != height:
+            # Non-square targets keep the single-image path
+            resized_image = self.resize_image(image_content, target_size)
+            return self.upload_to_s3(resized_image, bucket_name, image_filename), {}
+
+        # Procesa y redimensiona la imagen fuera del GIL
+        sizes = tuple(dict.fromkeys(variant_sizes))
+        formats = tuple(dict.fromkeys(variant_formats))
+        rendered = _get_process_pool().submit(
+            render_variants, image_content, sizes + (width,), formats + ('JPEG',)
+        ).result()
+
+        # Sube la imagen y sus variantes a S3 en paralelo
+        primary = None
+        variants = {}
+        for size, image_format, data in rendered:
+            settings = FORMAT_SETTINGS[image_format]
+            if size == width and image_format == 'JPEG':
+                primary = _get_upload_pool().submit(
+                    self.upload_bytes_to_s3, data, bucket_name, image_filename, settings['content_type']
+                )
+                if size in sizes and image_format in formats:
+                    # The primary is that variant, uploaded once
+                    variants[f"{size}_{settings['extension']}"] = primary
+            elif size in sizes and image_format in formats:
+                variants[f"{size}_{settings['extension']}"] = _get_upload_pool().submit(
+                    self.upload_bytes_to_s3,
+                    data,
+                    bucket_name,
+                    variant_filename(image_filename, size, image_format),
+                    settings['content_type']
+                )
+
+        return primary.result(), {name: future.result() for name, future in variants.items()}
+
     def process_and_upload_image(self, 
                                  image_url: str, 
                                  bucket_name: str, 
                                  image_filename: str, 
-                                 target_size: Tuple[int, int] = (1024, 1024)) -> Optional[str]:
+                                 target_size: Tuple[int, int] = (1024, 1024),
+                                 variant_sizes: Iterable[int] = DEFAULT_VARIANT_SIZES,
+                                 variant_formats: Iterable[str] = DEFAULT_VARIANT_FORMATS) -> Optional[str]:
         """
         Fetch, resize, and upload an image to S3.
+
+        Images are content-addressed: they are stored under the SHA-256 of the
+        source bytes (image_filename is kept for API compatibility but no longer
+        used as the key) and indexed in image_asset. An upload is skipped when the
+        same source URL, the same bytes, a perceptually near-identical image from
+        the same source or an object under the same key (one HEAD request) already
+        exists. The primary JPEG URL is returned; responsive variants are uploaded
+        alongside it. The returned image holds one reference for the caller, to
+        release with delete_from_s3 if the content using it isn't saved.
         """
+        asset = acquire_by_source_url(image_url, bucket_name)
+        if asset:
+            return asset.url
+
         max_retries = 3
         retry_count = 0
         
@@ -234,12 +476,28 @@ class ImageProcessor:
             try:
                 # Intenta obtener la imagen
                 image_content = self.fetch_image(image_url)
-                
-                # Procesa y redimensiona la imagen
-                resized_image = self.resize_image(image_content, target_size)
-                
-                # Sube la imagen a S3
-                return self.upload_to_s3(resized_image, bucket_name, image_filename)
+
+                digest = content_hash(image_content)
+                asset = acquire_by_content(digest, bucket_name, image_url)
+                if asset:
+                    return asset.url
+
+                phash = _get_process_pool().submit(perceptual_hash, image_content).result()
+                asset = acquire_near_duplicate(phash, bucket_name, image_url)
+                if asset:
+                    return asset.url
+
+                key = content_key(digest)
+                if self.object_exists(bucket_name, key):
+                    # Stored before the index existed (or the index row was lost)
+                    url = f"https://{bucket_name}.s3.{self.aws_region}.amazonaws.com/{key}"
+                    variants = {}
+                else:
+                    url, variants = self.render_and_upload(
+                        image_content, bucket_name, key, target_size, variant_sizes, variant_formats
+                    )
+
+                return register_asset(digest, phash, bucket_name, url, variants, image_url).url
                 
             except RequestException as e:
                 retry_count += 1
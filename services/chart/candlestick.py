@@ -143,7 +143,7 @@ class BinanceWebSocket:
     
 
 import os
-import requests
+from utils.upstream import http_client
 import numpy as np
 import pandas as pd
 import bokeh.plotting as bk
@@ -477,7 +477,7 @@ class ChartWidget:
         }
 
         try:
-            response = requests.get(f'{self.BASE_URL}/klines', params=params)
+            response = http_client.get(f'{self.BASE_URL}/klines', params=params)
             
             if response.status_code != 200:
                 raise Exception(f"API Error: {response.status_code}, {response.text}")
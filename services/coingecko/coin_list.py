@@ -0,0 +1,246 @@
+import os
+import json
+import time
+import bisect
+import threading
+import requests
+from typing import Dict, Any, Optional, List, Tuple
+from utils.logging import setup_logger
+from utils.upstream import http_client
+
+logger = setup_logger(__name__)
+
+COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
+BASE_URL = 'https://pro-api.coingecko.com/api/v3'
+
+MIRROR_PATH = os.getenv(
+    'COINGECKO_COIN_LIST_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'coin_list_mirror.json')
+)
+REFRESH_INTERVAL_SECONDS = 6 * 60 * 60
+REFRESH_JOB_ID = 'coingecko_coin_list_refresh'
+
+
+class CoinListIndex:
+    """
+    Immutable, fully indexed snapshot of the CoinGecko /coins/list response.
+
+    Lookups by id, lowercase symbol and lowercase name are dictionary hits; prefix
+    searches bisect a sorted list of (key, id) pairs. A refresh builds a new
+    index and swaps the reference, so readers never need a lock.
+    """
+
+    def __init__(self, coins: List[Dict[str, Any]]):
+        self.coins = coins
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_name: Dict[str, List[Dict[str, Any]]] = {}
+        prefix_entries = set()
+
+        for coin in coins:
+            coin_id = coin.get('id')
+            symbol = (coin.get('symbol') or '').lower()
+            name = (coin.get('name') or '').lower()
+            self.by_id[coin_id] = coin
+            self.by_symbol.setdefault(symbol, []).append(coin)
+            self.by_name.setdefault(name, []).append(coin)
+            prefix_entries.add((name, coin_id))
+            prefix_entries.add((symbol, coin_id))
+
+        self._prefix_entries: List[Tuple[str, str]] = sorted(prefix_entries)
+        self._prefix_keys: List[str] = [key for key, _ in self._prefix_entries]
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    def get(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(coin_id)
+
+    def find_by_symbol(self, symbol: str) -> List[Dict[str, Any]]:
+        return self.by_symbol.get(symbol.lower(), [])
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        return self.by_name.get(name.lower(), [])
+
+    def find(self, name: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the coin matching both name and symbol (case-insensitive), if any.
+        """
+        symbol = symbol.lower()
+        for coin in self.find_by_name(name):
+            if (coin.get('symbol') or '').lower() == symbol:
+                return coin
+        return None
+
+    def search(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Autocomplete: coins whose lowercase name or symbol starts with prefix.
+        """
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+
+        start = bisect.bisect_left(self._prefix_keys, prefix)
+        end = bisect.bisect_right(self._prefix_keys, prefix + '\uffff', lo=start)
+
+        results, seen = [], set()
+        for _, coin_id in self._prefix_entries[start:end]:
+            if coin_id not in seen:
+                seen.add(coin_id)
+                results.append(self.by_id[coin_id])
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class CoinListMirror:
+    """
+    Local mirror of the CoinGecko coin list.
+
+    The list is persisted to MIRROR_PATH together with the ETag/Last-Modified
+    validators of the last download, loaded from disk on first use and refreshed
+    in the background with conditional requests, so request handlers never wait
+    on the ~15k entry /coins/list download. The refresh job runs in the jobs
+    process (worker.py): other processes reload the file once their copy is
+    older than max_age and the file changed.
+    """
+
+    def __init__(self, path: str = MIRROR_PATH, max_age: int = REFRESH_INTERVAL_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        self._index: Optional[CoinListIndex] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._fetched_at: float = 0
+        self._loaded_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> CoinListIndex:
+        """
+        The current index, loading it from disk (or CoinGecko) on first access.
+        """
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    if not self._load():
+                        self._refresh_locked()
+        elif time.time() - self._fetched_at >= self.max_age and self._lock.acquire(blocking=False):
+            try:
+                self._reload_if_changed()
+            finally:
+                self._lock.release()
+        return self._index
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self._load()
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, 'r') as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        self._index = CoinListIndex(stored.get('coins', []))
+        self._etag = stored.get('etag')
+        self._last_modified = stored.get('last_modified')
+        self._fetched_at = stored.get('fetched_at', 0)
+        self._loaded_mtime = mtime
+        logger.info(f"Loaded CoinGecko coin list mirror with {len(self._index)} coins")
+        return True
+
+    def _persist(self, coins: List[Dict[str, Any]]) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'coins': coins,
+                    'etag': self._etag,
+                    'last_modified': self._last_modified,
+                    'fetched_at': self._fetched_at,
+                }, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist CoinGecko coin list mirror: {str(e)}")
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-download the coin list if it changed upstream.
+
+        Args:
+            force (bool): Refresh even if the mirror is younger than max_age.
+
+        Returns:
+            bool: True if the mirror content changed.
+        """
+        with self._lock:
+            if self._index is None:
+                self._load()
+            if not force and self._index is not None and time.time() - self._fetched_at < self.max_age:
+                return False
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        request_headers = {
+            "Content-Type": "application/json",
+            "x-cg-pro-api-key": COINGECKO_API_KEY,
+        }
+        if self._index is not None:
+            if self._etag:
+                request_headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                request_headers['If-Modified-Since'] = self._last_modified
+
+        try:
+            response = http_client.get(f'{BASE_URL}/coins/list', headers=request_headers, timeout=15)
+            if response.status_code == 304:
+                self._fetched_at = time.time()
+                self._persist(self._index.coins)
+                return False
+            response.raise_for_status()
+            coins = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if self._index is None:
+                raise Exception(f"Error in CoinGecko API request in CoinListMirror: {str(e)}")
+            logger.warning(f"CoinGecko coin list refresh failed, serving stale mirror: {str(e)}")
+            return False
+
+        self._index = CoinListIndex(coins)
+        self._etag = response.headers.get('ETag')
+        self._last_modified = response.headers.get('Last-Modified')
+        self._fetched_at = time.time()
+        self._persist(coins)
+        logger.info(f"Refreshed CoinGecko coin list mirror: {len(coins)} coins")
+        return True
+
+
+coin_list_mirror = CoinListMirror()
+
+
+def refresh_coin_list_mirror() -> bool:
+    """
+    Scheduled job entry point: revalidate the process-wide mirror with CoinGecko.
+    """
+    return coin_list_mirror.refresh(force=True)
+
+
+def register_coin_list_refresh(scheduler, interval_seconds: int = REFRESH_INTERVAL_SECONDS) -> None:
+    """
+    Register the periodic coin list refresh on the given APScheduler instance.
+    """
+    scheduler.add_job(
+        refresh_coin_list_mirror,
+        'interval',
+        seconds=interval_seconds,
+        id=REFRESH_JOB_ID,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1
+    )
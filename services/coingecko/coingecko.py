@@ -1,13 +1,22 @@
 import os
+import time
 import requests
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from redis_client.redis_client import get_cached_json, set_cached_json
 from ..coinmarketcap.coinmarketcap import get_crypto_metadata
 from services.coingecko.utils import get_icon_as_svg
+from services.coingecko.coin_list import coin_list_mirror
+from services.coingecko.market_snapshot import get_snapshot_coin
+from utils.upstream import http_client
+from utils.logging import setup_logger
 
 # Load environment variables from the .env file
 load_dotenv()
 
+logger = setup_logger(__name__)
+
 COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
 BASE_URL = 'https://pro-api.coingecko.com/api/v3'
 
@@ -16,15 +25,29 @@ headers = {
             "x-cg-pro-api-key": COINGECKO_API_KEY,
         }
 
+# /ask-ai per-source cache lifetimes (seconds)
+ASK_AI_MARKET_TTL = 60
+ASK_AI_STATIC_TTL = 3 * 86400
+ASK_AI_WHITEPAPER_TTL = 7 * 86400
+
+# Per-source deadlines (seconds); the slowest one bounds the whole /ask-ai call
+SOURCE_DEADLINES = {
+    'coingecko': 8,
+    'coinmarketcap': 5,
+    'icon': 6,
+}
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='ask-ai')
+
 def get_list_of_coins(coin_names: Optional[List[str]] = None, coin_symbols: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Retrieve a list of all available coins from the CoinGecko API or check for specific coins.
 
-    This function makes a GET request to the CoinGecko API to fetch a comprehensive
-    list of all cryptocurrencies available on the platform. Each coin in the list
-    includes basic information such as id, symbol, and name. If specific coin_names
-    or coin_symbols are provided, it checks if those coins are available in the list
-    and they are returned if found.
+    Coins are served from the local, indexed mirror of CoinGecko's /coins/list
+    (services.coingecko.coin_list), which is refreshed in the background. Each
+    coin in the list includes basic information such as id, symbol, and name. If
+    specific coin_names or coin_symbols are provided, matching coins are looked
+    up in the mirror's indexes and returned if found.
 
     Args:
         coin_names (List[str], optional): The names of the coins to check for availability.
@@ -45,55 +68,55 @@ def get_list_of_coins(coin_names: Optional[List[str]] = None, coin_symbols: Opti
     }
 
     try:
-        response = requests.get(f'{BASE_URL}/coins/list', headers=headers, timeout=10)
-        response.raise_for_status()  # Raises an HTTPError for bad responses
+        index = coin_list_mirror.index
 
-        all_coins = response.json()
-        
         # If no filters provided, return all coins
         if not coin_names and not coin_symbols:
-            result['coins'] = all_coins
-            result['length'] = len(all_coins)
+            result['coins'] = index.coins
+            result['length'] = len(index)
             result['success'] = True
             return result
 
         filtered_coins = []
 
-        if coin_symbols:
-            coin_symbols_lower = [symbol.lower() for symbol in coin_symbols]
-            for coin in all_coins:
-                if coin['symbol'].lower() in coin_symbols_lower:
-                    filtered_coins.append(coin)
+        for symbol in coin_symbols or []:
+            filtered_coins.extend(index.find_by_symbol(symbol))
 
-        if coin_names:
-            coin_names_lower = [name.lower() for name in coin_names]
-            for coin in all_coins:
-                if coin['name'].lower() in coin_names_lower:
-                    filtered_coins.append(coin)
+        for name in coin_names or []:
+            filtered_coins.extend(index.find_by_name(name))
 
-        # Remove duplicates by converting to a set of tuples and back to a list
+        # Remove duplicates while keeping the first occurrence
         unique_coins = {coin['id']: coin for coin in filtered_coins}.values()
 
         result['coins'] = list(unique_coins)
         result['length'] = len(result['coins'])
 
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Error in CoinGecko API request in get_list_of_coins: {str(e)}")
-    except ValueError as e:
-        raise Exception(f"Error decoding JSON response in get_list_of_coins: {str(e)}")
     except Exception as e:
         raise Exception(f"Unexpected error in get_list_of_coins: {str(e)}")
 
     return result
 
 
+def search_coins(query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Autocomplete coins by name or symbol prefix from the local coin list mirror.
+
+    Args:
+        query (str): The prefix typed by the user (case-insensitive).
+        limit (int): Maximum number of coins to return.
+
+    Returns:
+        List[Dict[str, Any]]: Coins with keys 'id', 'symbol' and 'name'.
+    """
+    return coin_list_mirror.index.search(query.strip(), limit)
+
+
 def get_coin_data(name: Optional[str] = None, symbol: Optional[str] = None) -> Dict[str, Any]:
     """
-    Retrieve data for a specific coin from the CoinGecko API.
+    Retrieve data for a specific coin from the CoinGecko coin list.
 
-    This function makes a GET request to the CoinGecko API to fetch a comprehensive
-    list of all cryptocurrencies and then filters for the specific coin based on
-    the provided name or symbol.
+    The coin is looked up by lowercase name in the local coin list mirror and
+    matched against the provided symbol, without downloading the full list.
 
     Args:
         name (str, optional): The name of the coin to search for.
@@ -117,24 +140,13 @@ def get_coin_data(name: Optional[str] = None, symbol: Optional[str] = None) -> D
         return result
 
     try:
-        response = requests.get(f'{BASE_URL}/coins/list', headers=headers, timeout=10)
-        response.raise_for_status()  # Raises an HTTPError for bad responses
-
-        all_coins = response.json()
-
-        for coin in all_coins:
-            if (name and coin['name'].lower() == name.lower()) and (symbol and coin['symbol'].lower() == symbol.lower()):
-                result['coin'] = coin
-                result['success'] = True
-                break
-
-        if not result['success']:
+        coin = coin_list_mirror.index.find(name, symbol)
+        if coin:
+            result['coin'] = coin
+            result['success'] = True
+        else:
             result['error'] = "No exact match found for both name and symbol"
 
-    except requests.exceptions.RequestException as e:
-        result['error'] = f"Error in CoinGecko API request: {str(e)}"
-    except ValueError as e:
-        result['error'] = f"Error decoding JSON response: {str(e)}"
     except Exception as e:
         result['error'] = f"Unexpected error: {str(e)}"
 
@@ -142,6 +154,130 @@ def get_coin_data(name: Optional[str] = None, symbol: Optional[str] = None) -> D
 
 
 
+def _snapshot_market_section(coin_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Market section of a tracked coin from the background market snapshot, if present.
+    """
+    try:
+        coin = get_snapshot_coin(coin_id)
+    except Exception as e:
+        logger.warning(f"Market snapshot unavailable for {coin_id}: {str(e)}")
+        return None
+    if coin is None:
+        return None
+    return {
+        'current_price': coin.get('current_price'),
+        'market_cap_usd': coin.get('market_cap'),
+        'fully_diluted_valuation': coin.get('fully_diluted_valuation'),
+        'ath': coin.get('ath'),
+        'ath_change_percentage': coin.get('ath_change_percentage'),
+        'circulating_supply': coin.get('circulating_supply'),
+    }
+
+
+def _fetch_coingecko_sections(coin_id: str, static: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Return the (static, market) sections of a coin, calling /coins/{id} only when the market section expired.
+
+    Static fields (links, categories, chains, icons) and market fields (prices,
+    supply) are cached separately with their own TTLs from a single API call.
+    """
+    market = get_cached_json(f"ask_ai:market:{coin_id}") or _snapshot_market_section(coin_id)
+    if market is not None and static is not None:
+        return static, market
+
+    params = {
+        'localization': 'false',
+        'tickers': 'false',
+        'community_data': 'false',
+        'developer_data': 'false',
+        'sparkline': 'false',
+    }
+    response = http_client.get(f'{BASE_URL}/coins/{coin_id}', headers=headers, params=params,
+                               timeout=SOURCE_DEADLINES['coingecko'])
+    response.raise_for_status()
+    data = response.json()
+    market_data = data.get('market_data') or {}
+
+    static = {
+        'symbol': data.get('symbol', ''),
+        'website': data['links']['homepage'][0] if data['links'].get('homepage') else None,
+        'whitepaper': data['links'].get('whitepaper') or None,
+        'categories': data.get('categories', []),
+        'chains': list((data.get('platforms') or {}).keys()),
+        'icon_urls': {
+            'thumb': data['image'].get('thumb', None),
+            'small': data['image'].get('small', None),
+            'large': data['image'].get('large', None)
+        },
+    }
+    market = {
+        'current_price': market_data['current_price']['usd'],
+        'market_cap_usd': market_data['market_cap']['usd'],
+        'fully_diluted_valuation': (market_data.get('fully_diluted_valuation') or {}).get('usd', None),
+        'ath': market_data['ath']['usd'],
+        'ath_change_percentage': market_data['ath_change_percentage']['usd'],
+        'circulating_supply': market_data.get('circulating_supply', None),
+    }
+
+    set_cached_json(f"ask_ai:static:{coin_id}", static, ASK_AI_STATIC_TTL)
+    set_cached_json(f"ask_ai:market:{coin_id}", market, ASK_AI_MARKET_TTL)
+    return static, market
+
+
+def _fetch_whitepaper(symbol: str) -> Optional[str]:
+    """
+    CoinMarketCap whitepaper fallback, cached by symbol (including 'not found').
+    """
+    cache_key = f"ask_ai:whitepaper:{symbol.upper()}"
+    cached = get_cached_json(cache_key)
+    if cached is not None:
+        return cached.get('whitepaper')
+
+    cmc_response = get_crypto_metadata(symbol.upper())
+    whitepaper = cmc_response.get('whitepaper') if cmc_response.get('success') else None
+    set_cached_json(cache_key, {'whitepaper': whitepaper}, ASK_AI_WHITEPAPER_TTL)
+    return whitepaper
+
+
+def _snapshot_icon_urls(coin_id: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Icon URL of a tracked coin from the market snapshot (the 'large' image of
+    /coins/{id}), so the icon doesn't wait for CoinGecko on a cold cache.
+    """
+    try:
+        coin = get_snapshot_coin(coin_id)
+    except Exception as e:
+        logger.warning(f"Market snapshot unavailable for {coin_id}: {str(e)}")
+        return None
+    if not coin or not coin.get('image'):
+        return None
+    return {'large': coin['image']}
+
+
+def _fetch_icon(coin_id: str, icon_urls: Dict[str, Optional[str]]) -> Optional[str]:
+    """
+    SVG icon of a coin from the persistent icon cache.
+    """
+    return get_icon_as_svg(coin_id, icon_urls)
+
+
+def _result_within(future: Optional[Future], deadline: float, source: str, missing: List[str]) -> Any:
+    """
+    Wait for a source until its deadline; record it as missing on timeout or error.
+    """
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0))
+    except FutureTimeoutError:
+        logger.warning(f"ask-ai source {source} missed its deadline")
+    except Exception as e:
+        logger.warning(f"ask-ai source {source} failed: {str(e)}")
+    missing.append(source)
+    return None
+
+
 def get_tokenomics_data_for_ask_ai(coin_id: str) -> Dict[str, Any]:
     """
     Get detailed tokenomics data for a cryptocurrency using its CoinGecko ID.
@@ -149,6 +285,14 @@ def get_tokenomics_data_for_ask_ai(coin_id: str) -> Dict[str, Any]:
     This function retrieves comprehensive information about a cryptocurrency from CoinGecko,
     and if the whitepaper is not available, it attempts to fetch it from CoinMarketCap.
 
+    The CoinGecko call, the CoinMarketCap whitepaper lookup (the symbol comes from
+    the coin list mirror) and the icon conversion run concurrently, each cached with
+    its own TTL: market fields for ASK_AI_MARKET_TTL, links/categories, whitepaper and
+    icon for days (the icon in the persistent icon cache). On a cold cache the icon URL
+    of a tracked coin comes from the market snapshot, so the icon doesn't wait for
+    CoinGecko. Every source has a deadline; a slow or failing secondary source
+    yields a partial result listed in 'missing_sources' instead of an error.
+
     Args:
         coin_id (str): The CoinGecko ID of the cryptocurrency (e.g., 'bitcoin', 'ethereum').
 
@@ -167,94 +311,79 @@ def get_tokenomics_data_for_ask_ai(coin_id: str) -> Dict[str, Any]:
             - icons (Dict): Dictionary containing:
                 - png (Dict[str, str]): Dictionary of PNG icon URLs in different sizes
                 - svg (Optional[str]): SVG representation of the icon if conversion successful
+            - missing_sources (List[str]): Sources that failed or missed their deadline
             - error (str): Error message if the request fails
     """
     if not coin_id:
         return {'error': "No valid cryptocurrency ID provided"}
 
-    url = f'{BASE_URL}/coins/{coin_id}'
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        # Get the whitepaper from CoinGecko
-        whitepaper = data['links'].get('whitepaper') if 'whitepaper' in data['links'] else None
-
-        # If no whitepaper in CoinGecko, try CoinMarketCap
-        if not whitepaper:
-            # Use the symbol from CoinGecko data for CoinMarketCap lookup
-            symbol = data.get('symbol', '').upper()
-            cmc_response = get_crypto_metadata(symbol)
-            
-            if cmc_response.get('success'):
-                whitepaper = cmc_response.get('whitepaper')
-
-        # Extract icon URLs
-        icon_urls = {
-            'thumb': data['image'].get('thumb', None),
-            'small': data['image'].get('small', None),
-            'large': data['image'].get('large', None)
-        }
+    started = time.monotonic()
+    deadlines = {source: started + seconds for source, seconds in SOURCE_DEADLINES.items()}
+    missing: List[str] = []
 
-        # Try to get SVG version of the icon
+    static = get_cached_json(f"ask_ai:static:{coin_id}")
+    symbol = static.get('symbol') if static else None
+    if not symbol:
         try:
-            svg_icon = get_icon_as_svg(coin_id, icon_urls)
-        except Exception as e:
-            svg_icon = None
-            print(f"Error converting icon to SVG for {coin_id}: {str(e)}")
-
-        result = {
-            'website': data['links']['homepage'][0] if data['links']['homepage'] else None,
-            'whitepaper': whitepaper,
-            'categories': data.get('categories', []),
-            'chains': list(data['platforms'].keys()),
-            'current_price': data['market_data']['current_price']['usd'],
-            'market_cap_usd': data['market_data']['market_cap']['usd'],
-            'fully_diluted_valuation': data['market_data'].get('fully_diluted_valuation', {}).get('usd', None),
-            'ath': data['market_data']['ath']['usd'],
-            'ath_change_percentage': data['market_data']['ath_change_percentage']['usd'],
-            'circulating_supply': data['market_data'].get('circulating_supply', None),
-            'icons': {
-                'png': icon_urls,
-                'svg': svg_icon
-            }
-        }
-
-        return result
+            symbol = (coin_list_mirror.index.get(coin_id) or {}).get('symbol')
+        except Exception:
+            symbol = None
+
+    coingecko_future = _executor.submit(_fetch_coingecko_sections, coin_id, static)
+    # Only ask CoinMarketCap when CoinGecko is not already known to have a whitepaper
+    whitepaper_future = (
+        _executor.submit(_fetch_whitepaper, symbol)
+        if symbol and not (static and static.get('whitepaper')) else None
+    )
+    icon_urls = static['icon_urls'] if static else _snapshot_icon_urls(coin_id)
+    icon_future = _executor.submit(_fetch_icon, coin_id, icon_urls) if icon_urls else None
 
-    except requests.exceptions.RequestException as e:
-        return {'error': f"API request error: {str(e)}"}
-    except ValueError as e:
+    try:
+        static, market = coingecko_future.result(timeout=SOURCE_DEADLINES['coingecko'])
+    except requests.exceptions.JSONDecodeError as e:
+        # Also a RequestException, so it is caught first
         return {'error': f"JSON decoding error: {str(e)}"}
+    except requests.exceptions.RequestException as e:
+        if static is None:
+            return {'error': f"API request error: {str(e)}"}
+        market = None
+        missing.append('coingecko')
+    except FutureTimeoutError:
+        if static is None:
+            return {'error': "API request error: CoinGecko did not respond in time"}
+        market = None
+        missing.append('coingecko')
     except Exception as e:
         return {'error': f"Unexpected error: {str(e)}"}
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    # Cold cache of a coin missing from the snapshot: the icon URLs are only known now
+    if icon_future is None:
+        icon_future = _executor.submit(_fetch_icon, coin_id, static['icon_urls'])
+        deadlines['icon'] = time.monotonic() + SOURCE_DEADLINES['icon']
+    if whitepaper_future is None and not static.get('whitepaper') and static.get('symbol'):
+        whitepaper_future = _executor.submit(_fetch_whitepaper, static['symbol'])
+        deadlines['coinmarketcap'] = time.monotonic() + SOURCE_DEADLINES['coinmarketcap']
+
+    whitepaper = static.get('whitepaper')
+    if not whitepaper:
+        whitepaper = _result_within(whitepaper_future, deadlines['coinmarketcap'], 'coinmarketcap', missing)
+    svg_icon = _result_within(icon_future, deadlines['icon'], 'icon', missing)
+
+    market = market or {}
+    return {
+        'website': static['website'],
+        'whitepaper': whitepaper,
+        'categories': static['categories'],
+        'chains': static['chains'],
+        'current_price': market.get('current_price'),
+        'market_cap_usd': market.get('market_cap_usd'),
+        'fully_diluted_valuation': market.get('fully_diluted_valuation'),
+        'ath': market.get('ath'),
+        'ath_change_percentage': market.get('ath_change_percentage'),
+        'circulating_supply': market.get('circulating_supply'),
+        'icons': {
+            'png': static['icon_urls'],
+            'svg': svg_icon
+        },
+        'missing_sources': missing
+    }
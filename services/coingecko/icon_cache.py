@@ -0,0 +1,228 @@
+import os
+import io
+import json
+import time
+import base64
+import threading
+from utils.upstream import http_client
+from datetime import datetime
+from PIL import Image
+from typing import Optional, Dict, Any, List
+from cachetools import LRUCache
+from config import CoinBot, Session
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
+BASE_URL = 'https://pro-api.coingecko.com/api/v3'
+
+ICON_CACHE_DIR = os.getenv(
+    'ICON_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icon_cache')
+)
+# Icons almost never change: only revalidate with the origin (If-None-Match) weekly
+REVALIDATE_AFTER_SECONDS = 7 * 86400
+MEMORY_CACHE_SIZE = 2048
+WARMUP_JOB_ID = 'coin_icon_cache_warmup'
+MARKETS_PAGE_SIZE = 250
+
+MIME_TYPES = {
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg',
+    'GIF': 'image/gif',
+    'WEBP': 'image/webp',
+}
+
+
+def wrap_image_as_svg(image_content: bytes) -> str:
+    """
+    Embed the original image bytes in an SVG document.
+
+    Only the image header is parsed (for the size and format); the pixels are
+    never decoded or re-encoded, the original bytes are base64-embedded as is.
+    """
+    # Imported here: its SVG schema tables take a noticeable part of the app import
+    import svgwrite
+
+    with Image.open(io.BytesIO(image_content)) as img:
+        width, height = img.size
+        mime_type = MIME_TYPES.get(img.format, 'image/png')
+
+    dwg = svgwrite.Drawing('temp.svg', size=(width, height))
+    img_str = base64.b64encode(image_content).decode()
+    dwg.add(dwg.image(
+        f'data:{mime_type};base64,{img_str}',
+        insert=(0, 0),
+        size=(width, height)
+    ))
+    return dwg.tostring()
+
+
+class IconCache:
+    """
+    Persistent cache of coin icons converted to SVG.
+
+    Entries are keyed by coin id, remember the source URL and its ETag, and
+    are stored as one JSON file per coin under ICON_CACHE_DIR with an
+    in-memory LRU in front. An entry is reused as long as the source URL is
+    unchanged; after REVALIDATE_AFTER_SECONDS it is revalidated with a
+    conditional request, which costs a 304 when the icon did not change.
+    """
+
+    def __init__(self, directory: str = ICON_CACHE_DIR, memory_size: int = MEMORY_CACHE_SIZE):
+        self.directory = directory
+        self._memory = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self._directory_ready = False
+
+    def _path(self, coin_id: str) -> str:
+        safe_id = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in coin_id)
+        return os.path.join(self.directory, f"{safe_id}.json")
+
+    def _read(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(coin_id)
+        if entry is not None:
+            return entry
+
+        try:
+            with open(self._path(coin_id), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._memory[coin_id] = entry
+        return entry
+
+    def _write(self, coin_id: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[coin_id] = entry
+
+        path = self._path(coin_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            # Created on the first write rather than at import time in every process
+            if not self._directory_ready:
+                os.makedirs(self.directory, exist_ok=True)
+                self._directory_ready = True
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist icon for {coin_id}: {str(e)}")
+
+    def get(self, coin_id: str, source_url: str) -> Optional[str]:
+        """
+        Return the SVG icon of a coin, downloading the source image only when needed.
+
+        Args:
+            coin_id (str): The CoinGecko coin ID.
+            source_url (str): URL of the PNG (or other raster) icon.
+
+        Returns:
+            Optional[str]: The SVG document, or None if the icon could not be fetched.
+        """
+        entry = self._read(coin_id)
+        if entry and entry.get('source_url') == source_url:
+            if time.time() - entry.get('validated_at', 0) < REVALIDATE_AFTER_SECONDS:
+                return entry['svg']
+            return self._revalidate(coin_id, entry)
+
+        return self._fetch(coin_id, source_url)
+
+    def _fetch(self, coin_id: str, source_url: str, etag: Optional[str] = None) -> Optional[str]:
+        request_headers = {'If-None-Match': etag} if etag else {}
+        try:
+            response = http_client.get(source_url, headers=request_headers, timeout=10)
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            svg = wrap_image_as_svg(response.content)
+        except Exception as e:
+            logger.warning(f"Error fetching icon for {coin_id}: {str(e)}")
+            return None
+
+        self._write(coin_id, {
+            'source_url': source_url,
+            'etag': response.headers.get('ETag'),
+            'svg': svg,
+            'validated_at': time.time(),
+        })
+        return svg
+
+    def _revalidate(self, coin_id: str, entry: Dict[str, Any]) -> str:
+        svg = self._fetch(coin_id, entry['source_url'], entry.get('etag'))
+        if svg is not None:
+            return svg
+
+        # Not modified, or the origin failed: keep serving the cached icon
+        self._write(coin_id, {**entry, 'validated_at': time.time()})
+        return entry['svg']
+
+
+icon_cache = IconCache()
+
+
+def warm_up_icon_cache() -> int:
+    """
+    Prefill the icon cache for every CoinBot with a gecko_id.
+
+    Icon URLs are read from /coins/markets in pages of MARKETS_PAGE_SIZE ids,
+    so the warm-up costs one CoinGecko call per page plus one image download
+    per icon that is missing or changed.
+
+    Returns:
+        int: Number of icons available in the cache after the run.
+    """
+    with Session() as session:
+        gecko_ids: List[str] = [
+            gecko_id for (gecko_id,) in session.query(CoinBot.gecko_id)
+            .filter(CoinBot.gecko_id.isnot(None), CoinBot.gecko_id != '')
+            .distinct()
+            .all()
+        ]
+
+    request_headers = {
+        "Content-Type": "application/json",
+        "x-cg-pro-api-key": COINGECKO_API_KEY,
+    }
+    cached = 0
+    for start in range(0, len(gecko_ids), MARKETS_PAGE_SIZE):
+        page = gecko_ids[start:start + MARKETS_PAGE_SIZE]
+        try:
+            response = http_client.get(
+                f'{BASE_URL}/coins/markets',
+                headers=request_headers,
+                params={'vs_currency': 'usd', 'ids': ','.join(page), 'per_page': MARKETS_PAGE_SIZE},
+                timeout=15
+            )
+            response.raise_for_status()
+            markets = response.json()
+        except Exception as e:
+            logger.warning(f"Icon warm-up could not list markets: {str(e)}")
+            continue
+
+        for coin in markets:
+            if coin.get('image') and icon_cache.get(coin['id'], coin['image']):
+                cached += 1
+
+    logger.info(f"Icon cache warm-up finished: {cached}/{len(gecko_ids)} icons cached")
+    return cached
+
+
+def register_icon_cache_warmup(scheduler, interval_hours: int = 24) -> None:
+    """
+    Register the daily icon warm-up on the given APScheduler instance, running once right away.
+    """
+    scheduler.add_job(
+        warm_up_icon_cache,
+        'interval',
+        hours=interval_hours,
+        id=WARMUP_JOB_ID,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=datetime.now()
+    )
@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import requests
+from typing import Dict, Any, Optional, List
+from config import CoinBot, Session
+from redis_client.redis_client import redis_client
+from utils.logging import setup_logger
+from utils.upstream import http_client
+
+logger = setup_logger(__name__)
+
+COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
+BASE_URL = 'https://pro-api.coingecko.com/api/v3'
+
+SNAPSHOT_CURRENCIES = ('usd',)
+SNAPSHOT_INTERVAL_SECONDS = 60
+SNAPSHOT_JOB_ID = 'coingecko_market_snapshot'
+MARKETS_PAGE_SIZE = 250
+
+# Sort orders precomputed on every snapshot, by the field they sort on
+SORT_FIELDS = {
+    'market_cap': 'market_cap',
+    'volume': 'total_volume',
+    'price_change': 'price_change_percentage_24h',
+}
+
+SNAPSHOT_FIELDS = (
+    'id', 'name', 'symbol', 'image', 'current_price', 'market_cap', 'total_volume',
+    'fully_diluted_valuation', 'price_change_percentage_24h', 'ath', 'ath_change_percentage',
+    'circulating_supply', 'last_updated',
+)
+
+
+def _snapshot_key(vs_currency: str) -> str:
+    return f"market_snapshot:{vs_currency.lower()}"
+
+
+def _tracked_gecko_ids() -> List[str]:
+    with Session() as session:
+        return [
+            gecko_id for (gecko_id,) in session.query(CoinBot.gecko_id)
+            .filter(CoinBot.gecko_id.isnot(None), CoinBot.gecko_id != '')
+            .distinct()
+            .all()
+        ]
+
+
+def fetch_markets(gecko_ids: List[str], vs_currency: str = 'usd') -> List[Dict[str, Any]]:
+    """
+    Fetch /coins/markets for the given ids in pages of MARKETS_PAGE_SIZE ids.
+
+    Returns:
+        List[Dict[str, Any]]: One compact record (SNAPSHOT_FIELDS) per coin.
+    """
+    request_headers = {
+        "Content-Type": "application/json",
+        "x-cg-pro-api-key": COINGECKO_API_KEY,
+    }
+    coins = []
+    for start in range(0, len(gecko_ids), MARKETS_PAGE_SIZE):
+        page = gecko_ids[start:start + MARKETS_PAGE_SIZE]
+        response = http_client.get(
+            f'{BASE_URL}/coins/markets',
+            headers=request_headers,
+            params={
+                'vs_currency': vs_currency,
+                'ids': ','.join(page),
+                'order': 'market_cap_desc',
+                'per_page': MARKETS_PAGE_SIZE,
+                'page': 1,
+                'sparkline': 'false',
+                'price_change_percentage': '24h'
+            },
+            timeout=15
+        )
+        response.raise_for_status()
+        coins.extend({field: coin.get(field) for field in SNAPSHOT_FIELDS} for coin in response.json())
+    return coins
+
+
+def refresh_market_snapshot() -> Dict[str, int]:
+    """
+    Rebuild the market snapshot of every tracked coin for each currency in SNAPSHOT_CURRENCIES.
+
+    Each snapshot is a Redis hash with one JSON field per coin ('coin:<id>'),
+    the id lists of every precomputed sort order ('order:<sort>', descending)
+    and the snapshot timestamp. It is written to a temporary key and renamed,
+    so readers always see a complete snapshot.
+
+    Returns:
+        Dict[str, int]: Number of coins stored per currency.
+    """
+    gecko_ids = _tracked_gecko_ids()
+    stored = {}
+
+    for vs_currency in SNAPSHOT_CURRENCIES:
+        try:
+            coins = fetch_markets(gecko_ids, vs_currency) if gecko_ids else []
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Market snapshot refresh failed for {vs_currency}, keeping previous snapshot: {str(e)}")
+            continue
+
+        mapping = {f"coin:{coin['id']}": json.dumps(coin) for coin in coins}
+        for sort_name, field in SORT_FIELDS.items():
+            ordered = sorted(coins, key=lambda coin: coin.get(field) or 0, reverse=True)
+            mapping[f"order:{sort_name}"] = json.dumps([coin['id'] for coin in ordered])
+        mapping['timestamp'] = str(time.time())
+
+        key = _snapshot_key(vs_currency)
+        tmp_key = f"{key}:tmp:{os.getpid()}"
+        pipeline = redis_client.pipeline(transaction=True)
+        pipeline.delete(tmp_key)
+        pipeline.hset(tmp_key, mapping=mapping)
+        pipeline.rename(tmp_key, key)
+        pipeline.execute()
+
+        stored[vs_currency] = len(coins)
+
+    logger.info(f"Market snapshot refreshed: {stored}")
+    return stored
+
+
+def get_snapshot_timestamp(vs_currency: str = 'usd') -> Optional[float]:
+    """
+    Unix timestamp of the current snapshot, or None if there is none.
+    """
+    value = redis_client.hget(_snapshot_key(vs_currency), 'timestamp')
+    return float(value) if value else None
+
+
+def get_snapshot_coin(gecko_id: str, vs_currency: str = 'usd') -> Optional[Dict[str, Any]]:
+    """
+    Market data of one tracked coin from the snapshot.
+
+    Returns:
+        Optional[Dict[str, Any]]: The SNAPSHOT_FIELDS record, or None if the coin is not in the snapshot.
+    """
+    value = redis_client.hget(_snapshot_key(vs_currency), f"coin:{gecko_id}")
+    return json.loads(value) if value else None
+
+
+def get_snapshot_movers(order: str, vs_currency: str = 'usd', limit: int = 10) -> Optional[Dict[str, Any]]:
+    """
+    Top and bottom coins of a precomputed sort order, read from the snapshot in two round trips.
+
+    Args:
+        order (str): One of '<sort>_desc' or '<sort>_asc' with sort in SORT_FIELDS.
+        vs_currency (str): Snapshot currency.
+        limit (int): Number of coins at each end.
+
+    Returns:
+        Optional[Dict[str, Any]]: {'top': [...], 'bottom': [...], 'timestamp': float},
+                                  or None if no snapshot exists for the currency.
+    """
+    sort_name, _, direction = order.rpartition('_')
+    key = _snapshot_key(vs_currency)
+
+    ordered_ids, timestamp = redis_client.hmget(key, f"order:{sort_name}", 'timestamp')
+    if ordered_ids is None:
+        return None
+
+    ids = json.loads(ordered_ids)
+    if direction == 'asc':
+        ids = ids[::-1]
+
+    head, tail = ids[:limit], ids[-limit:][::-1]
+    wanted = list(dict.fromkeys(head + tail))
+    coins = {}
+    if wanted:
+        values = redis_client.hmget(key, [f"coin:{coin_id}" for coin_id in wanted])
+        coins = {coin_id: json.loads(value) for coin_id, value in zip(wanted, values) if value}
+
+    return {
+        'top': [coins[coin_id] for coin_id in head if coin_id in coins],
+        'bottom': [coins[coin_id] for coin_id in tail if coin_id in coins],
+        'timestamp': float(timestamp) if timestamp else None,
+    }
+
+
+def register_market_snapshot(scheduler, interval_seconds: int = SNAPSHOT_INTERVAL_SECONDS) -> None:
+    """
+    Register the periodic market snapshot job on the given APScheduler instance.
+    """
+    scheduler.add_job(
+        refresh_market_snapshot,
+        'interval',
+        seconds=interval_seconds,
+        id=SNAPSHOT_JOB_ID,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1
+    )
@@ -1,49 +1,26 @@
 from typing import Optional
-import requests
-import io
-from PIL import Image
-import svgwrite
-import base64
+from utils.upstream import http_client
+from services.coingecko.icon_cache import icon_cache, wrap_image_as_svg
 
 def convert_png_to_svg(png_url: str) -> Optional[str]:
     """
     Convert a PNG image to an SVG representation.
 
+    The original image bytes are embedded as is (see wrap_image_as_svg); for
+    coin icons prefer get_icon_as_svg, which goes through the persistent icon cache.
+
     Args:
         png_url (str): URL of the PNG image
 
     Returns:
-        Optional[str]: Base64 encoded SVG string or None if conversion fails
+        Optional[str]: SVG string or None if conversion fails
     """
     try:
         # Download the PNG image
-        response = requests.get(png_url, timeout=10)
+        response = http_client.get(png_url, timeout=10)
         response.raise_for_status()
         
-        # Open the image
-        img = Image.open(io.BytesIO(response.content))
-        width, height = img.size
-        
-        # Create an SVG drawing
-        dwg = svgwrite.Drawing('temp.svg', size=(width, height))
-        
-        # Convert image to base64
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        
-        # Create an image element in the SVG
-        img_element = dwg.image(
-            f'data:image/png;base64,{img_str}', 
-            insert=(0, 0), 
-            size=(width, height)
-        )
-        dwg.add(img_element)
-        
-        # Convert to string
-        svg_string = dwg.tostring()
-        
-        return svg_string
+        return wrap_image_as_svg(response.content)
 
     except Exception as e:
         print(f"Error converting PNG to SVG: {e}")
@@ -53,6 +30,9 @@ def get_icon_as_svg(coin_id: str, icon_urls: dict) -> Optional[str]:
     """
     Attempt to get an SVG representation of a coin icon.
 
+    Icons are served from the persistent icon cache (services.coingecko.icon_cache),
+    keyed by coin id and source URL, and only downloaded on a miss or change.
+
     Args:
         coin_id (str): The CoinGecko coin ID
         icon_urls (dict): Dictionary of icon URLs
@@ -65,8 +45,8 @@ def get_icon_as_svg(coin_id: str, icon_urls: dict) -> Optional[str]:
     
     for size in icon_priority:
         if icon_urls.get(size):
-            svg = convert_png_to_svg(icon_urls[size])
+            svg = icon_cache.get(coin_id, icon_urls[size])
             if svg:
                 return svg
     
-    return None
\ No newline at end of file
+    return None
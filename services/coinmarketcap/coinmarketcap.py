@@ -1,6 +1,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from utils.upstream import http_client
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -22,7 +23,7 @@ def get_crypto_metadata(coin_name):
     }
 
     try:
-        response = requests.get(base_url, headers=headers, params=params)
+        response = http_client.get(base_url, headers=headers, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1,6 +1,6 @@
 import os
+import threading
 from typing import Dict, Tuple
-from firebase_admin import initialize_app, credentials, messaging
 
 # Prioritize the GitHub Actions path
 github_actions_path = 'services/firebase/service-account.json'
@@ -14,9 +14,23 @@ elif os.path.exists(original_path):
 else:
     path = fallback_path
 
-# Creds
-cred = credentials.Certificate(path)
-default_app = initialize_app(credential=cred)
+_default_app = None
+_app_lock = threading.Lock()
+
+
+def get_app():
+    """
+    Return the Firebase app, initialized from the service account on the first notification.
+
+    Nothing is read or imported from firebase_admin when the app starts.
+    """
+    global _default_app
+    if _default_app is None:
+        with _app_lock:
+            if _default_app is None:
+                from firebase_admin import initialize_app, credentials
+                _default_app = initialize_app(credential=credentials.Certificate(path))
+    return _default_app
 
 def send_notification(topic: str, title: str, body: str, action: str = 'new_alert', type: str = "alert", coin: str = None, timeframe: str = None) -> None:
     """
@@ -38,6 +52,9 @@ def send_notification(topic: str, title: str, body: str, action: str = 'new_aler
     """
 
     try:
+        from firebase_admin import messaging
+        app = get_app()
+
         # Convert type and coin to strings if they are not already
         str_type = str(type)
         str_coin = str(coin) if coin is not None else ''
@@ -69,7 +86,7 @@ def send_notification(topic: str, title: str, body: str, action: str = 'new_aler
             )
         )
 
-        messaging.send(message)
+        messaging.send(message, app=app)
         print('FCM Notification sent')
 
     except Exception as e:
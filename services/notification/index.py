@@ -1,5 +1,6 @@
-from config import Topic, Notification, Session
+from config import Topic, Notification, NotificationOutbox, Session
 from typing import Tuple, Optional, List
+from sqlalchemy.orm import Session as SessionType
 from sqlalchemy.exc import SQLAlchemyError
 from services.firebase import firebase
 from services.firebase.firebase import send_notification
@@ -68,6 +69,54 @@ class NotificationService:
         except Exception as e:
             raise RuntimeError(f"Failed to validate topics: {str(e)}")
 
+    def enqueue_notification(self, session: SessionType, coin: str, title: str, body: str, type: str, timeframe: str = None) -> int:
+        """
+        Record a notification and its pending FCM deliveries in the caller's session.
+
+        Nothing is committed here: the Notification history rows and one
+        NotificationOutbox row per topic become visible together with the content
+        that triggered them when the caller commits. Delivery happens later in
+        the outbox dispatcher (services.notification.outbox).
+
+        Args:
+            session (Session): The session holding the content being published.
+            coin (str): The coin reference.
+            title (str): The title of the notification.
+            body (str): The message content of the notification.
+            type (str): The type of notification, see validate_topics.
+            timeframe (str, optional): The timeframe for alerts.
+
+        Returns:
+            int: The number of deliveries enqueued.
+
+        Raises:
+            ValueError: If validation fails
+            SQLAlchemyError: If database operation fails
+        """
+        topics = self.validate_topics(coin, type, timeframe)
+        date_now = datetime.now()
+
+        for topic in topics:
+            session.add(Notification(
+                topic_id=topic.id,
+                title=title,
+                body=body,
+                coin=coin,
+                type=type,
+                created_at=date_now,
+                updated_at=date_now
+            ))
+            session.add(NotificationOutbox(
+                topic_name=topic.name,
+                title=title,
+                body=body,
+                coin=coin,
+                type=type,
+                timeframe=timeframe
+            ))
+
+        return len(topics)
+
     def push_notification(self, coin: str, title: str, body: str, type: str, timeframe: str = None) -> None:
         """
         Push a notification for a specific coin and type.
@@ -0,0 +1,249 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from config import NotificationOutbox, Session
+from services.firebase.firebase import send_notification
+from services.slack.slack_services import send_INFO_message_to_slack_channel
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+SLACK_LOGS_CHANNEL_ID = 'C06FTS38JRX'
+OUTBOX_JOB_ID = 'notification_outbox_dispatcher'
+
+BATCH_SIZE = 50
+# How long a claimed delivery is hidden from other dispatchers; longer than a batch of sends
+CLAIM_LEASE_SECONDS = 300
+MAX_ATTEMPTS = 8
+BASE_BACKOFF_SECONDS = 15
+MAX_BACKOFF_SECONDS = 3600
+
+STATUS_PENDING = 'pending'
+STATUS_SENT = 'sent'
+STATUS_DEAD = 'dead'
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    'batches': 0,
+    'sent': 0,
+    'retried': 0,
+    'dead_lettered': 0,
+    'last_batch_at': None,
+    'last_batch_duration_ms': None,
+}
+
+
+def _record(**increments) -> None:
+    with _metrics_lock:
+        for key, value in increments.items():
+            if key in ('last_batch_at', 'last_batch_duration_ms'):
+                _metrics[key] = value
+            else:
+                _metrics[key] += value
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """
+    Exponential backoff for the given number of failed attempts, capped at MAX_BACKOFF_SECONDS.
+    """
+    seconds = min(BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0)), MAX_BACKOFF_SECONDS)
+    return timedelta(seconds=seconds)
+
+
+def _claim_due_entries(batch_size: int) -> List[NotificationOutbox]:
+    """
+    Claim up to batch_size due deliveries and commit the claim.
+
+    The rows are locked with SELECT ... FOR UPDATE SKIP LOCKED only for this
+    short transaction, which counts the attempt and moves next_attempt_at past
+    the claim lease: other dispatchers skip them until then, and a dispatcher
+    that dies mid-batch leaves them due again once the lease expires.
+    """
+    with Session() as session:
+        entries = (
+            session.query(NotificationOutbox)
+            .filter(
+                NotificationOutbox.status == STATUS_PENDING,
+                NotificationOutbox.next_attempt_at <= func.now()
+            )
+            .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=CLAIM_LEASE_SECONDS)
+        for entry in entries:
+            entry.attempts += 1
+            entry.next_attempt_at = lease_until
+        session.commit()
+        return entries
+
+
+def dispatch_notification_outbox(batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """
+    Deliver one batch of pending outbox notifications through FCM.
+
+    Due rows are claimed in their own transaction before anything is sent
+    (_claim_due_entries), so several dispatchers (one per worker) can drain the
+    outbox concurrently without sending the same notification twice, and no
+    row lock is held while waiting on FCM. Each outcome is committed as soon
+    as its send returns. Failed deliveries are rescheduled with exponential
+    backoff and dead-lettered after MAX_ATTEMPTS.
+
+    Args:
+        batch_size (int): Maximum number of deliveries attempted in this run.
+
+    Returns:
+        dict: Counts of sent, retried and dead-lettered deliveries in this batch.
+    """
+    started = datetime.now(timezone.utc)
+    result = {'sent': 0, 'retried': 0, 'dead_lettered': 0}
+    dead_lettered = []
+
+    try:
+        entries = _claim_due_entries(batch_size)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error while claiming notification outbox entries: {str(e)}")
+        return result
+    if not entries:
+        return result
+
+    with Session() as session:
+        for entry in entries:
+            error = None
+            try:
+                send_notification(
+                    topic=entry.topic_name,
+                    title=entry.title,
+                    body=entry.body,
+                    type=entry.type,
+                    coin=entry.coin,
+                    timeframe=entry.timeframe
+                )
+            except Exception as e:
+                error = str(e)
+                logger.warning(f"Outbox delivery {entry.id} to topic {entry.topic_name} failed "
+                               f"(attempt {entry.attempts}/{MAX_ATTEMPTS}): {error}")
+
+            try:
+                session.add(entry)
+                if error is None:
+                    entry.status = STATUS_SENT
+                    entry.sent_at = datetime.now(timezone.utc)
+                    entry.last_error = None
+                    outcome = 'sent'
+                else:
+                    entry.last_error = error
+                    if entry.attempts >= MAX_ATTEMPTS:
+                        entry.status = STATUS_DEAD
+                        outcome = 'dead_lettered'
+                    else:
+                        entry.next_attempt_at = datetime.now(timezone.utc) + backoff_delay(entry.attempts)
+                        outcome = 'retried'
+                session.commit()
+            except SQLAlchemyError as e:
+                # The claim stays in place: the delivery is attempted again once its lease expires
+                session.rollback()
+                logger.error(f"Database error while recording outbox delivery {entry.id}: {str(e)}")
+                continue
+
+            result[outcome] += 1
+            if outcome == 'dead_lettered':
+                dead_lettered.append(entry)
+
+    duration_ms = (datetime.now(timezone.utc) - started).total_seconds() * 1000
+    _record(batches=1, last_batch_at=started.isoformat(), last_batch_duration_ms=round(duration_ms, 2), **result)
+
+    for entry in dead_lettered:
+        send_INFO_message_to_slack_channel(channel_id=SLACK_LOGS_CHANNEL_ID,
+                                           title_message='Push Notification Dead-Lettered',
+                                           sub_title="Response",
+                                           message=f"Outbox ID: {entry.id}\nTopic: {entry.topic_name}\n"
+                                                   f"Title: {entry.title}\nError: {entry.last_error}")
+
+    logger.info(f"Notification outbox batch: {result} in {duration_ms:.0f}ms")
+    return result
+
+
+def get_outbox_metrics() -> Dict[str, Any]:
+    """
+    Dispatcher counters for this process plus the current outbox backlog.
+
+    Returns:
+        dict: Process counters, row counts per status and the age in seconds of
+              the oldest pending delivery.
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+
+    with Session() as session:
+        counts = dict(
+            session.query(NotificationOutbox.status, func.count(NotificationOutbox.id))
+            .group_by(NotificationOutbox.status)
+            .all()
+        )
+        oldest_pending = (
+            session.query(func.min(NotificationOutbox.created_at))
+            .filter(NotificationOutbox.status == STATUS_PENDING)
+            .scalar()
+        )
+
+    metrics['status_counts'] = {status: counts.get(status, 0) for status in (STATUS_PENDING, STATUS_SENT, STATUS_DEAD)}
+    metrics['oldest_pending_age_seconds'] = (
+        round((datetime.now(timezone.utc) - oldest_pending).total_seconds(), 1) if oldest_pending else None
+    )
+    return metrics
+
+
+def requeue_dead_letters() -> int:
+    """
+    Move every dead-lettered delivery back to pending with a fresh attempt budget.
+
+    Returns:
+        int: The number of deliveries requeued.
+    """
+    with Session() as session:
+        try:
+            count = (
+                session.query(NotificationOutbox)
+                .filter(NotificationOutbox.status == STATUS_DEAD)
+                .update({
+                    NotificationOutbox.status: STATUS_PENDING,
+                    NotificationOutbox.attempts: 0,
+                    NotificationOutbox.next_attempt_at: func.now()
+                }, synchronize_session=False)
+            )
+            session.commit()
+            return count
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+
+
+def register_outbox_dispatcher(scheduler, interval_seconds: int = 5) -> None:
+    """
+    Register the outbox dispatcher as a recurring job on the given APScheduler instance.
+    """
+    scheduler.add_job(
+        dispatch_notification_outbox,
+        'interval',
+        seconds=interval_seconds,
+        id=OUTBOX_JOB_ID,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1
+    )
+
+
+def wake_outbox_dispatcher(scheduler) -> None:
+    """
+    Run the dispatcher as soon as possible instead of waiting for the next interval.
+
+    Errors are swallowed: the recurring job will deliver the notification anyway.
+    """
+    try:
+        scheduler.modify_job(OUTBOX_JOB_ID, next_run_time=datetime.now(scheduler.timezone))
+    except Exception as e:
+        logger.debug(f"Could not wake notification outbox dispatcher: {str(e)}")
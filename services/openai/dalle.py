@@ -1,13 +1,17 @@
 # Image generator Class using DALL-E 
 
 import os
+import threading
 from typing import Optional
-from openai import OpenAI
 from dotenv import load_dotenv
 from routes.slack.templates.news_message import send_INFO_message_to_slack_channel
+from services.openai.gateway import openai_gateway, INTERACTIVE
 
 load_dotenv()
 
+# A user is waiting for the image, the prompt must be written well before that
+PROMPT_TIMEOUT = 120
+
 class ImageGenerator:
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -16,13 +20,20 @@ class ImageGenerator:
         self.api_key = api_key or os.getenv('NEWS_BOT_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key is not provided or not found in the environment variables.")
-        
-        try:
-            self.client = OpenAI(api_key=self.api_key)
-            # Verificar la conexión
-            self.client.models.list()
-        except Exception as e:
-            raise ValueError(f"Failed to initialize OpenAI client: {str(e)}")
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        The OpenAI client, created on first use instead of when the routes are imported.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(api_key=self.api_key)
+        return self._client
 
     def generate_image(self, article: str, size: str = "1024x1024") -> str:
         """
@@ -35,7 +46,8 @@ class ImageGenerator:
                 "letters, numbers, or words. Maximum 400 characters:"
             )
             
-            gpt_response = self.client.chat.completions.create(
+            # A user is waiting on this one, so it goes through the interactive lane of the shared gateway
+            gpt_content = openai_gateway.chat(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a creative prompt engineer."},
@@ -43,9 +55,11 @@ class ImageGenerator:
                 ],
                 temperature=0.7,
                 max_tokens=150,
+                priority=INTERACTIVE,
+                timeout=PROMPT_TIMEOUT,
             )
             
-            final_prompt = gpt_response.choices[0].message.content.strip()[:400]
+            final_prompt = gpt_content.strip()[:400]
 
             dalle_prompt = f"{final_prompt} - in an artistic, abstract anime style"
             
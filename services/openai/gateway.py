@@ -0,0 +1,373 @@
+# Shared, rate-limit-aware gateway to the OpenAI chat completions API
+
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from utils.logging import setup_logger
+from utils.upstream import record_upstream_call
+
+load_dotenv()
+
+logger = setup_logger(__name__)
+
+# Priority lanes, lower runs first
+INTERACTIVE = 0
+BULK = 1
+
+# Starting limits; the real account limits are read from the response headers
+REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', 500))
+TOKENS_PER_MINUTE = int(os.getenv('OPENAI_TOKENS_PER_MINUTE', 30000))
+MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', 16))
+# Share of both buckets bulk requests leave to interactive ones
+BULK_RESERVE = 0.2
+MAX_RETRIES = 5
+# Default cap on a request, waiting in the queue and retries included (the
+# OpenAI client used to give up on a call after 600s)
+REQUEST_TIMEOUT = float(os.getenv('OPENAI_REQUEST_TIMEOUT', 600))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# Rough prompt size estimate, corrected with the real usage once the response arrives
+CHARS_PER_TOKEN = 4
+TOKENS_PER_MESSAGE = 4
+
+
+class TokenBucket:
+    """
+    A bucket of `capacity` units refilled continuously over one minute.
+
+    Only used from the gateway's event loop thread, so it needs no lock.
+    The level may go negative when a request used more than estimated.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def delay(self, amount: float, reserve: float = 0.0) -> float:
+        """
+        Seconds until `amount` can be taken while leaving `reserve` (a share of the capacity) in the bucket.
+        """
+        self._refill()
+        target = min(amount + reserve * self.capacity, self.capacity)
+        missing = target - self.level
+        return max(0.0, missing * 60.0 / self.capacity)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def calibrate(self, limit: Optional[int], remaining: Optional[int]) -> None:
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+            self.level = min(self.level, self.capacity)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+
+@dataclass
+class ChatRequest:
+    priority: int
+    model: str
+    messages: List[Dict[str, str]]
+    temperature: float
+    max_tokens: int
+    estimated_tokens: int
+    future: Future = field(default_factory=Future)
+    attempts: int = 0
+    timeout: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    prompt_chars = sum(len(message.get('content') or '') for message in messages)
+    return prompt_chars // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE * len(messages) + max_tokens
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    try:
+        value = headers.get(name)
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(response) -> Optional[float]:
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class OpenAIGateway:
+    """
+    Schedules every chat completion of the process through one event loop.
+
+    Requests wait in a priority queue (INTERACTIVE before BULK) until both
+    token buckets, requests per minute and tokens per minute, can pay for
+    them, then run concurrently up to `max_concurrency`. Bulk requests
+    leave BULK_RESERVE of each bucket to interactive ones. The buckets are
+    calibrated with the x-ratelimit-* headers of every response, so the
+    gateway settles on the account's real quota. A 429 pauses the whole
+    queue for the advised time before the request is retried, other
+    transient failures are retried with exponential backoff. A request that
+    isn't done within its timeout fails with TimeoutError, whether it is
+    still queued (it is dropped) or running (the call is cancelled).
+
+    The loop runs in a daemon thread started on the first request, so the
+    gateway can be used from Flask views, APScheduler jobs and worker
+    threads alike (chat), or awaited from another event loop (chat_async).
+    """
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 requests_per_minute: int = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = TOKENS_PER_MINUTE,
+                 max_concurrency: int = MAX_CONCURRENCY):
+        self.api_key = api_key or os.getenv('NEWS_BOT_API_KEY')
+        self.max_concurrency = max_concurrency
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                threading.Thread(target=self._run_loop, args=(loop, ready), name='openai-gateway', daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        from openai import AsyncOpenAI
+        asyncio.set_event_loop(loop)
+        # Retries are handled here, with the queue paused, not inside the client
+        self._client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._wakeup = asyncio.Event()
+        loop.create_task(self._dispatch())
+        ready.set()
+        loop.run_forever()
+
+    def submit(self,
+               messages: List[Dict[str, str]],
+               model: str = 'gpt-4',
+               temperature: float = 0.6,
+               max_tokens: int = 1024,
+               priority: int = BULK,
+               timeout: Optional[float] = REQUEST_TIMEOUT) -> Future:
+        """
+        Queue a chat completion.
+
+        Returns:
+            Future: Resolves to the content of the first choice, to the OpenAI error
+                    once the retries are exhausted, or to TimeoutError after `timeout`
+                    seconds (None waits as long as it takes).
+        """
+        request = ChatRequest(
+            priority=priority,
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            estimated_tokens=estimate_tokens(messages, max_tokens),
+            timeout=timeout,
+        )
+        loop = self._ensure_started()
+        loop.call_soon_threadsafe(self._enqueue, request)
+        if timeout is not None:
+            loop.call_soon_threadsafe(loop.call_later, timeout, self._expire, request)
+        return request.future
+
+    def chat(self, messages: List[Dict[str, str]], timeout: Optional[float] = REQUEST_TIMEOUT, **kwargs) -> str:
+        """
+        Blocking chat completion, see submit() for the arguments.
+
+        Raises:
+            openai.APIError: If the request failed for good.
+            TimeoutError: If it wasn't done within `timeout` seconds.
+        """
+        future = self.submit(messages, timeout=timeout, **kwargs)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"OpenAI request not done after {timeout}s")
+
+    async def chat_async(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        Chat completion awaitable from any event loop, see submit() for the arguments.
+        """
+        return await asyncio.wrap_future(self.submit(messages, **kwargs))
+
+    def _enqueue(self, request: ChatRequest) -> None:
+        if request.future.done():
+            # Timed out or cancelled while waiting for a retry
+            return
+        heapq.heappush(self._queue, (request.priority, next(self._sequence), request))
+        self._wakeup.set()
+
+    async def _sleep_or_wakeup(self, delay: Optional[float]) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not self._queue:
+                await self._sleep_or_wakeup(None)
+                continue
+
+            priority, _, request = self._queue[0]
+            if request.future.done():
+                # Timed out or cancelled in the queue
+                heapq.heappop(self._queue)
+                continue
+            reserve = BULK_RESERVE if priority >= BULK else 0.0
+            delay = max(
+                self._paused_until - time.monotonic(),
+                self._requests.delay(1, reserve),
+                self._tokens.delay(request.estimated_tokens, reserve),
+            )
+            if delay > 0:
+                # A new, more urgent request may arrive meanwhile
+                await self._sleep_or_wakeup(delay)
+                continue
+
+            await self._slots.acquire()
+            if not self._queue or self._queue[0][2] is not request:
+                self._slots.release()
+                continue
+
+            heapq.heappop(self._queue)
+            self._requests.take(1)
+            self._tokens.take(request.estimated_tokens)
+            asyncio.get_running_loop().create_task(self._execute(request))
+
+    async def _execute(self, request: ChatRequest) -> None:
+        from openai import APIConnectionError, APIStatusError, RateLimitError
+        start = time.perf_counter()
+        request.task = asyncio.current_task()
+        try:
+            raw = await self._client.chat.completions.with_raw_response.create(
+                model=request.model,
+                messages=request.messages,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+            )
+            self._record(start, str(raw.status_code), raw.headers)
+            self._calibrate(raw.headers)
+            completion = raw.parse()
+
+            used_tokens = completion.usage.total_tokens if completion.usage else request.estimated_tokens
+            if used_tokens < request.estimated_tokens:
+                self._tokens.give_back(request.estimated_tokens - used_tokens)
+            else:
+                self._tokens.take(used_tokens - request.estimated_tokens)
+
+            self._resolve(request, result=completion.choices[0].message.content)
+
+        except RateLimitError as e:
+            self._record(start, '429', e.response.headers)
+            if getattr(e, 'code', None) == 'insufficient_quota':
+                self._resolve(request, error=e)
+            else:
+                self._calibrate(e.response.headers)
+                self._retry(request, e, _retry_after(e.response), pause=True)
+        except APIConnectionError as e:
+            self._record(start, type(e).__name__)
+            self._retry(request, e)
+        except APIStatusError as e:
+            self._record(start, str(e.status_code), e.response.headers)
+            if e.status_code >= 500:
+                self._retry(request, e, _retry_after(e.response))
+            else:
+                self._resolve(request, error=e)
+        except asyncio.CancelledError:
+            # Cancelled by _expire, the future already holds the TimeoutError (or was cancelled)
+            self._record(start, 'timeout')
+        except Exception as e:
+            self._resolve(request, error=e)
+        finally:
+            request.task = None
+            self._slots.release()
+            self._wakeup.set()
+
+    @staticmethod
+    def _record(start: float, status: str, headers=None) -> None:
+        record_upstream_call('openai', '/chat/completions', status, time.perf_counter() - start, headers)
+
+    def _calibrate(self, headers) -> None:
+        self._requests.calibrate(_int_header(headers, 'x-ratelimit-limit-requests'),
+                                 _int_header(headers, 'x-ratelimit-remaining-requests'))
+        self._tokens.calibrate(_int_header(headers, 'x-ratelimit-limit-tokens'),
+                               _int_header(headers, 'x-ratelimit-remaining-tokens'))
+
+    def _expire(self, request: ChatRequest) -> None:
+        self._resolve(request, error=TimeoutError(f"OpenAI request not done after {request.timeout}s"))
+        # Also when the caller cancelled the future first
+        if request.task is not None:
+            request.task.cancel()
+
+    def _retry(self, request: ChatRequest, error: Exception, delay: Optional[float] = None, pause: bool = False) -> None:
+        if request.future.done():
+            return
+        request.attempts += 1
+        if request.attempts > MAX_RETRIES:
+            logger.error(f"OpenAI request failed after {MAX_RETRIES} retries: {str(error)}")
+            self._resolve(request, error=error)
+            return
+
+        delay = delay if delay is not None else _backoff(request.attempts)
+        if pause:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"OpenAI request retry {request.attempts}/{MAX_RETRIES} in {delay:.1f}s: {str(error)}")
+        asyncio.get_running_loop().call_later(delay, self._enqueue, request)
+
+    @staticmethod
+    def _resolve(request: ChatRequest, result: Optional[str] = None, error: Optional[Exception] = None) -> None:
+        if request.future.done():
+            return
+        if error is not None:
+            request.future.set_exception(error)
+        else:
+            request.future.set_result(result)
+
+
+openai_gateway = OpenAIGateway()
@@ -0,0 +1,136 @@
+import re
+import hashlib
+import unicodedata
+from collections import Counter
+from typing import Optional
+import numpy as np
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'ref_url', 'source', 'cmpid', 'guccounter', 'guce_referrer', 'guce_referrer_sig',
+}
+TRACKING_PREFIXES = ('utm_', '_hs', 'pk_', 'mtm_')
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+# Word n-grams hashed into the SimHash of an article body
+SIMHASH_SHINGLE_SIZE = 3
+_BIT_POSITIONS = np.arange(64, dtype=np.uint64)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL for deduplication.
+
+    The scheme is unified to https, the host is lowercased without 'www.',
+    default ports, fragments, tracking parameters and the trailing slash are
+    dropped and the remaining query parameters are sorted. The result is
+    casefolded, as article URLs have always been compared case-insensitively.
+    """
+    url = (url or '').strip()
+    if '://' not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or ''
+
+    return urlunsplit(('https', host, path, urlencode(query), '')).casefold()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a text: NFKC, casefolded, punctuation removed and whitespace collapsed.
+    """
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def normalize_title(title: str) -> str:
+    """
+    Canonical form of an article title, see normalize_text.
+    """
+    return normalize_text(title)
+
+
+def url_fingerprint(url: Optional[str]) -> Optional[str]:
+    """
+    Hex SHA-256 of the normalized URL, or None for an empty URL.
+    """
+    if not url or not url.strip():
+        return None
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+def title_fingerprint(title: Optional[str]) -> Optional[str]:
+    """
+    Hex SHA-256 of the normalized title, or None if nothing is left after normalization.
+    """
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def content_fingerprint(content: Optional[str]) -> Optional[str]:
+    """
+    Hex SHA-256 of the normalized article content, the same for a story syndicated
+    across sites with different markup or spacing. None if the content is empty.
+    """
+    normalized = normalize_text(content)
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def simhash(content: Optional[str], shingle_size: int = SIMHASH_SHINGLE_SIZE) -> Optional[int]:
+    """
+    64-bit SimHash of the normalized content, as a signed integer for BIGINT storage.
+
+    Every word shingle is hashed to 64 bits and votes on each bit with its
+    number of occurrences; a bit of the result is set when the votes for it
+    outweigh the votes against. Copies of a story that differ by a few
+    sentences, a byline or boilerplate land within a few bits of each other.
+
+    Returns:
+        Optional[int]: The fingerprint, or None for empty content.
+    """
+    words = normalize_text(content).split()
+    if not words:
+        return None
+
+    if len(words) < shingle_size:
+        shingles = Counter([' '.join(words)])
+    else:
+        shingles = Counter(' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big') for shingle in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    bits = ((hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)).astype(bool)
+    votes = np.where(bits, weights[:, None], -weights[:, None]).sum(axis=0)
+
+    value = 0
+    for position in np.flatnonzero(votes > 0):
+        value |= 1 << int(position)
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Number of differing bits between two 64-bit fingerprints (signed or unsigned).
+    """
+    return bin((first ^ second) & 0xFFFFFFFFFFFFFFFF).count('1')
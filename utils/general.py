@@ -78,4 +78,4 @@ def validate_headers(headers: dict, required_headers: list):
 
 
 def parse_timestamp(timestamp):
-    return datetime.utcfromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
\ No newline at end of file
+    return datetime.datetime.utcfromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Prometheus metrics of the API, exposed on /metrics (routes/metrics/healthcheck.py).
+
+Every request is timed per blueprint, endpoint, method and status, with the
+response size and the number of requests in flight. Under gunicorn each worker
+writes its samples to PROMETHEUS_MULTIPROC_DIR (set up by script.sh, dead
+workers are cleaned by gunicorn.conf.py) and /metrics aggregates all of them;
+without it, e.g. the Flask dev server, the process registry is used.
+"""
+import os
+import time
+from flask import Flask, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(256 * 4 ** exponent for exponent in range(9))  # 256 B to 16 MiB
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time spent handling a request',
+    ['blueprint', 'endpoint', 'method', 'status'], buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'Requests being handled',
+    ['blueprint', 'endpoint'], multiprocess_mode='livesum'
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Size of the response body',
+    ['blueprint', 'endpoint', 'status'], buckets=SIZE_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Redis response cache lookups',
+    ['cache', 'result']
+)
+
+# Outbound calls, recorded by utils/upstream.py
+UPSTREAM_LATENCY = Histogram(
+    'upstream_request_duration_seconds', 'Time spent on a call to an external API',
+    ['upstream', 'route', 'status'], buckets=LATENCY_BUCKETS
+)
+UPSTREAM_RATE_LIMIT = Gauge(
+    'upstream_rate_limit', 'Last rate limit header value returned by an external API',
+    ['upstream', 'header'], multiprocess_mode='mostrecent'
+)
+UPSTREAM_CIRCUIT_OPEN = Gauge(
+    'upstream_circuit_open', 'Workers whose circuit breaker for the external API is open',
+    ['upstream'], multiprocess_mode='livesum'
+)
+UPSTREAM_SHORT_CIRCUITS = Counter(
+    'upstream_short_circuits_total', 'Calls failed fast because the circuit breaker was open',
+    ['upstream']
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def _route_labels():
+    # Unmatched URLs share one label so scanners can't blow up the series count
+    return request.blueprint or 'app', request.endpoint or 'unmatched'
+
+
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_labels = _route_labels()
+    g.metrics_recorded = False
+    REQUESTS_IN_FLIGHT.labels(*g.metrics_labels).inc()
+
+
+def _record(status: int, size=None) -> None:
+    blueprint, endpoint = g.metrics_labels
+    REQUEST_LATENCY.labels(blueprint, endpoint, request.method, str(status)).observe(time.perf_counter() - g.metrics_start)
+    if size is not None:
+        RESPONSE_SIZE.labels(blueprint, endpoint, str(status)).observe(size)
+    g.metrics_recorded = True
+
+
+def _after_request(response):
+    if 'metrics_start' in g:
+        size = None if response.is_streamed else response.calculate_content_length()
+        _record(response.status_code, size)
+    return response
+
+
+def _teardown_request(exc):
+    if 'metrics_start' not in g:
+        return
+    if not g.metrics_recorded:
+        _record(500)
+    REQUESTS_IN_FLIGHT.labels(*g.metrics_labels).dec()
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Instrument every request of the app.
+
+    Call it before registering other before_request hooks, so requests they
+    answer early (e.g. a missing API key) are measured too.
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+def render_metrics():
+    """
+    Returns:
+        Tuple[bytes, str]: The exposition of every metric, across workers in multiprocess mode,
+                           and its content type.
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,151 @@
+"""
+Per-request SQL instrumentation.
+
+Every statement run through SQLAlchemy is timed with cursor execute hooks.
+Within a request the query count, the total DB time and the number of runs
+of each statement fingerprint (the SQL with literals and IN lists collapsed)
+are kept in flask.g:
+
+- a fingerprint run QUERY_REPEAT_THRESHOLD times or more in one request is
+  logged as a likely N+1 (usually a lazy relationship read in a loop);
+- any statement slower than SLOW_QUERY_MS is logged with the endpoint and
+  its parameters, in requests and in background jobs alike;
+- in debug mode (or with QUERY_STATS_HEADERS=1) the stats are returned in
+  X-DB-* response headers.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import Counter
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+# A statement legitimately run twice (e.g. a count then a page) is not an N+1
+QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', 5))
+QUERY_STATS_HEADERS = os.getenv('QUERY_STATS_HEADERS', '').lower() in ('1', 'true', 'yes')
+MAX_LOGGED_CHARS = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%\([^)]+\)s|%s|\?|:\w+')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    The statement with literals and placeholders as ?, IN lists as IN (...) and whitespace collapsed,
+    so every run of the same query shape compares equal.
+    """
+    normalized = _STRING_LITERAL.sub('?', statement)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def statement_fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:12]
+
+
+class RequestQueryStats:
+    """
+    Statements run while handling one request.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints = Counter()
+        self.statements = {}
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        fingerprint = statement_fingerprint(statement)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.fingerprints[fingerprint] += 1
+        self.statements.setdefault(fingerprint, statement)
+
+    def repeated(self):
+        """
+        Returns:
+            List[Tuple[str, int]]: (fingerprint, runs) of the likely N+1 statements, most run first.
+        """
+        return [(fingerprint, runs) for fingerprint, runs in self.fingerprints.most_common()
+                if runs >= QUERY_REPEAT_THRESHOLD]
+
+
+def _current_stats():
+    if has_request_context():
+        return g.get('query_stats')
+    return None
+
+
+def _context() -> str:
+    if has_request_context():
+        return f"{request.method} {request.endpoint or request.path}"
+    return f"thread {threading.current_thread().name}"
+
+
+def _truncate(value) -> str:
+    text = repr(value)
+    return text if len(text) <= MAX_LOGGED_CHARS else text[:MAX_LOGGED_CHARS] + '...'
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_times')
+    if not start_times:
+        return
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+
+    stats = _current_stats()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(f"Slow query ({elapsed_ms:.0f} ms) in {_context()}: "
+                       f"{_truncate(_WHITESPACE.sub(' ', statement))} parameters={_truncate(parameters)}")
+
+
+def _before_request():
+    g.query_stats = RequestQueryStats()
+
+
+def _after_request(response):
+    stats = g.get('query_stats')
+    if stats is not None and (QUERY_STATS_HEADERS or current_app.debug):
+        response.headers['X-DB-Query-Count'] = str(stats.count)
+        response.headers['X-DB-Time-Ms'] = f"{stats.total_ms:.1f}"
+        response.headers['X-DB-Repeated-Queries'] = ','.join(f"{fingerprint}x{runs}" for fingerprint, runs in stats.repeated())
+    return response
+
+
+def _teardown_request(exc):
+    stats = g.pop('query_stats', None)
+    if stats is None:
+        return
+    for fingerprint, runs in stats.repeated():
+        logger.warning(f"Likely N+1 in {_context()}: statement {fingerprint} ran {runs} times: "
+                       f"{_truncate(normalize_statement(stats.statements[fingerprint]))}")
+
+
+def init_query_stats(app: Flask) -> None:
+    """
+    Collect the SQL stats of every request of the app.
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,32 @@
+import threading
+from apscheduler.schedulers.base import STATE_STOPPED
+
+_start_lock = threading.Lock()
+
+
+def ensure_started(scheduler):
+    """
+    Return the scheduler, started paused if it is not running yet.
+
+    Importing a scheduler module no longer starts it. The web processes only
+    read and write the job stores: APScheduler keeps jobs added before start()
+    in memory, so the scheduler is started paused on first use, which persists
+    them without running anything. The jobs process (worker.py) runs them.
+    """
+    if scheduler.state == STATE_STOPPED:
+        with _start_lock:
+            if scheduler.state == STATE_STOPPED:
+                scheduler.start(paused=True)
+    return scheduler
+
+
+def start_unpaused(scheduler):
+    """
+    Start the scheduler, or resume it if it was started paused, so its jobs run in this process.
+    """
+    with _start_lock:
+        if scheduler.state == STATE_STOPPED:
+            scheduler.start()
+        else:
+            scheduler.resume()
+    return scheduler
@@ -0,0 +1,198 @@
+"""
+Telemetry and circuit breakers for the calls to external APIs.
+
+Use the shared `http_client` session instead of the requests module functions:
+
+    from utils.upstream import http_client
+    response = http_client.get(url, params=params, timeout=10)
+
+Every call is timed per upstream (UPSTREAM_HOSTS, otherwise the host name),
+route and status, and numeric rate limit headers (Binance weight, CoinGecko
+credits, x-ratelimit-*) are kept as gauges, all exported on /metrics.
+
+Each upstream has a circuit breaker per process: after FAILURE_THRESHOLD
+consecutive failures (connection errors, timeouts, 429 and 5xx responses) it
+opens and calls fail fast with UpstreamUnavailable for OPEN_SECONDS, then a
+single trial call decides whether it closes again. UpstreamUnavailable is a
+requests ConnectionError, so the existing error handling applies.
+
+Calls without a timeout get DEFAULT_TIMEOUT, so a hung upstream can't hold
+a worker thread forever.
+"""
+import re
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logging import setup_logger
+from utils.metrics import UPSTREAM_CIRCUIT_OPEN, UPSTREAM_LATENCY, UPSTREAM_RATE_LIMIT, UPSTREAM_SHORT_CIRCUITS
+
+logger = setup_logger(__name__)
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 15)
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 30
+POOL_SIZE = 20
+
+UPSTREAM_HOSTS = {
+    'api.binance.com': 'binance',
+    'api3.binance.com': 'binance',
+    'pro-api.coingecko.com': 'coingecko',
+    'api.coingecko.com': 'coingecko',
+    'pro-api.coinmarketcap.com': 'coinmarketcap',
+    'api-capital.backend-capital.com': 'capitalcom',
+    'api.coinalyze.net': 'coinalyze',
+    'coindar.org': 'coindar',
+    'api.profit.com': 'profit',
+    'api.twelvedata.com': 'twelvedata',
+    'api.revenuecat.com': 'revenuecat',
+    'open-api.coinglass.com': 'coinglass',
+    'api.telegram.org': 'telegram',
+    'hooks.slack.com': 'slack',
+    'slack.com': 'slack',
+    'api.openai.com': 'openai',
+}
+
+# Rate limit headers worth tracking, matched on the lowercased name
+RATE_LIMIT_HEADERS = re.compile(r'^(x-ratelimit-.+|x-mbx-used-weight.*|x-mbx-order-count.*|x-cg-.*credits.*|retry-after)$')
+_ROUTE_SEGMENT = re.compile(r'^[A-Za-z][A-Za-z_.-]{0,19}$')
+ROUTE_DEPTH = 3
+
+
+class UpstreamUnavailable(requests.exceptions.ConnectionError):
+    """Raised without calling the upstream while its circuit breaker is open."""
+
+
+def upstream_name(url: str) -> str:
+    host = (urlsplit(url).hostname or '').lower()
+    return UPSTREAM_HOSTS.get(host, host or 'unknown')
+
+
+def route_label(url: str) -> str:
+    """
+    The first path segments of the URL, with IDs and tokens (anything but a short word
+    without digits, e.g. a Telegram bot token or a Slack webhook secret) masked.
+    """
+    segments = [segment for segment in urlsplit(url).path.split('/') if segment][:ROUTE_DEPTH]
+    return '/' + '/'.join(segment if _ROUTE_SEGMENT.match(segment) else ':id' for segment in segments)
+
+
+class CircuitBreaker:
+    """
+    closed -> (FAILURE_THRESHOLD consecutive failures) -> open -> (OPEN_SECONDS) -> half-open
+    -> one trial call -> closed on success, open again on failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, open_seconds: float = OPEN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at < self.open_seconds:
+            return 'open'
+        return 'half-open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Circuit for {self.name} closed")
+                UPSTREAM_CIRCUIT_OPEN.labels(self.name).set(0)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or (self._opened_at is None and self._failures >= self.failure_threshold):
+                logger.warning(f"Circuit for {self.name} opened for {self.open_seconds}s after {self._failures} failures")
+                UPSTREAM_CIRCUIT_OPEN.labels(self.name).set(1)
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if upstream not in _breakers:
+            _breakers[upstream] = CircuitBreaker(upstream)
+        return _breakers[upstream]
+
+
+def record_upstream_call(upstream: str, route: str, status: str, elapsed: float, headers=None) -> None:
+    """
+    Record one call, for clients that don't go through http_client (e.g. the OpenAI SDK).
+    """
+    UPSTREAM_LATENCY.labels(upstream, route, status).observe(elapsed)
+    for name, value in (headers or {}).items():
+        name = name.lower()
+        if RATE_LIMIT_HEADERS.match(name):
+            try:
+                UPSTREAM_RATE_LIMIT.labels(upstream, name).set(float(value))
+            except (TypeError, ValueError):
+                pass
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """
+    Transport adapter adding the breaker, the metrics and the default timeout to every request.
+    """
+
+    def send(self, request, timeout=None, **kwargs):
+        upstream = upstream_name(request.url)
+        route = route_label(request.url)
+        breaker = circuit_breaker(upstream)
+        if not breaker.allow():
+            UPSTREAM_SHORT_CIRCUITS.labels(upstream).inc()
+            raise UpstreamUnavailable(f"{upstream} is unavailable (circuit open)", request=request)
+
+        start = time.perf_counter()
+        try:
+            response = super().send(request, timeout=timeout if timeout is not None else DEFAULT_TIMEOUT, **kwargs)
+        except BaseException as e:
+            # Any way out must release the half-open trial slot, or allow() stays False
+            record_upstream_call(upstream, route, type(e).__name__, time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+
+        record_upstream_call(upstream, route, str(response.status_code), time.perf_counter() - start, response.headers)
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+
+def create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = InstrumentedAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+http_client = create_session()
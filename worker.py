@@ -0,0 +1,68 @@
+"""
+Jobs process: runs the scheduled and periodic jobs apart from the web workers (script.sh):
+
+    python worker.py
+
+Importing the scheduler modules doesn't start them anymore. The web workers
+start them paused (utils.scheduling.ensure_started), so the posts they schedule
+are written to the job stores and picked up here. The periodic jobs (market
+snapshot, index bars, coin list, icons, notification outbox) are registered
+here too, so they run once instead of once per gunicorn worker. Socket.IO
+events emitted by the jobs are published to the message queue
+(ws.socket.init_socketio_emitter) and reach the clients of every web worker.
+"""
+import os
+import signal
+import threading
+from scheduler import scheduler
+from routes.analysis.analysis_scheduler import sched as analysis_sched
+from routes.narrative_trading.nt_scheduler import sched as narrative_trading_sched
+from routes.chart.total3 import register_index_bar_sync
+from services.coingecko.coin_list import register_coin_list_refresh
+from services.coingecko.icon_cache import register_icon_cache_warmup
+from services.coingecko.market_snapshot import register_market_snapshot
+from services.notification.outbox import register_outbox_dispatcher
+from utils.scheduling import start_unpaused
+from ws.socket import init_socketio_emitter
+
+SCHEDULERS = (scheduler, analysis_sched, narrative_trading_sched)
+
+# How often the job stores are checked for jobs added by the web workers
+POLL_SECONDS = float(os.getenv('SCHEDULER_POLL_SECONDS', 2))
+
+
+def start_schedulers():
+    """
+    Start every scheduler in this process and register the periodic jobs.
+    """
+    for job_scheduler in SCHEDULERS:
+        start_unpaused(job_scheduler)
+
+    register_market_snapshot(scheduler)
+    register_index_bar_sync(scheduler)
+    register_coin_list_refresh(scheduler)
+    register_icon_cache_warmup(scheduler)
+    register_outbox_dispatcher(analysis_sched)
+    print('---- Schedulers started ----')
+
+
+def main():
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    init_socketio_emitter()
+    start_schedulers()
+    # APScheduler only looks at its job stores when its own next job is due,
+    # jobs written by another process are seen on the next wakeup
+    while not stopping.wait(POLL_SECONDS):
+        for job_scheduler in SCHEDULERS:
+            job_scheduler.wakeup()
+
+    for job_scheduler in SCHEDULERS:
+        job_scheduler.shutdown()
+    print('---- Schedulers stopped ----')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
+import os
+from urllib.parse import quote
 from flask_socketio import SocketIO, emit
 from flask import request
 from typing import Any
+from redis_client.redis_client import REDIS_CONFIG
 from utils.logging import setup_logger
 from typing import Any, Optional, Union, List
 
@@ -8,13 +11,53 @@ logger = setup_logger(__name__)
 
 socketio = SocketIO(async_mode='threading', ping_timeout=60)
 
+# Pub/sub channels are shared by every database of a Redis server, the
+# database number keeps environments on the same server apart
+MESSAGE_QUEUE_CHANNEL = os.getenv('SOCKETIO_CHANNEL', f"ai-alpha-socketio-{REDIS_CONFIG['db']}")
+
+
+def message_queue_url() -> Optional[str]:
+    """
+    Redis URL of the message queue shared by every process that emits Socket.IO events.
+
+    Emits are published to the queue and delivered by each process that has
+    clients connected, so an event emitted by a gunicorn worker, the jobs
+    process or a background consumer reaches every client. SOCKETIO_MESSAGE_QUEUE
+    overrides the URL built from the REDIS_* settings; set it empty to run a
+    single process without the queue.
+    """
+    url = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    if url is not None:
+        return url or None
+
+    password = REDIS_CONFIG.get('password')
+    credentials = f":{quote(password, safe='')}@" if password else ''
+    return f"redis://{credentials}{REDIS_CONFIG['host']}:{REDIS_CONFIG['port']}/{REDIS_CONFIG['db']}"
+
+
+def init_socketio_emitter():
+    """
+    Set up Socket.IO in a process that serves no client (worker.py): its events
+    are only published to the message queue.
+    """
+    url = message_queue_url()
+    if not url:
+        logger.warning("No Socket.IO message queue, events emitted by this process are dropped")
+        return socketio
+
+    socketio.init_app(None, message_queue=url, channel=MESSAGE_QUEUE_CHANNEL)
+    return socketio
+
+
 def init_socketio(app):
     print('---- Initializing SocketIO ----')
     socketio.init_app(app, 
                      cors_allowed_origins="*",
                      async_mode='threading',
                      ping_timeout=60,
-                     ping_interval=25)
+                     ping_interval=25,
+                     message_queue=message_queue_url(),
+                     channel=MESSAGE_QUEUE_CHANNEL)
 
     # Add chart namespace handlers
     @socketio.on('connect', namespace='/chart')